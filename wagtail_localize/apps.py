@@ -8,5 +8,6 @@ class WagtailLocalizeAppConfig(AppConfig):
     verbose_name = _("Wagtail localize")
 
     def ready(self):
-        from .models import register_post_delete_signal_handlers
+        from .models import register_post_delete_signal_handlers, register_progress_signal_handlers
         register_post_delete_signal_handlers()
+        register_progress_signal_handlers()
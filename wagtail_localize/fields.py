@@ -75,10 +75,10 @@ class SynchronizedField(BaseTranslatableField):
         return f"<SynchronizedField {self.field_name}>"
 
 
-def get_translatable_fields(model):
-    if hasattr(model, 'translatable_fields'):
-        return model.translatable_fields
-
+def generate_translatable_fields(model):
+    """
+    Generates a list of translatable fields for a model that doesn't specify them.
+    """
     translatable_fields = []
 
     for field in model._meta.get_fields():
@@ -150,13 +150,133 @@ def get_translatable_fields(model):
     return translatable_fields
 
 
+# The kinds of field that extract_segments and ingest_segments handle differently
+FIELD_KIND_STREAM = 'stream'
+FIELD_KIND_RICH_TEXT = 'rich_text'
+FIELD_KIND_TEXT = 'text'
+FIELD_KIND_FOREIGN_KEY = 'foreign_key'
+FIELD_KIND_CHILD_RELATION = 'child_relation'
+
+
+def get_field_kind(field):
+    """
+    Classifies a model field into one of the FIELD_KIND_* constants. Returns None for anything else.
+    """
+    if isinstance(field, StreamField):
+        return FIELD_KIND_STREAM
+
+    # Note: RichTextField is a subclass of TextField so must be checked first
+    elif isinstance(field, RichTextField):
+        return FIELD_KIND_RICH_TEXT
+
+    elif isinstance(field, (models.TextField, models.CharField)):
+        return FIELD_KIND_TEXT
+
+    elif isinstance(field, models.ForeignKey):
+        return FIELD_KIND_FOREIGN_KEY
+
+    elif isinstance(field, models.ManyToOneRel):
+        return FIELD_KIND_CHILD_RELATION
+
+
+class ResolvedTranslatableField:
+    """
+    A translatable field of a specific model with its model field looked up and classified.
+    """
+    def __init__(self, translatable_field, field):
+        self.translatable_field = translatable_field
+        self.field = field
+        self.kind = get_field_kind(field)
+
+    def __repr__(self):
+        return f"<ResolvedTranslatableField {self.translatable_field!r} {self.kind}>"
+
+
+class ModelTranslatableFields:
+    """
+    The translatable fields of a model, computed once and stored in the registry below.
+    """
+    def __init__(self, model):
+        self.model = model
+
+        # This tuple is cached by Django and replaced when the app registry is reloaded
+        self.meta_fields = model._meta.get_fields()
+
+        if hasattr(model, 'translatable_fields'):
+            self.translatable_fields = model.translatable_fields
+        else:
+            self.translatable_fields = generate_translatable_fields(model)
+
+        self.resolved_fields = [
+            ResolvedTranslatableField(translatable_field, translatable_field.get_field(model))
+            for translatable_field in self.translatable_fields
+        ]
+
+        self.resolved_fields_by_name = {
+            resolved_field.field.name: resolved_field
+            for resolved_field in self.resolved_fields
+        }
+
+    def is_stale(self):
+        return (
+            self.model._meta.get_fields() is not self.meta_fields
+            or getattr(self.model, 'translatable_fields', self.translatable_fields) is not self.translatable_fields
+        )
+
+
+_registry = {}
+
+
+def get_model_translatable_fields(model):
+    model_translatable_fields = _registry.get(model)
+
+    if model_translatable_fields is None or model_translatable_fields.is_stale():
+        model_translatable_fields = _registry[model] = ModelTranslatableFields(model)
+
+    return model_translatable_fields
+
+
+def get_translatable_fields(model):
+    """
+    Returns the list of translatable fields for the given model.
+
+    This is the model's translatable_fields attribute if it has one, otherwise it is generated from
+    the model's fields. The result is computed once per model.
+    """
+    return get_model_translatable_fields(model).translatable_fields
+
+
+def get_resolved_translatable_fields(model):
+    """
+    Returns a ResolvedTranslatableField for each of the model's translatable fields.
+    """
+    return get_model_translatable_fields(model).resolved_fields
+
+
+def get_resolved_field(model, field_name):
+    """
+    Returns the ResolvedTranslatableField for the given field name.
+
+    Fields that aren't in the model's translatable fields are looked up and classified on the fly.
+    """
+    resolved_field = get_model_translatable_fields(model).resolved_fields_by_name.get(field_name)
+
+    if resolved_field is None:
+        resolved_field = ResolvedTranslatableField(None, model._meta.get_field(field_name))
+
+    return resolved_field
+
+
 def copy_synchronised_fields(source, target):
     """
     Copies data in synchronised fields from the source object to the target object.
     """
-    for translatable_field in get_translatable_fields(source.__class__):
-        if translatable_field.is_synchronized(source):
-            field = translatable_field.get_field(target.__class__)
+    for resolved_field in get_resolved_translatable_fields(source.__class__):
+        if resolved_field.translatable_field.is_synchronized(source):
+            if target.__class__ is source.__class__:
+                field = resolved_field.field
+            else:
+                field = resolved_field.translatable_field.get_field(target.__class__)
 
             if isinstance(field, (models.ManyToOneRel)) and isinstance(field.remote_field, ParentalKey):
                 # Use modelcluster's copy_child_relation for child relations
@@ -6,3 +6,7 @@ class WagtailLocalesAppConfig(AppConfig):
     name = 'wagtail_localize.locales'
     label = 'wagtaillocales'
     verbose_name = _("Wagtail locales (Wagtail Localize version)")
+
+    def ready(self):
+        from .utils import register_locale_usage_signal_handlers
+        register_locale_usage_signal_handlers()
@@ -1,10 +1,112 @@
 from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from wagtail.core.models import Locale
+from wagtail.core.models import Locale, Page
 from wagtail.tests.utils import WagtailTestUtils
 
+from wagtail_localize.test.models import TestPage, TestSnippet
+
+from .utils import LOCALE_USAGE_CACHE_KEY, clear_locale_usage_cache, get_locale_usage, get_locale_usages, locale_is_used
+
+
+@override_settings(WAGTAIL_CONTENT_LANGUAGES=[("en", "English"), ("fr", "French"), ("es", "Spanish")])
+class TestLocaleUsage(TestCase):
+    def setUp(self):
+        cache.delete(LOCALE_USAGE_CACHE_KEY)
+        self.english = Locale.objects.get()
+        self.french = Locale.objects.create(language_code='fr')
+        self.spanish = Locale.objects.create(language_code='es')
+
+        TestSnippet.objects.create(field="Test", locale=self.english)
+        TestSnippet.objects.create(field="Test", locale=self.english)
+        TestSnippet.objects.create(field="Test", locale=self.french)
+
+    def test_get_locale_usages(self):
+        usages = get_locale_usages()
+
+        # The root page isn't counted
+        num_pages = Page.objects.filter(locale=self.english).exclude(depth=1).count()
+        self.assertEqual(usages[self.english.id], (num_pages, 2))
+        self.assertEqual(usages[self.french.id], (0, 1))
+        self.assertNotIn(self.spanish.id, usages)
+
+        self.assertEqual(get_locale_usage(self.french), (0, 1))
+        self.assertEqual(get_locale_usage(self.spanish), (0, 0))
+
+    def test_get_locale_usages_is_cached(self):
+        get_locale_usages()
+
+        with self.assertNumQueries(1):
+            # Only the cache lookup
+            self.assertEqual(get_locale_usage(self.french), (0, 1))
+
+    def test_cache_is_cleared_on_create(self):
+        get_locale_usages()
+
+        TestSnippet.objects.create(field="Test", locale=self.spanish)
+
+        self.assertEqual(get_locale_usage(self.spanish), (0, 1))
+
+    def test_cache_is_cleared_on_delete(self):
+        get_locale_usages()
+
+        TestSnippet.objects.filter(locale=self.french).get().delete()
+
+        self.assertEqual(get_locale_usage(self.french), (0, 0))
+
+    def test_cache_is_cleared_when_locale_changes(self):
+        get_locale_usages()
+
+        snippet = TestSnippet.objects.get(locale=self.french)
+        snippet.locale = self.spanish
+        snippet.save()
+
+        self.assertEqual(get_locale_usage(self.french), (0, 0))
+        self.assertEqual(get_locale_usage(self.spanish), (0, 1))
+
+    def test_cache_is_kept_when_locale_doesnt_change(self):
+        get_locale_usages()
+
+        snippet = TestSnippet.objects.get(locale=self.french)
+        snippet.field = "Changed"
+        snippet.save()
+
+        self.assertIsNotNone(cache.get(LOCALE_USAGE_CACHE_KEY))
+
+    def test_cache_is_cleared_when_page_is_created(self):
+        get_locale_usages()
+
+        # Page types are subclasses of Page, so they need their own signal handlers
+        Page.objects.get(depth=2).add_child(instance=TestPage(title="Test page", slug="test-page"))
+
+        self.assertIsNone(cache.get(LOCALE_USAGE_CACHE_KEY))
+
+    def test_clear_locale_usage_cache_after_bulk_update(self):
+        get_locale_usages()
+
+        TestSnippet.objects.filter(locale=self.french).update(locale=self.spanish)
+        clear_locale_usage_cache()
+
+        self.assertEqual(get_locale_usage(self.french), (0, 0))
+        self.assertEqual(get_locale_usage(self.spanish), (0, 1))
+
+    def test_locale_is_used(self):
+        self.assertTrue(locale_is_used(self.english))
+        self.assertTrue(locale_is_used(self.french))
+        self.assertFalse(locale_is_used(self.spanish))
+
+    def test_locale_is_used_doesnt_use_cache(self):
+        get_locale_usages()
+
+        TestSnippet.objects.filter(locale=self.french).update(locale=self.spanish)
+
+        self.assertFalse(locale_is_used(self.french))
+        self.assertTrue(locale_is_used(self.spanish))
+
 
 @override_settings(WAGTAIL_CONTENT_LANGUAGES=[("en", "English"), ("fr", "French")])
 class TestLocaleIndexView(TestCase, WagtailTestUtils):
@@ -19,6 +121,23 @@ class TestLocaleIndexView(TestCase, WagtailTestUtils):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'wagtaillocales/index.html')
 
+    @override_settings(WAGTAIL_CONTENT_LANGUAGES=[("en", "English"), ("fr", "French"), ("es", "Spanish")])
+    def test_query_count_doesnt_depend_on_number_of_locales(self):
+        def get_num_queries():
+            cache.delete(LOCALE_USAGE_CACHE_KEY)
+            with CaptureQueriesContext(connection) as queries:
+                self.get()
+            return len(queries)
+
+        # Warm up any other caches used by the admin
+        self.get()
+        num_queries = get_num_queries()
+
+        Locale.objects.create(language_code='fr')
+        Locale.objects.create(language_code='es')
+
+        self.assertEqual(get_num_queries(), num_queries)
+
 
 @override_settings(WAGTAIL_CONTENT_LANGUAGES=[("en", "English"), ("fr", "French")])
 class TestLocaleCreateView(TestCase, WagtailTestUtils):
@@ -1,18 +1,109 @@
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_init, post_save
 from wagtail.core.models import Page, get_translatable_models
 
 
-def get_locale_usage(locale):
+LOCALE_USAGE_CACHE_KEY = 'wagtail_localize:locale_usage'
+LOCALE_USAGE_CACHE_TIMEOUT = 60 * 60
+
+
+def _get_locale_querysets():
     """
-    Returns the number of pages and other objects that use a locale
+    Yields a (is_page, queryset) tuple for each translatable model. Each queryset
+    contains the objects that count towards the usage of their locale.
     """
-    num_pages = Page.objects.filter(locale=locale).exclude(depth=1).count()
-
-    num_others = 0
+    yield True, Page.objects.exclude(depth=1)
 
     for model in get_translatable_models():
         if model is Page:
             continue
 
-        num_others += model.objects.filter(locale=locale).count()
+        yield False, model.objects.all()
+
+
+def get_locale_usages():
+    """
+    Returns a dictionary mapping locale IDs to the number of pages and other objects
+    that use each locale.
+
+    This makes one grouped query per translatable model regardless of the number of
+    locales. The result is cached until a translatable object is created, deleted or
+    moved to another locale. Bulk operations don't send signals, so code that uses
+    bulk_create() or queryset.update(locale=...) on translatable models should call
+    clear_locale_usage_cache() afterwards. Locales that aren't used by anything are
+    left out.
+    """
+    usages = cache.get(LOCALE_USAGE_CACHE_KEY)
+
+    if usages is None:
+        counts = defaultdict(lambda: [0, 0])
+
+        for is_page, queryset in _get_locale_querysets():
+            for row in queryset.order_by().values('locale_id').annotate(count=Count('pk')):
+                counts[row['locale_id']][0 if is_page else 1] += row['count']
+
+        usages = {locale_id: tuple(usage) for locale_id, usage in counts.items()}
+        cache.set(LOCALE_USAGE_CACHE_KEY, usages, LOCALE_USAGE_CACHE_TIMEOUT)
+
+    return usages
+
+
+def get_locale_usage(locale):
+    """
+    Returns the number of pages and other objects that use a locale
+    """
+    return get_locale_usages().get(locale.id, (0, 0))
+
+
+def locale_is_used(locale):
+    """
+    Returns True if any page or other object uses the locale.
+
+    This always checks the database, stopping at the first model that has an object
+    in the locale.
+    """
+    return any(
+        queryset.filter(locale=locale).exists()
+        for is_page, queryset in _get_locale_querysets()
+    )
+
+
+def clear_locale_usage_cache():
+    """
+    Clears the cached result of get_locale_usages().
+    """
+    cache.delete(LOCALE_USAGE_CACHE_KEY)
+
+
+def remember_locale_on_init(sender, instance, **kwargs):
+    # This is None if the locale was deferred
+    instance._wagtail_localize_initial_locale_id = instance.__dict__.get('locale_id')
+
+
+def clear_locale_usage_cache_on_save(sender, instance, created, update_fields=None, **kwargs):
+    initial_locale_id = getattr(instance, '_wagtail_localize_initial_locale_id', None)
+    instance._wagtail_localize_initial_locale_id = instance.locale_id
+
+    if created:
+        clear_locale_usage_cache()
+
+    elif update_fields is None or 'locale' in update_fields or 'locale_id' in update_fields:
+        # The locale isn't known if it was deferred, so assume that it has changed
+        if initial_locale_id is None or initial_locale_id != instance.locale_id:
+            clear_locale_usage_cache()
+
+
+def clear_locale_usage_cache_on_delete(sender, instance, **kwargs):
+    clear_locale_usage_cache()
+
 
-    return num_pages, num_others
+def register_locale_usage_signal_handlers():
+    # Signals are sent with the concrete class of the instance, so page types
+    # and other subclasses need their own connection
+    for model in get_translatable_models(include_subclasses=True):
+        post_init.connect(remember_locale_on_init, sender=model)
+        post_save.connect(clear_locale_usage_cache_on_save, sender=model)
+        post_delete.connect(clear_locale_usage_cache_on_delete, sender=model)
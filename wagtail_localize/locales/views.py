@@ -7,7 +7,7 @@ from wagtail.core.models import Locale
 from wagtail.core.permissions import locale_permission_policy
 
 from .forms import LocaleForm
-from .utils import get_locale_usage
+from .utils import get_locale_usages, locale_is_used
 
 
 class IndexView(generic.IndexView):
@@ -20,8 +20,9 @@ class IndexView(generic.IndexView):
     def get_context_data(self):
         context = super().get_context_data()
 
+        usages = get_locale_usages()
         for locale in context['locales']:
-            locale.num_pages, locale.num_others = get_locale_usage(locale)
+            locale.num_pages, locale.num_others = usages.get(locale.id, (0, 0))
 
         return context
 
@@ -50,7 +51,7 @@ class DeleteView(generic.DeleteView):
     queryset = Locale.all_objects.all()
 
     def can_delete(self, locale):
-        return get_locale_usage(locale) == (0, 0)
+        return not locale_is_used(locale)
 
     def get_context_data(self, object=None):
         context = context = super().get_context_data()
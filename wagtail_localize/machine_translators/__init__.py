@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.utils.module_loading import import_string
 
+from wagtail_localize.models import MachineTranslation, String
+from wagtail_localize.strings import StringValue
+
 
 def get_machine_translator():
     config = getattr(settings, 'WAGTAILLOCALIZE_MACHINE_TRANSLATOR', None)
@@ -12,3 +15,81 @@ def get_machine_translator():
     machine_translator_class = import_string(config['CLASS'])
 
     return machine_translator_class(config.get('OPTIONS', {}))
+
+
+def translate_strings(translator, source_locale, target_locale, strings):
+    """
+    Translates the given StringValues with the given machine translator.
+
+    Strings that have been translated by the same translator between the same languages
+    before are fetched from the MachineTranslation cache, only the rest are sent to the
+    translator. New translations are added to the cache.
+
+    Returns a dictionary mapping each StringValue to its translated StringValue.
+    """
+    return translate_strings_into_locales(translator, source_locale, {target_locale: strings})[target_locale]
+
+
+def translate_strings_into_locales(translator, source_locale, strings_by_locale):
+    """
+    Translates StringValues into several locales at once. Takes a dictionary mapping each target
+    locale to the StringValues to translate into it.
+
+    This works like translate_strings, but all the requests that need to be sent to the machine
+    translator are made concurrently (see BaseMachineTranslator.translate_concurrently).
+
+    Returns a dictionary mapping each target locale to a dictionary of translations.
+    """
+    strings_by_hash = {
+        target_locale: {
+            String.get_data_hash(string.data): string
+            for string in strings
+        }
+        for target_locale, strings in strings_by_locale.items()
+    }
+    locales_by_language = {
+        target_locale.language_code: target_locale
+        for target_locale in strings_by_locale.keys()
+    }
+
+    cache = MachineTranslation.objects.filter(
+        translator=translator.cache_name,
+        source_language=source_locale.language_code,
+    )
+
+    translations = {target_locale: {} for target_locale in strings_by_locale.keys()}
+    for target_language, data_hash, data in cache.filter(
+        target_language__in=locales_by_language.keys(),
+        data_hash__in={data_hash for hashes in strings_by_hash.values() for data_hash in hashes.keys()},
+    ).values_list('target_language', 'data_hash', 'data'):
+        target_locale = locales_by_language[target_language]
+        if data_hash in strings_by_hash[target_locale]:
+            translations[target_locale][strings_by_hash[target_locale][data_hash]] = StringValue(data)
+
+    requests = []
+    for target_locale, hashes in strings_by_hash.items():
+        missing = [string for string in hashes.values() if string not in translations[target_locale]]
+
+        if missing:
+            requests.append((source_locale, target_locale, missing))
+
+    if requests:
+        results = translator.translate_concurrently(requests)
+
+        # Ignore conflicts in case another process translated the same strings in the meantime
+        MachineTranslation.objects.bulk_create([
+            MachineTranslation(
+                translator=translator.cache_name,
+                source_language=source_locale.language_code,
+                target_language=target_locale.language_code,
+                data_hash=String.get_data_hash(string.data),
+                data=translation.data,
+            )
+            for (_source_locale, target_locale, _strings), new_translations in zip(requests, results)
+            for string, translation in new_translations.items()
+        ], ignore_conflicts=True)
+
+        for (_source_locale, target_locale, _strings), new_translations in zip(requests, results):
+            translations[target_locale].update(new_translations)
+
+    return translations
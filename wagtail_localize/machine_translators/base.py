@@ -1,11 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.utils.functional import cached_property
+
+
+class RateLimiter:
+    """
+    Spaces out calls to wait() so that no more than `rate` of them return per second.
+
+    This is thread safe so it can be shared between the workers of a thread pool.
+    """
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.lock = threading.Lock()
+        self.next_call_at = 0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call_at - now
+            self.next_call_at = max(now, self.next_call_at) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+
 class BaseMachineTranslator:
     display_name = "Unknown"
 
+    # The number of calls to translate() that translate_concurrently() makes at the same time.
+    # Can be overridden with the CONCURRENCY option
+    CONCURRENCY = 4
+
     def __init__(self, options):
         self.options = options
 
-    def translate(self, strings):
+    @cached_property
+    def rate_limiter(self):
+        """
+        Spaces out calls to translate() according to the RATE_LIMIT option, which is the
+        maximum number of calls to start per second. Returns None if there is no limit.
+        """
+        rate_limit = getattr(self, 'options', {}).get('RATE_LIMIT')
+        return RateLimiter(rate_limit) if rate_limit else None
+
+    @property
+    def cache_name(self):
+        """
+        Identifies this translator in the MachineTranslation cache.
+        """
+        return '{}.{}'.format(self.__class__.__module__, self.__class__.__name__)
+
+    def get_batch_size(self):
+        """
+        Returns the maximum number of strings that should be passed to a single call
+        to translate(), or None if there is no limit.
+        """
+        return None
+
+    def translate(self, source_locale, target_locale, strings):
         raise NotImplementedError
 
+    def translate_concurrently(self, requests):
+        """
+        Translates several lists of strings at the same time.
+
+        Takes a list of (source_locale, target_locale, strings) tuples and returns a list
+        of dictionaries in the same format as translate(), one for each request.
+
+        By default, the requests are split into batches (see get_batch_size) and passed to
+        translate() on a pool of threads, subject to the CONCURRENCY and RATE_LIMIT options.
+        Translators with a native asynchronous API may override this.
+        """
+        batch_size = self.get_batch_size()
+        tasks = []
+
+        for request_index, (source_locale, target_locale, strings) in enumerate(requests):
+            strings = list(strings)
+            step = batch_size or len(strings) or 1
+
+            for i in range(0, len(strings), step):
+                tasks.append((request_index, source_locale, target_locale, strings[i:i + step]))
+
+        # Look this up before starting any threads so they all share the same rate limiter
+        rate_limiter = self.rate_limiter
+
+        def run_task(task):
+            request_index, source_locale, target_locale, strings = task
+
+            if rate_limiter is not None:
+                rate_limiter.wait()
+
+            return self.translate(source_locale, target_locale, strings)
+
+        concurrency = getattr(self, 'options', {}).get('CONCURRENCY', self.CONCURRENCY)
+        max_workers = min(concurrency, len(tasks))
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(run_task, tasks))
+        else:
+            results = [run_task(task) for task in tasks]
+
+        translations = [{} for request in requests]
+        for task, result in zip(tasks, results):
+            translations[task[0]].update(result)
+
+        return translations
+
     def can_translate(self, source_locale, target_locale):
         return False
@@ -1,3 +1,5 @@
+import threading
+
 import requests
 from django.utils.translation import gettext_lazy as _
 
@@ -6,6 +8,18 @@ from wagtail_localize.strings import StringValue
 from .base import BaseMachineTranslator
 
 
+# Sessions aren't thread safe, so each thread gets its own. This still lets the requests
+# made by a thread reuse its connections to the API
+thread_local = threading.local()
+
+
+def get_session():
+    if not hasattr(thread_local, 'session'):
+        thread_local.session = requests.Session()
+
+    return thread_local.session
+
+
 def language_code(code, is_target=False):
     # DeepL supports targeting Brazillian Portuguese but doesn't have this for other languages
     if is_target and code in ['pt-pt', 'pt-br']:
@@ -17,14 +31,26 @@ def language_code(code, is_target=False):
 class DeepLTranslator(BaseMachineTranslator):
     display_name = _("DeepL")
 
+    API_URL = 'https://api.deepl.com/v2/translate'
+
+    # DeepL accepts up to 50 texts per request
+    BATCH_SIZE = 50
+
+    def get_batch_size(self):
+        return self.options.get('BATCH_SIZE', self.BATCH_SIZE)
+
     def translate(self, source_locale, target_locale, strings):
-        response = requests.post('https://api.deepl.com/v2/translate', {
+        # translate_concurrently() has already split the strings into batches
+        strings = list(strings)
+
+        response = get_session().post(self.options.get('API_URL', self.API_URL), {
             'auth_key': self.options['AUTH_KEY'],
             'text': [string.data for string in strings],
             'tag_handling': 'xml',
             'source_lang': language_code(source_locale.language_code),
             'target_lang': language_code(target_locale.language_code, is_target=True),
         })
+        response.raise_for_status()
 
         return {
             string: StringValue(translation['text'])
@@ -0,0 +1,127 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from wagtail_localize.machine_translators.base import BaseMachineTranslator, RateLimiter
+from wagtail_localize.strings import StringValue
+
+
+class UpperCaseTranslator(BaseMachineTranslator):
+    def __init__(self, options, batch_size=None):
+        super().__init__(options)
+        self.batch_size = batch_size
+        self.calls = []
+
+    def get_batch_size(self):
+        return self.batch_size
+
+    def translate(self, source_locale, target_locale, strings):
+        self.calls.append((source_locale, target_locale, strings))
+
+        return {
+            string: StringValue('{}: {}'.format(target_locale, string.data.upper()))
+            for string in strings
+        }
+
+
+class TestTranslateConcurrently(SimpleTestCase):
+    def test_translate_concurrently(self):
+        translator = UpperCaseTranslator({})
+
+        translations = translator.translate_concurrently([
+            ('en', 'fr', [StringValue("Hello"), StringValue("World")]),
+            ('en', 'de', [StringValue("Hello")]),
+        ])
+
+        self.assertEqual(translations, [
+            {StringValue("Hello"): StringValue("fr: HELLO"), StringValue("World"): StringValue("fr: WORLD")},
+            {StringValue("Hello"): StringValue("de: HELLO")},
+        ])
+        self.assertEqual(len(translator.calls), 2)
+
+    def test_splits_into_batches(self):
+        translator = UpperCaseTranslator({}, batch_size=2)
+        strings = [StringValue("String {}".format(i)) for i in range(5)]
+
+        translations = translator.translate_concurrently([('en', 'fr', strings)])
+
+        self.assertEqual(translations, [
+            {string: StringValue("fr: " + string.data.upper()) for string in strings}
+        ])
+        self.assertEqual(sorted(len(strings) for source, target, strings in translator.calls), [1, 2, 2])
+
+    def test_requests_run_at_the_same_time(self):
+        # Each call waits until three calls are running at once, so this would time out if
+        # they were made one after another
+        barrier = threading.Barrier(3, timeout=5)
+
+        class BlockingTranslator(UpperCaseTranslator):
+            def translate(self, source_locale, target_locale, strings):
+                barrier.wait()
+                return super().translate(source_locale, target_locale, strings)
+
+        translator = BlockingTranslator({'CONCURRENCY': 3})
+
+        translations = translator.translate_concurrently([
+            ('en', locale, [StringValue("Hello")])
+            for locale in ['fr', 'de', 'es']
+        ])
+
+        self.assertEqual(translations, [
+            {StringValue("Hello"): StringValue("{}: HELLO".format(locale))}
+            for locale in ['fr', 'de', 'es']
+        ])
+
+    def test_concurrency_of_one(self):
+        translator = UpperCaseTranslator({'CONCURRENCY': 1})
+
+        with mock.patch('wagtail_localize.machine_translators.base.ThreadPoolExecutor') as executor:
+            translations = translator.translate_concurrently([
+                ('en', 'fr', [StringValue("Hello")]),
+                ('en', 'de', [StringValue("Hello")]),
+            ])
+
+        executor.assert_not_called()
+        self.assertEqual(len(translations), 2)
+
+    def test_rate_limit(self):
+        translator = UpperCaseTranslator({'RATE_LIMIT': 10})
+
+        with mock.patch.object(translator.rate_limiter, 'wait') as wait:
+            translator.translate_concurrently([
+                ('en', locale, [StringValue("Hello")])
+                for locale in ['fr', 'de', 'es']
+            ])
+
+        self.assertEqual(wait.call_count, 3)
+
+    def test_translator_without_options(self):
+        # Translators that override __init__() without calling super() don't have any options
+        class TranslatorWithoutOptions(UpperCaseTranslator):
+            def __init__(self):
+                self.batch_size = None
+                self.calls = []
+
+        translations = TranslatorWithoutOptions().translate_concurrently([
+            ('en', 'fr', [StringValue("Hello")]),
+        ])
+
+        self.assertEqual(translations, [{StringValue("Hello"): StringValue("fr: HELLO")}])
+
+    def test_no_requests(self):
+        self.assertEqual(UpperCaseTranslator({}).translate_concurrently([]), [])
+
+
+class TestRateLimiter(SimpleTestCase):
+    @mock.patch('wagtail_localize.machine_translators.base.time')
+    def test_rate_limiter(self, time):
+        time.monotonic.return_value = 100.0
+        rate_limiter = RateLimiter(4)
+
+        rate_limiter.wait()
+        rate_limiter.wait()
+        rate_limiter.wait()
+
+        # The first call goes straight through, then each call waits a quarter of a second longer
+        self.assertEqual([call.args[0] for call in time.sleep.call_args_list], [0.25, 0.5])
@@ -0,0 +1,137 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs
+
+import requests
+from django.test import TestCase
+from wagtail.core.models import Locale
+
+from wagtail_localize.machine_translators.deepl import DeepLTranslator, get_session
+from wagtail_localize.strings import StringValue
+
+
+class FakeDeepLHandler(BaseHTTPRequestHandler):
+    """
+    Stands in for the DeepL API. Translates text by converting it to upper case.
+    """
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+        params = parse_qs(body)
+        self.server.received_requests.append(params)
+
+        if params['auth_key'] != ['test-key']:
+            self.send_response(403)
+            self.end_headers()
+            return
+
+        response = json.dumps({
+            'translations': [
+                {'detected_source_language': params['source_lang'][0], 'text': text.upper()}
+                for text in params['text']
+            ]
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDeepLTranslator(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(('127.0.0.1', 0), FakeDeepLHandler)
+        cls.server.received_requests = []
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.received_requests.clear()
+        self.english_locale = Locale.objects.get()
+        self.french_locale = Locale.objects.create(language_code="fr")
+
+    def get_translator(self, **options):
+        return DeepLTranslator({
+            'AUTH_KEY': 'test-key',
+            'API_URL': 'http://127.0.0.1:{}/v2/translate'.format(self.server.server_port),
+            **options,
+        })
+
+    def test_translate(self):
+        translations = self.get_translator().translate(self.english_locale, self.french_locale, [
+            StringValue("Hello world!"),
+            StringValue('<a id="a1">A link</a>'),
+        ])
+
+        self.assertEqual(translations, {
+            StringValue("Hello world!"): StringValue("HELLO WORLD!"),
+            StringValue('<a id="a1">A link</a>'): StringValue('<A ID="A1">A LINK</A>'),
+        })
+
+        self.assertEqual(len(self.server.received_requests), 1)
+        self.assertEqual(self.server.received_requests[0], {
+            'auth_key': ['test-key'],
+            'text': ["Hello world!", '<a id="a1">A link</a>'],
+            'tag_handling': ['xml'],
+            'source_lang': ['EN'],
+            'target_lang': ['FR'],
+        })
+
+    def test_translate_in_batches(self):
+        strings = [StringValue("String {}".format(i)) for i in range(5)]
+
+        translations = self.get_translator(BATCH_SIZE=2).translate_concurrently([
+            (self.english_locale, self.french_locale, strings),
+        ])
+
+        self.assertEqual(translations, [{
+            string: StringValue(string.data.upper())
+            for string in strings
+        }])
+        self.assertEqual(
+            sorted(request['text'] for request in self.server.received_requests),
+            [["String 0", "String 1"], ["String 2", "String 3"], ["String 4"]]
+        )
+
+    def test_each_thread_has_its_own_session(self):
+        sessions = []
+
+        def get_session_in_thread():
+            sessions.append(get_session())
+
+        thread = threading.Thread(target=get_session_in_thread)
+        thread.start()
+        thread.join()
+
+        self.assertIs(get_session(), get_session())
+        self.assertIsNot(sessions[0], get_session())
+
+    def test_translate_error(self):
+        translator = DeepLTranslator({
+            'AUTH_KEY': 'wrong-key',
+            'API_URL': 'http://127.0.0.1:{}/v2/translate'.format(self.server.server_port),
+        })
+
+        with self.assertRaises(requests.HTTPError):
+            translator.translate(self.english_locale, self.french_locale, [StringValue("Hello world!")])
+
+    def test_can_translate(self):
+        translator = self.get_translator()
+        brazilian_portuguese_locale = Locale.objects.create(language_code="pt-br")
+        portuguese_locale = Locale.objects.create(language_code="pt-pt")
+
+        self.assertTrue(translator.can_translate(self.english_locale, self.french_locale))
+        self.assertTrue(translator.can_translate(brazilian_portuguese_locale, portuguese_locale))
+        self.assertFalse(translator.can_translate(self.english_locale, self.english_locale))
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.test import TestCase
+from wagtail.core.models import Locale
+
+from wagtail_localize.machine_translators import translate_strings, translate_strings_into_locales
+from wagtail_localize.machine_translators.dummy import DummyTranslator
+from wagtail_localize.models import MachineTranslation, String
+from wagtail_localize.strings import StringValue
+
+
+class TestTranslateStrings(TestCase):
+    def setUp(self):
+        self.english_locale = Locale.objects.get()
+        self.french_locale = Locale.objects.create(language_code="fr")
+        self.translator = DummyTranslator({})
+
+    def test_translate_strings(self):
+        translations = translate_strings(self.translator, self.english_locale, self.french_locale, [
+            StringValue("Hello world!"),
+        ])
+
+        self.assertEqual(translations, {
+            StringValue("Hello world!"): StringValue("world! Hello"),
+        })
+
+        machine_translation = MachineTranslation.objects.get()
+        self.assertEqual(machine_translation.translator, 'wagtail_localize.machine_translators.dummy.DummyTranslator')
+        self.assertEqual(machine_translation.source_language, 'en')
+        self.assertEqual(machine_translation.target_language, 'fr')
+        self.assertEqual(machine_translation.data_hash, String.get_data_hash("Hello world!"))
+        self.assertEqual(machine_translation.data, "world! Hello")
+
+    def test_uses_cached_translations(self):
+        MachineTranslation.objects.create(
+            translator=self.translator.cache_name,
+            source_language='en',
+            target_language='fr',
+            data_hash=String.get_data_hash("Hello world!"),
+            data="Bonjour le monde !",
+        )
+
+        with mock.patch.object(DummyTranslator, 'translate', wraps=self.translator.translate) as translate:
+            translations = translate_strings(self.translator, self.english_locale, self.french_locale, [
+                StringValue("Hello world!"),
+                StringValue("Goodbye world!"),
+            ])
+
+        # Only the string that wasn't in the cache is sent to the translator
+        translate.assert_called_once_with(self.english_locale, self.french_locale, [StringValue("Goodbye world!")])
+
+        self.assertEqual(translations, {
+            StringValue("Hello world!"): StringValue("Bonjour le monde !"),
+            StringValue("Goodbye world!"): StringValue("world! Goodbye"),
+        })
+        self.assertEqual(MachineTranslation.objects.count(), 2)
+
+    def test_cache_is_per_language(self):
+        spanish_locale = Locale.objects.create(language_code="es")
+        translate_strings(self.translator, self.english_locale, self.french_locale, [StringValue("Hello world!")])
+
+        with mock.patch.object(DummyTranslator, 'translate', wraps=self.translator.translate) as translate:
+            translate_strings(self.translator, self.english_locale, spanish_locale, [StringValue("Hello world!")])
+
+        translate.assert_called_once()
+        self.assertEqual(MachineTranslation.objects.count(), 2)
+
+    def test_all_strings_cached(self):
+        translate_strings(self.translator, self.english_locale, self.french_locale, [StringValue("Hello world!")])
+
+        with mock.patch.object(DummyTranslator, 'translate') as translate:
+            translations = translate_strings(self.translator, self.english_locale, self.french_locale, [StringValue("Hello world!")])
+
+        translate.assert_not_called()
+        self.assertEqual(translations, {
+            StringValue("Hello world!"): StringValue("world! Hello"),
+        })
+
+    def test_translate_strings_into_locales(self):
+        german_locale = Locale.objects.create(language_code="de")
+        translate_strings(self.translator, self.english_locale, self.french_locale, [StringValue("Hello world!")])
+
+        with mock.patch.object(DummyTranslator, 'translate', wraps=self.translator.translate) as translate:
+            translations = translate_strings_into_locales(self.translator, self.english_locale, {
+                self.french_locale: [StringValue("Hello world!"), StringValue("Goodbye world!")],
+                german_locale: [StringValue("Hello world!")],
+            })
+
+        self.assertEqual(translations, {
+            self.french_locale: {
+                StringValue("Hello world!"): StringValue("world! Hello"),
+                StringValue("Goodbye world!"): StringValue("world! Goodbye"),
+            },
+            german_locale: {
+                StringValue("Hello world!"): StringValue("world! Hello"),
+            },
+        })
+
+        # One request for each locale, not including the cached string
+        self.assertEqual(sorted(
+            (call.args[1].language_code, call.args[2]) for call in translate.call_args_list
+        ), [
+            ('de', [StringValue("Hello world!")]),
+            ('fr', [StringValue("Goodbye world!")]),
+        ])
+        self.assertEqual(MachineTranslation.objects.count(), 3)
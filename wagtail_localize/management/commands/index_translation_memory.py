@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from wagtail_localize.models import String, StringMinHash
+
+
+class Command(BaseCommand):
+    help = "Adds any strings that are missing from the translation memory index, such as those created before it existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="The number of strings to index at a time (default: 1000)"
+        )
+
+    def handle(self, **options):
+        indexed = 0
+        last_id = 0
+
+        while True:
+            strings = list(
+                String.objects.filter(id__gt=last_id, minhashes__isnull=True)
+                .order_by('id')[:options['chunk_size']]
+            )
+
+            if not strings:
+                break
+
+            StringMinHash.objects.index_strings(strings)
+            indexed += len(strings)
+            last_id = strings[-1].id
+
+        if options['verbosity'] >= 1:
+            self.stdout.write("Indexed {} string(s)".format(indexed))
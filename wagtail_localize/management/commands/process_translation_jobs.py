@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail_localize.operations import process_translation_job_items
+
+
+class Command(BaseCommand):
+    help = "Processes translation jobs that were submitted to be run in the background."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=20,
+            help="The number of items to claim and process at a time (default: 20)"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Exit when there are no more items to process instead of waiting for new ones"
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=5,
+            help="The number of seconds to wait before checking for new items (default: 5)"
+        )
+
+    def handle(self, **options):
+        while True:
+            processed = process_translation_job_items(options['chunk_size'])
+
+            if processed:
+                if options['verbosity'] >= 1:
+                    self.stdout.write("Processed {} translation job item(s)".format(processed))
+
+            elif options['once']:
+                break
+
+            else:
+                time.sleep(options['sleep'])
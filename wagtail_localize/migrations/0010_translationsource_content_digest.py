@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_localize', '0009_stringtranslation_errors'),
+    ]
+
+    operations = [
+        # Existing sources are left with a blank digest. This never matches a computed digest,
+        # so the digest is filled in the next time each source is refreshed.
+        migrations.AddField(
+            model_name='translationsource',
+            name='content_digest',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_localize', '0011_translationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translation',
+            name='cached_total_segments',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='translation',
+            name='cached_translated_segments',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+    ]
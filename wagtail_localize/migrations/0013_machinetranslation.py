@@ -0,0 +1,28 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_localize', '0012_translation_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MachineTranslation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('translator', models.CharField(max_length=255)),
+                ('source_language', models.CharField(max_length=100)),
+                ('target_language', models.CharField(max_length=100)),
+                ('data_hash', models.UUIDField()),
+                ('data', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('translator', 'source_language', 'target_language', 'data_hash')},
+            },
+        ),
+    ]
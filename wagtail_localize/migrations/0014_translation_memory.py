@@ -0,0 +1,22 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_localize', '0013_machinetranslation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stringtranslation',
+            name='translation_type',
+            field=models.CharField(choices=[('manual', 'Manual'), ('machine', 'Machine'), ('translation_memory', 'Translation memory')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='stringtranslation',
+            index=models.Index(fields=['translation_of', 'locale', '-updated_at'], name='wagtail_loc_transla_467873_idx'),
+        ),
+    ]
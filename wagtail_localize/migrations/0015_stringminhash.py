@@ -0,0 +1,32 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0059_apply_collection_ordering'),
+        ('wagtail_localize', '0014_translation_memory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StringMinHash',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band_hash', models.BigIntegerField()),
+                ('locale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.locale')),
+                ('string', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhashes', to='wagtail_localize.string')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='stringminhash',
+            index=models.Index(fields=['locale', 'band_hash'], name='wagtail_loc_locale__1848cd_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='stringminhash',
+            unique_together={('string', 'band_hash')},
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:49
+
+from html.parser import HTMLParser
+
+from django.db import migrations, models
+
+
+# A frozen copy of the validation in wagtail_localize.strings as it was when this
+# migration was written, so that later changes to it don't change this migration
+INLINE_TAGS = ["a", "abbr", "acronym", "b", "code", "em", "i", "strong", "br"]
+
+
+class HTMLErrorFinder(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.error_key = ''
+
+    def handle_starttag(self, name, attrs):
+        if self.error_key:
+            return
+
+        if name not in INLINE_TAGS:
+            self.error_key = 'tag_not_allowed:{}'.format(name)
+            return
+
+        keys = {key for key, value in attrs}
+        if name == 'a':
+            keys.discard('id')
+        if keys:
+            self.error_key = 'attributes_not_allowed:{}'.format(name)
+
+
+def get_html_error(html):
+    if '<' not in html:
+        return ''
+
+    finder = HTMLErrorFinder()
+    finder.feed(html)
+    finder.close()
+    return finder.error_key
+
+
+def populate_html_error(apps, schema_editor):
+    StringTranslation = apps.get_model('wagtail_localize', 'StringTranslation')
+
+    string_translations = []
+    for string_translation in StringTranslation.objects.filter(has_error=True).iterator():
+        html_error = get_html_error(string_translation.data)
+        if html_error:
+            string_translation.html_error = html_error
+            string_translations.append(string_translation)
+
+    StringTranslation.objects.bulk_update(string_translations, ['html_error'], batch_size=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_localize', '0015_stringminhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stringtranslation',
+            name='html_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(populate_html_error, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.1.14 on 2026-10-18 18:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_localize', '0016_stringtranslation_html_error'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationjobitem',
+            name='parent_object',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtail_localize.translatableobject'),
+        ),
+        migrations.AlterField(
+            model_name='translationjobitem',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In progress'), ('completed', 'Completed'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', max_length=20),
+        ),
+    ]
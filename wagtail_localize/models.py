@@ -1,6 +1,8 @@
+import hashlib
 import json
 import uuid
 from collections import defaultdict
+from datetime import timedelta
 
 import polib
 from django.conf import settings
@@ -9,22 +11,21 @@ from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
 from django.db.models import (
-    Case,
-    When,
-    Value,
     IntegerField,
     Count,
-    Sum,
     Subquery,
     Exists,
+    F,
     OuterRef,
     Q
 )
-from django.db.models.signals import post_delete
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
 from django.utils.encoding import force_text
 from django.utils.text import capfirst, slugify
 from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy as __
 from modelcluster.models import (
     ClusterableModel,
     get_serializable_data_for_fields,
@@ -33,11 +34,12 @@ from modelcluster.models import (
 from wagtail.core.models import Page, get_translatable_models
 from wagtail.core.utils import find_available_slug
 
-from .fields import copy_synchronised_fields
+from .fields import copy_synchronised_fields, get_translatable_fields
 from .segments import StringSegmentValue, TemplateSegmentValue, RelatedObjectSegmentValue
 from .segments.extract import extract_segments
 from .segments.ingest import ingest_segments
-from .strings import StringValue
+from .strings import HTMLValidationError, StringValue, get_html_error_message, validate_translated_html
+from .translation_memory import get_band_hashes, get_similarity
 
 
 def pk(obj):
@@ -47,6 +49,66 @@ def pk(obj):
         return obj
 
 
+def get_serializable_data(instance):
+    """
+    Returns the data that is stored in TranslationSource.content_json for the given instance.
+    """
+    if isinstance(instance, ClusterableModel):
+        return instance.serializable_data()
+    else:
+        return get_serializable_data_for_fields(instance)
+
+
+def get_content_digest(model, serializable_data):
+    """
+    Returns a stable digest of the translatable and synchronised content in the given
+    serialised instance.
+
+    Fields that are neither translated nor synchronised (such as page revision timestamps)
+    are excluded, so that changing them doesn't cause the source to be refreshed.
+    """
+    content = {
+        translatable_field.field_name: serializable_data.get(translatable_field.field_name)
+        for translatable_field in get_translatable_fields(model)
+    }
+    digest_data = json.dumps([model._meta.label_lower, content], sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(digest_data.encode('utf-8')).hexdigest()
+
+
+PO_WRAP_WIDTH = 200
+
+# The maximum number of strings that StringQuerySet.find_similar() compares the text with
+MAX_SIMILAR_STRING_CANDIDATES = 50
+
+
+def build_po_file(metadata, entries):
+    """
+    Returns a polib.POFile containing the given metadata and entries.
+    """
+    po = polib.POFile(wrapwidth=PO_WRAP_WIDTH)
+    po.metadata = metadata
+
+    for entry in entries:
+        po.append(entry)
+
+    return po
+
+
+def stream_po_file(metadata, entries):
+    """
+    Yields the text of a PO file containing the given metadata and entries, one entry at a time.
+
+    The output is identical to calling str() on the result of build_po_file(), but entries are
+    rendered as they are consumed from the given iterable, so the whole file never needs to be
+    held in memory. Non-obsolete entries must be given before obsolete ones.
+    """
+    # Render the header and metadata using polib itself so these stay in sync with its output
+    yield str(build_po_file(metadata, []))
+
+    for entry in entries:
+        yield '\n' + entry.__unicode__(PO_WRAP_WIDTH)
+
+
 class TranslatableObjectManager(models.Manager):
     def get_or_create_from_instance(self, instance):
         return self.get_or_create(
@@ -64,6 +126,51 @@ class TranslatableObjectManager(models.Manager):
             ),
         )
 
+    def get_or_create_for_keys(self, keys):
+        """
+        Makes sure there is a TranslatableObject for each of the given (content_type, translation_key)
+        tuples, creating any that are missing with a single query.
+
+        Returns a dictionary mapping translation keys to TranslatableObjects.
+        """
+        content_types = dict((translation_key, content_type) for content_type, translation_key in keys)
+        objects = self.in_bulk(content_types.keys())
+
+        missing = [
+            TranslatableObject(translation_key=translation_key, content_type=content_type)
+            for translation_key, content_type in content_types.items()
+            if translation_key not in objects
+        ]
+
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            objects.update(self.in_bulk([obj.translation_key for obj in missing]))
+
+        return objects
+
+    def get_instances(self, objects, locale):
+        """
+        Fetches the instances of the given TranslatableObjects in the specified locale with one
+        query per content type.
+
+        Returns a dictionary mapping translation keys to instances. Objects that haven't been
+        translated into the locale are left out.
+        """
+        translation_keys_by_content_type = defaultdict(set)
+        for obj in objects:
+            translation_keys_by_content_type[obj.content_type_id].add(obj.translation_key)
+
+        instances = {}
+        for content_type_id, translation_keys in translation_keys_by_content_type.items():
+            instances.update(
+                (instance.translation_key, instance)
+                for instance in ContentType.objects.get_for_id(content_type_id).get_all_objects_for_this_type(
+                    translation_key__in=translation_keys, locale_id=pk(locale)
+                )
+            )
+
+        return instances
+
 
 class TranslatableObject(models.Model):
     """
@@ -160,6 +267,11 @@ class TranslationSource(models.Model):
     locale = models.ForeignKey("wagtailcore.Locale", on_delete=models.CASCADE)
     object_repr = models.TextField(max_length=200)
     content_json = models.TextField()
+
+    # A digest of the translatable and synchronised content in content_json. This is used to
+    # quickly check whether the source needs to be updated when the object is saved.
+    # Sources created before this field was added have a blank digest until they are refreshed.
+    content_digest = models.CharField(max_length=64, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     last_updated_at = models.DateTimeField()
 
@@ -185,11 +297,7 @@ class TranslationSource(models.Model):
         except TranslationSource.DoesNotExist:
             pass
 
-        if isinstance(instance, ClusterableModel):
-            content_json = instance.to_json()
-        else:
-            serializable_data = get_serializable_data_for_fields(instance)
-            content_json = json.dumps(serializable_data, cls=DjangoJSONEncoder)
+        serializable_data = get_serializable_data(instance)
 
         source, created = cls.objects.update_or_create(
             object=object,
@@ -203,7 +311,8 @@ class TranslationSource(models.Model):
             defaults={
                 'locale': instance.locale,
                 'object_repr': str(instance)[:200],
-                'content_json': content_json,
+                'content_json': json.dumps(serializable_data, cls=DjangoJSONEncoder),
+                'content_digest': get_content_digest(instance.__class__, serializable_data),
                 'last_updated_at': timezone.now(),
             }
         )
@@ -220,19 +329,18 @@ class TranslationSource(models.Model):
             instance
         )
 
-        if isinstance(instance, ClusterableModel):
-            content_json = instance.to_json()
-        else:
-            serializable_data = get_serializable_data_for_fields(instance)
-            content_json = json.dumps(serializable_data, cls=DjangoJSONEncoder)
+        serializable_data = get_serializable_data(instance)
+        content_digest = get_content_digest(instance.__class__, serializable_data)
 
         # Check if the instance has changed since the previous version
         source = TranslationSource.objects.filter(object_id=object.translation_key, locale_id=instance.locale_id).first()
 
-        # Check if the instance has changed at all since the previous version
-        if source:
-            if json.loads(content_json) == json.loads(source.content_json):
-                return source, False
+        # Check if any translatable or synchronised content has changed since the previous version
+        if source and source.content_digest == content_digest:
+            # The segments don't need to be refreshed, but keep the stored content up to date for
+            # anything that uses it directly (such as previews and the title of the object)
+            source.update_stored_content(instance, serializable_data)
+            return source, False
 
         source, created = cls.objects.update_or_create(
             object=object,
@@ -246,7 +354,8 @@ class TranslationSource(models.Model):
             defaults={
                 'locale': instance.locale,
                 'object_repr': str(instance)[:200],
-                'content_json': content_json,
+                'content_json': json.dumps(serializable_data, cls=DjangoJSONEncoder),
+                'content_digest': content_digest,
                 'last_updated_at': timezone.now(),
             }
         )
@@ -258,20 +367,43 @@ class TranslationSource(models.Model):
         """
         Retrieves the source instance from the database and updates this TranslationSource
         with its current contents.
+
+        Returns False without refreshing the segments if none of the translatable or synchronised
+        content has changed. The stored content and object_repr are still updated.
         """
         instance = self.get_source_instance()
+        serializable_data = get_serializable_data(instance)
+        content_digest = get_content_digest(instance.__class__, serializable_data)
 
-        if isinstance(instance, ClusterableModel):
-            self.content_json = instance.to_json()
-        else:
-            serializable_data = get_serializable_data_for_fields(instance)
-            self.content_json = json.dumps(serializable_data, cls=DjangoJSONEncoder)
+        if content_digest == self.content_digest:
+            self.update_stored_content(instance, serializable_data)
+            return False
 
+        self.content_json = json.dumps(serializable_data, cls=DjangoJSONEncoder)
+        self.content_digest = content_digest
         self.object_repr = str(instance)[:200]
         self.last_updated_at = timezone.now()
 
-        self.save(update_fields=['content_json', 'object_repr', 'last_updated_at'])
+        self.save(update_fields=['content_json', 'content_digest', 'object_repr', 'last_updated_at'])
         self.refresh_segments()
+        return True
+
+    def update_stored_content(self, instance, serializable_data):
+        """
+        Updates content_json and object_repr if they are different from the given instance.
+
+        This is used when the content digest hasn't changed, so the segments and
+        last_updated_at are left as they are. Nothing is written if the content is the same.
+        """
+        content_json = json.dumps(serializable_data, cls=DjangoJSONEncoder)
+        object_repr = str(instance)[:200]
+
+        if content_json == self.content_json and object_repr == self.object_repr:
+            return
+
+        self.content_json = content_json
+        self.object_repr = object_repr
+        self.save(update_fields=['content_json', 'object_repr'])
 
     def get_source_instance(self):
         """
@@ -324,58 +456,109 @@ class TranslationSource(models.Model):
         Updates the *Segment models to reflect the latest version of the source.
 
         This is called by `from_instance` so you don't usually need to call this manually.
+
+        All of the Strings, TranslationContexts, Templates and segments that are required
+        are fetched and written in bulk so the number of queries doesn't depend on the number
+        of segments in the source.
         """
-        seen_string_segment_ids = []
-        seen_template_segment_ids = []
-        seen_related_object_segment_ids = []
+        string_segment_values = []
+        template_segment_values = []
+        related_object_segment_values = []
 
         for segment in extract_segments(self.as_instance()):
             if isinstance(segment, TemplateSegmentValue):
-                seen_template_segment_ids.append(
-                    TemplateSegment.from_value(self, segment).id
-                )
+                template_segment_values.append(segment)
             elif isinstance(segment, RelatedObjectSegmentValue):
-                seen_related_object_segment_ids.append(
-                    RelatedObjectSegment.from_value(self, segment).id
-                )
+                related_object_segment_values.append(segment)
             else:
-                seen_string_segment_ids.append(
-                    StringSegment.from_value(self, self.locale, segment).id
-                )
+                string_segment_values.append(segment)
+
+        contexts = TranslationContext.objects.get_or_create_for_paths(
+            self.object_id,
+            [
+                segment.path
+                for segment in string_segment_values + template_segment_values + related_object_segment_values
+            ]
+        )
+        strings = String.objects.get_or_create_for_values(
+            self.locale_id, [segment.string for segment in string_segment_values]
+        )
+        templates = Template.objects.get_or_create_for_values(template_segment_values)
+        TranslatableObject.objects.get_or_create_for_keys(
+            [(segment.content_type, segment.translation_key) for segment in related_object_segment_values]
+        )
 
-        # Delete any segments that weren't mentioned
-        self.stringsegment_set.exclude(id__in=seen_string_segment_ids).delete()
-        self.templatesegment_set.exclude(id__in=seen_template_segment_ids).delete()
-        self.relatedobjectsegment_set.exclude(id__in=seen_related_object_segment_ids).delete()
+        StringSegment.objects.filter(source=self).sync([
+            StringSegment(
+                source=self,
+                context_id=contexts[segment.path],
+                order=segment.order,
+                string_id=strings[segment.string.data],
+                attrs=json.dumps(segment.attrs),
+            )
+            for segment in string_segment_values
+        ], ['context_id', 'string_id', 'attrs'])
+
+        TemplateSegment.objects.filter(source=self).sync([
+            TemplateSegment(
+                source=self,
+                context_id=contexts[segment.path],
+                order=segment.order,
+                template_id=templates[(segment.format, segment.template)],
+            )
+            for segment in template_segment_values
+        ], ['context_id', 'template_id'])
+
+        RelatedObjectSegment.objects.filter(source=self).sync([
+            RelatedObjectSegment(
+                source=self,
+                context_id=contexts[segment.path],
+                order=segment.order,
+                object_id=segment.translation_key,
+            )
+            for segment in related_object_segment_values
+        ], ['context_id', 'object_id'])
 
-    def export_po(self):
+        self.translations.reset_progress()
+
+    def get_po_metadata(self):
         """
-        Exports a PO file contining the source strings.
+        Returns the metadata to put in the header of exported PO files.
         """
-        # Get messages
-        messages = defaultdict(list)
-
-        for string_segment in StringSegment.objects.filter(source=self).order_by('order').select_related("context", "string"):
-            messages[string_segment.string.data] = string_segment.context.path
-
-        # Build a PO file
-        po = polib.POFile(wrapwidth=200)
-        po.metadata = {
+        return {
             "POT-Creation-Date": str(timezone.now()),
             "MIME-Version": "1.0",
             "Content-Type": "text/plain; charset=utf-8",
         }
 
-        for text, context in messages.items():
-            po.append(
-                polib.POEntry(
-                    msgid=text,
-                    msgctxt=context,
-                    msgstr="",
-                )
+    def iter_po_entries(self):
+        """
+        Yields a polib.POEntry for each unique source string, in the order they first appear in the source.
+        """
+        string_segments = (
+            StringSegment.objects.filter(source=self)
+            .unique_strings()
+            .select_related("context", "string")
+        )
+
+        for string_segment in string_segments.iterator():
+            yield polib.POEntry(
+                msgid=string_segment.string.data,
+                msgctxt=string_segment.context.path,
+                msgstr="",
             )
 
-        return po
+    def export_po(self):
+        """
+        Exports a PO file contining the source strings.
+        """
+        return build_po_file(self.get_po_metadata(), self.iter_po_entries())
+
+    def stream_po(self):
+        """
+        Yields the text of the exported PO file in chunks. See stream_po_file.
+        """
+        return stream_po_file(self.get_po_metadata(), self.iter_po_entries())
 
     def get_segments_for_translation(self, locale, fallback=False):
         """
@@ -393,12 +576,18 @@ class TranslationSource(models.Model):
             .select_related("context")
         )
 
-        related_object_segments = (
+        related_object_segments = list(
             RelatedObjectSegment.objects.filter(source=self)
-            .select_related("object")
+            .select_related("object__content_type")
             .select_related("context")
         )
 
+        # Fetch the translations of all related objects at once. These are passed through to
+        # ingest_segments on the segments so it doesn't need to fetch them again
+        related_instances = TranslatableObject.objects.get_instances(
+            [related_object_segment.object for related_object_segment in related_object_segments], locale
+        )
+
         segments = []
 
         for string_segment in string_segments:
@@ -424,17 +613,21 @@ class TranslationSource(models.Model):
                 template.template_format,
                 template.template,
                 template.string_count,
+                uuid=template.uuid,
                 order=template_segment.order,
             )
             segments.append(segment_value)
 
         for related_object_segment in related_object_segments:
-            if related_object_segment.object.has_translation(locale):
+            related_instance = related_instances.get(related_object_segment.object.translation_key)
+
+            if related_instance is not None:
                 segment_value = RelatedObjectSegmentValue(
                     related_object_segment.context.path,
                     related_object_segment.object.content_type,
                     related_object_segment.object.translation_key,
                     order=related_object_segment.order,
+                    instance=related_instance,
                 )
                 segments.append(segment_value)
 
@@ -544,6 +737,100 @@ class TranslationSource(models.Model):
 
         return translation
 
+    def machine_translate(self, target_locales=None, user=None, translator=None):
+        """
+        Machine translates all the strings in this source that haven't been translated into
+        the given locales yet. If no locales are given, this translates into the target locale
+        of every enabled translation of this source.
+
+        The configured machine translator is used unless another one is passed in. Locales that
+        it cannot translate into are skipped. The strings for all locales are sent to the machine
+        translator concurrently.
+
+        Returns the number of StringTranslations that were created.
+        """
+        from .machine_translators import get_machine_translator, translate_strings_into_locales
+
+        if translator is None:
+            translator = get_machine_translator()
+            if translator is None:
+                return 0
+
+        if target_locales is None:
+            target_locales = [
+                translation.target_locale
+                for translation in self.translations.filter(enabled=True).select_related("target_locale")
+            ]
+
+        target_locales = [
+            target_locale for target_locale in target_locales
+            if translator.can_translate(self.locale, target_locale)
+        ]
+        if not target_locales:
+            return 0
+
+        # Find the segments that haven't been translated into each locale
+        existing_translations = set(
+            StringTranslation.objects.filter(
+                locale_id__in=[target_locale.id for target_locale in target_locales],
+                context__object_id=self.object_id,
+            ).values_list("locale_id", "translation_of_id", "context_id")
+        )
+
+        segments_by_locale = {target_locale: defaultdict(list) for target_locale in target_locales}
+        for string_segment in StringSegment.objects.filter(source=self).select_related("string"):
+            for target_locale, segments in segments_by_locale.items():
+                if (target_locale.id, string_segment.string_id, string_segment.context_id) not in existing_translations:
+                    segments[string_segment.string.as_value()].append((string_segment.string_id, string_segment.context_id))
+
+        segments_by_locale = {
+            target_locale: segments
+            for target_locale, segments in segments_by_locale.items()
+            if segments
+        }
+        if not segments_by_locale:
+            return 0
+
+        translations = translate_strings_into_locales(translator, self.locale, {
+            target_locale: segments.keys()
+            for target_locale, segments in segments_by_locale.items()
+        })
+
+        string_translations = []
+        for target_locale, segments in segments_by_locale.items():
+            for string, contexts in segments.items():
+                data = translations[target_locale][string].data
+
+                # Note: Bulk creation skips the validation in StringTranslation.save() so validate here instead
+                html_error = StringTranslation.get_html_error(data)
+
+                for string_id, context_id in contexts:
+                    string_translations.append(
+                        StringTranslation(
+                            translation_of_id=string_id,
+                            locale=target_locale,
+                            context_id=context_id,
+                            data=data,
+                            translation_type=StringTranslation.TRANSLATION_TYPE_MACHINE,
+                            tool_name=translator.display_name,
+                            last_translated_by=user,
+                            has_error=bool(html_error),
+                            html_error=html_error,
+                            field_error="",
+                        )
+                    )
+
+        with transaction.atomic():
+            # Ignore conflicts in case any of these strings were translated in the meantime
+            StringTranslation.objects.bulk_create(string_translations, ignore_conflicts=True)
+
+            # Bulk operations don't send signals, so reset the progress of translations of this object here
+            Translation.objects.filter(
+                source__object_id=self.object_id, target_locale__in=segments_by_locale.keys()
+            ).reset_progress()
+
+        return len(string_translations)
+
 
 class POImportWarning:
     """
@@ -589,6 +876,61 @@ class StringNotUsedInContext(POImportWarning):
         return f"<StringNotUsedInContext {self.index} '{self.string}' '{self.context}'>"
 
 
+def _get_progress_expressions():
+    """
+    Returns expressions that count the total and translated segments of the Translation
+    in the outer query.
+    """
+    string_segments = StringSegment.objects.filter(source_id=OuterRef("source_id")).order_by().values("source_id")
+    translated_string_segments = string_segments.filter(
+        Exists(
+            StringTranslation.objects.filter(
+                translation_of_id=OuterRef("string_id"),
+                context_id=OuterRef("context_id"),
+                locale_id=OuterRef(OuterRef("target_locale_id")),
+                has_error=False,
+            )
+        )
+    )
+
+    def count(segments):
+        return Coalesce(
+            Subquery(segments.annotate(count=Count("pk")).values("count"), output_field=IntegerField()),
+            0,
+        )
+
+    return count(string_segments), count(translated_string_segments)
+
+
+class TranslationQuerySet(models.QuerySet):
+    def annotate_progress(self):
+        """
+        Adds 'total_segments' and 'translated_segments' fields to each Translation, containing
+        the values that Translation.get_progress() would return.
+
+        This is done in a single query, no matter how many translations are being fetched.
+        """
+        total_segments, translated_segments = _get_progress_expressions()
+
+        return self.annotate(
+            total_segments=total_segments,
+            translated_segments=translated_segments,
+        )
+
+    def reset_progress(self):
+        """
+        Clears the cached progress of the translations in this QuerySet so it will be
+        recalculated the next time Translation.get_progress() is called.
+
+        This must be called whenever the segments of a source or any of the StringTranslations
+        used by it change.
+        """
+        return self.exclude(cached_total_segments=None).update(
+            cached_total_segments=None,
+            cached_translated_segments=None,
+        )
+
+
 class Translation(models.Model):
     """
     Manages the translation of an object into a locale.
@@ -615,6 +957,13 @@ class Translation(models.Model):
     destination_last_updated_at = models.DateTimeField(null=True)
     enabled = models.BooleanField(default=True)
 
+    # The last values returned by get_progress(). These are set to None whenever they need
+    # to be recalculated.
+    cached_total_segments = models.PositiveIntegerField(null=True, editable=False)
+    cached_translated_segments = models.PositiveIntegerField(null=True, editable=False)
+
+    objects = TranslationQuerySet.as_manager()
+
     class Meta:
         unique_together = [
             ('source', 'target_locale'),
@@ -632,33 +981,31 @@ class Translation(models.Model):
         Returns two integers:
         - The total number of segments in the source that need to be translated
         - The number of segments that have been translated into the locale
-        """
-        # Get QuerySet of Segments that need to be translated
-        required_segments = StringSegment.objects.filter(source_id=self.source_id)
 
-        # Annotate each Segment with a flag that indicates whether the segment is translated
-        # into the locale
-        required_segments = required_segments.annotate(
-            is_translated=Exists(
-                StringTranslation.objects.filter(
-                    translation_of_id=OuterRef("string_id"),
-                    context_id=OuterRef("context_id"),
-                    locale_id=self.target_locale_id,
-                    has_error=False,
-                )
+        The result is cached on the Translation so this only queries the database if
+        something has changed since it was last called. If this translation was fetched
+        with TranslationQuerySet.annotate_progress(), the annotated values are used instead.
+        """
+        if hasattr(self, 'total_segments') and hasattr(self, 'translated_segments'):
+            return self.total_segments, self.translated_segments
+
+        if self.cached_total_segments is None or self.cached_translated_segments is None:
+            # The counts are stored by the same statement that computes them. Computing them
+            # first could store stale counts if reset_progress() was called in between
+            total_segments, translated_segments = _get_progress_expressions()
+            Translation.objects.filter(id=self.id, cached_total_segments__isnull=True).update(
+                cached_total_segments=total_segments,
+                cached_translated_segments=translated_segments,
             )
-        )
 
-        # Count the total number of segments and the number of translated segments
-        aggs = required_segments.annotate(
-            is_translated_i=Case(
-                When(is_translated=True, then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField(),
+            self.cached_total_segments, self.cached_translated_segments = (
+                Translation.objects.filter(id=self.id)
+                .annotate_progress()
+                .values_list("total_segments", "translated_segments")
+                .get()
             )
-        ).aggregate(total_segments=Count("pk"), translated_segments=Sum("is_translated_i"))
 
-        return aggs["total_segments"], aggs["translated_segments"]
+        return self.cached_total_segments, self.cached_translated_segments
 
     def get_status_display(self):
         """
@@ -670,39 +1017,38 @@ class Translation(models.Model):
         else:
             return _("Waiting for translations")
 
-    def export_po(self):
+    def get_po_metadata(self):
         """
-        Exports a PO file contining the source strings and translations.
+        Returns the metadata to put in the header of exported PO files.
         """
-        # Get messages
-        messages = defaultdict(list)
+        return {
+            "POT-Creation-Date": str(timezone.now()),
+            "MIME-Version": "1.0",
+            "Content-Type": "text/plain; charset=utf-8",
+            "X-WagtailLocalize-TranslationID": str(self.uuid),
+        }
+
+    def iter_po_entries(self):
+        """
+        Yields a polib.POEntry for each unique source string along with its translation,
+        followed by obsolete entries for any strings that were translated but are no
+        longer in the source.
 
+        Rows are streamed from the database so this uses constant memory no matter how
+        large the source is.
+        """
         string_segments = (
             StringSegment.objects.filter(source=self.source)
-            .order_by('order')
+            .unique_strings()
             .select_related("context", "string")
             .annotate_translation(self.target_locale, include_errors=True)
         )
 
-        for string_segment in string_segments:
-            messages[string_segment.string.data] = (string_segment.context.path, string_segment.translation)
-
-        # Build a PO file
-        po = polib.POFile(wrapwidth=200)
-        po.metadata = {
-            "POT-Creation-Date": str(timezone.now()),
-            "MIME-Version": "1.0",
-            "Content-Type": "text/plain; charset=utf-8",
-            "X-WagtailLocalize-TranslationID": str(self.uuid),
-        }
-
-        for text, (context, translation) in messages.items():
-            po.append(
-                polib.POEntry(
-                    msgid=text,
-                    msgctxt=context,
-                    msgstr=translation or "",
-                )
+        for string_segment in string_segments.iterator():
+            yield polib.POEntry(
+                msgid=string_segment.string.data,
+                msgctxt=string_segment.context.path,
+                msgstr=string_segment.translation or "",
             )
 
         # Add any obsolete segments that have translations for future reference
@@ -716,80 +1062,228 @@ class Translation(models.Model):
             .select_related("translation_of", "context")
             .iterator()
         ):
-            po.append(
-                polib.POEntry(
-                    msgid=translation.translation_of.data,
-                    msgstr=translation.data or "",
-                    msgctxt=translation.context.path,
-                    obsolete=True,
-                )
+            yield polib.POEntry(
+                msgid=translation.translation_of.data,
+                msgstr=translation.data or "",
+                msgctxt=translation.context.path,
+                obsolete=True,
             )
 
-        return po
+    def export_po(self):
+        """
+        Exports a PO file contining the source strings and translations.
+        """
+        return build_po_file(self.get_po_metadata(), self.iter_po_entries())
+
+    def stream_po(self):
+        """
+        Yields the text of the exported PO file in chunks. See stream_po_file.
+        """
+        return stream_po_file(self.get_po_metadata(), self.iter_po_entries())
 
     @transaction.atomic
     def import_po(self, po, delete=False, user=None, translation_type='manual', tool_name=""):
         """
         Imports translations from a PO file.
         """
-        seen_translation_ids = set()
         warnings = []
 
         if 'X-WagtailLocalize-TranslationID' in po.metadata and po.metadata['X-WagtailLocalize-TranslationID'] != str(self.uuid):
             return []
 
-        for index, entry in enumerate(po):
-            try:
-                string = String.objects.get(locale_id=self.source.locale_id, data=entry.msgid)
-                context = TranslationContext.objects.get(object_id=self.source.object_id, path=entry.msgctxt)
+        entries = list(po)
 
-                # Ignore blank strings
-                if not entry.msgstr:
-                    continue
+        # Find the strings and contexts referenced by the entries up front
+        strings = {
+            string.data: string
+            for string in String.objects.filter(
+                locale_id=self.source.locale_id,
+                data_hash__in={String.get_data_hash(entry.msgid) for entry in entries},
+            )
+        }
 
-                # Ignore if the string doesn't appear in this context, and if there is not an obsolete StringTranslation
-                if not StringSegment.objects.filter(string=string, context=context).exists() and not StringTranslation.objects.filter(translation_of=string, context=context).exists():
-                    warnings.append(StringNotUsedInContext(index, entry.msgid, entry.msgctxt))
-                    continue
+        contexts = {
+            context.path: context
+            for context in TranslationContext.objects.filter(
+                object_id=self.source.object_id,
+                path_id__in={TranslationContext.get_path_id(entry.msgctxt) for entry in entries if entry.msgctxt is not None},
+            )
+        }
 
-                string_translation, created = string.translations.get_or_create(
-                    locale_id=self.target_locale_id,
-                    context=context,
-                    defaults={
-                        "data": entry.msgstr,
-                        "updated_at": timezone.now(),
-                        "translation_type": translation_type,
-                        "tool_name": tool_name,
-                        'last_translated_by': user,
-                        'has_error': False,
-                        'field_error': "",
-                    },
-                )
+        # Work out which entries can be imported
+        translated_entries = []
+        for index, entry in enumerate(entries):
+            string = strings.get(entry.msgid)
+            if string is None:
+                warnings.append(UnknownString(index, entry.msgid))
+                continue
 
-                seen_translation_ids.add(string_translation.id)
+            context = contexts.get(entry.msgctxt)
+            if context is None:
+                warnings.append(UnknownContext(index, entry.msgctxt))
+                continue
 
-                if not created:
-                    # Update the string_translation only if it has changed
-                    if string_translation.data != entry.msgstr:
-                        string_translation.data = entry.msgstr
-                        string_translation.translation_type = translation_type
-                        string_translation.tool_name = tool_name
-                        string_translation.last_translated_by = user
-                        string_translation.updated_at = timezone.now()
-                        string_translation.save()
+            # Ignore blank strings
+            if not entry.msgstr:
+                continue
 
-            except TranslationContext.DoesNotExist:
-                warnings.append(UnknownContext(index, entry.msgctxt))
+            translated_entries.append((index, entry, string, context))
 
-            except String.DoesNotExist:
-                warnings.append(UnknownString(index, entry.msgid))
+        string_ids = {string.id for index, entry, string, context in translated_entries}
+        context_ids = {context.id for index, entry, string, context in translated_entries}
+
+        # Find out which strings are used in each context, either by a segment or an obsolete StringTranslation
+        used_in_context = set(
+            StringSegment.objects.filter(string_id__in=string_ids, context_id__in=context_ids)
+            .values_list('string_id', 'context_id')
+        )
+        used_in_context.update(
+            StringTranslation.objects.filter(translation_of_id__in=string_ids, context_id__in=context_ids)
+            .values_list('translation_of_id', 'context_id')
+        )
+
+        # Find the new data for each StringTranslation. If an entry is repeated, the last one is used
+        new_data = {}
+        for index, entry, string, context in translated_entries:
+            if (string.id, context.id) not in used_in_context:
+                warnings.append(StringNotUsedInContext(index, entry.msgid, entry.msgctxt))
+                continue
+
+            new_data[(string.id, context.id)] = entry.msgstr
+
+        warnings.sort(key=lambda warning: warning.index)
+
+        existing_translations = {
+            (string_translation.translation_of_id, string_translation.context_id): string_translation
+            for string_translation in StringTranslation.objects.filter(
+                locale_id=self.target_locale_id,
+                translation_of_id__in=string_ids,
+                context_id__in=context_ids,
+            )
+        }
+
+        # Validate the HTML of each distinct translation once
+        # Since we allow translations to be made by external tools, we need to allow invalid
+        # HTML in the database so that it can be fixed in Wagtail (see StringTranslation.save)
+        html_errors = {
+            data: StringTranslation.get_html_error(data)
+            for data in set(new_data.values())
+        }
+
+        now = timezone.now()
+        translations_to_create = []
+        translations_to_update = []
+
+        for (string_id, context_id), data in new_data.items():
+            string_translation = existing_translations.get((string_id, context_id))
+
+            if string_translation is None:
+                translations_to_create.append(StringTranslation(
+                    translation_of_id=string_id,
+                    locale_id=self.target_locale_id,
+                    context_id=context_id,
+                    data=data,
+                    updated_at=now,
+                    translation_type=translation_type,
+                    tool_name=tool_name,
+                    last_translated_by=user,
+                    has_error=bool(html_errors[data]),
+                    html_error=html_errors[data],
+                    field_error="",
+                ))
+
+            # Update the string_translation only if it has changed
+            elif string_translation.data != data:
+                string_translation.data = data
+                string_translation.translation_type = translation_type
+                string_translation.tool_name = tool_name
+                string_translation.last_translated_by = user
+                string_translation.updated_at = now
+                string_translation.html_error = html_errors[data]
+                string_translation.has_error = string_translation.has_error or bool(html_errors[data])
+                translations_to_update.append(string_translation)
+
+        StringTranslation.objects.bulk_create(translations_to_create)
+        StringTranslation.objects.bulk_update(
+            translations_to_update,
+            ['data', 'translation_type', 'tool_name', 'last_translated_by', 'updated_at', 'has_error', 'html_error']
+        )
 
         # Delete any translations that weren't mentioned
         if delete:
-            StringTranslation.objects.filter(context__object_id=self.source.object_id, locale=self.target_locale).exclude(id__in=seen_translation_ids).delete()
+            StringTranslation.objects.filter(
+                id__in=[
+                    string_translation_id
+                    for string_translation_id, string_id, context_id in StringTranslation.objects.filter(
+                        context__object_id=self.source.object_id, locale=self.target_locale
+                    ).values_list('id', 'translation_of_id', 'context_id')
+                    if (string_id, context_id) not in new_data
+                ]
+            ).delete()
+
+        # Bulk operations don't send signals, so reset the progress of translations of this object here
+        Translation.objects.filter(
+            source__object_id=self.source.object_id, target_locale=self.target_locale
+        ).reset_progress()
 
         return warnings
 
+    def prefill_from_translation_memory(self):
+        """
+        Translates any strings in the source that haven't been translated in their context yet
+        by copying a translation of the same string into the same locale from another context.
+
+        When a string has been translated in several other contexts, the most recently updated
+        translation is used. Translations that have errors are never copied. The new translations
+        are marked with the 'translation_memory' type so they can be reviewed.
+
+        This is done with one query, no matter how many strings there are.
+        Returns the number of StringTranslations that were created.
+        """
+        translation_memory = StringTranslation.objects.filter(
+            translation_of_id=OuterRef("string_id"),
+            locale_id=self.target_locale_id,
+            has_error=False,
+        ).order_by("-updated_at")
+
+        matches = (
+            StringSegment.objects.filter(source_id=self.source_id)
+            .annotate_translation(self.target_locale_id, include_errors=True)
+            .filter(translation__isnull=True)
+            .annotate(translation_memory=Subquery(translation_memory.values("data")[:1]))
+            .filter(translation_memory__isnull=False)
+            .values_list("string_id", "context_id", "translation_memory")
+        )
+
+        # A string may be used more than once in the same context
+        matches = {
+            (string_id, context_id): data
+            for string_id, context_id, data in matches
+        }
+
+        if not matches:
+            return 0
+
+        with transaction.atomic():
+            # Ignore conflicts in case any of these strings were translated in the meantime
+            StringTranslation.objects.bulk_create([
+                StringTranslation(
+                    translation_of_id=string_id,
+                    locale_id=self.target_locale_id,
+                    context_id=context_id,
+                    data=data,
+                    translation_type=StringTranslation.TRANSLATION_TYPE_MEMORY,
+                )
+                for (string_id, context_id), data in matches.items()
+            ], ignore_conflicts=True)
+
+            # Bulk operations don't send signals, so reset the progress of translations of this object here
+            Translation.objects.filter(
+                source__object_id=self.source.object_id, target_locale_id=self.target_locale_id
+            ).reset_progress()
+
+        return len(matches)
+
     def save_target(self, user=None, publish=True):
         """
         Saves the target page/snippet using the current translations.
@@ -826,6 +1320,69 @@ class TranslationLog(models.Model):
         return self.source.object.get_instance(self.locale)
 
 
+class StringQuerySet(models.QuerySet):
+    def get_or_create_for_values(self, locale, stringvalues):
+        """
+        Finds or creates a String for each of the given StringValues.
+
+        Returns a dictionary mapping the data of each StringValue to the ID of its String.
+        """
+        data_by_hash = {
+            String.get_data_hash(stringvalue.data): stringvalue.data
+            for stringvalue in stringvalues
+        }
+        string_ids = dict(
+            self.filter(locale_id=pk(locale), data_hash__in=data_by_hash.keys()).values_list('data_hash', 'id')
+        )
+
+        missing = [
+            String(locale_id=pk(locale), data_hash=data_hash, data=data)
+            for data_hash, data in data_by_hash.items()
+            if data_hash not in string_ids
+        ]
+
+        if missing:
+            # Ignore conflicts in case another process created the same strings in the meantime
+            self.bulk_create(missing, ignore_conflicts=True)
+            created_strings = list(
+                self.filter(locale_id=pk(locale), data_hash__in=[string.data_hash for string in missing])
+            )
+            string_ids.update(
+                (string.data_hash, string.id) for string in created_strings
+            )
+
+            StringMinHash.objects.index_strings(created_strings)
+
+        return {
+            data: string_ids[data_hash]
+            for data_hash, data in data_by_hash.items()
+        }
+
+    def find_similar(self, locale, text, limit=5, min_similarity=0.85):
+        """
+        Finds Strings in the given locale that are similar to the given text using the
+        translation memory index (see translation_memory.py).
+
+        Returns a list of up to `limit` (String, similarity) tuples, most similar first.
+        Similarity is a number between 0 and 1.
+        """
+        candidates = (
+            self.filter(locale_id=pk(locale), minhashes__band_hash__in=get_band_hashes(text))
+            .annotate(matching_bands=Count("minhashes"))
+            .order_by("-matching_bands", "id")[:MAX_SIMILAR_STRING_CANDIDATES]
+        )
+
+        matches = []
+        for string in candidates:
+            similarity = get_similarity(text, string.data)
+
+            if similarity >= min_similarity:
+                matches.append((string, similarity))
+
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+
 class String(models.Model):
     UUID_NAMESPACE = uuid.UUID("59ed7d1c-7eb5-45fa-9c8b-7a7057ed56d7")
 
@@ -834,6 +1391,8 @@ class String(models.Model):
     data_hash = models.UUIDField()
     data = models.TextField()
 
+    objects = StringQuerySet.as_manager()
+
     @classmethod
     def get_data_hash(cls, data):
         return uuid.uuid5(cls.UUID_NAMESPACE, data)
@@ -855,12 +1414,83 @@ class String(models.Model):
         if self.data and self.data_hash is None:
             self.data_hash = self.get_data_hash(self.data)
 
-        return super().save(*args, **kwargs)
+        creating = self._state.adding
+        super().save(*args, **kwargs)
+
+        # Add new strings to the translation memory index
+        if creating:
+            StringMinHash.objects.index_strings([self])
 
     class Meta:
         unique_together = [("locale", "data_hash")]
 
 
+class StringMinHashQuerySet(models.QuerySet):
+    def index_strings(self, strings):
+        """
+        Adds the given Strings to the translation memory index.
+        """
+        # Ignore conflicts in case another process indexed the same strings in the meantime
+        self.bulk_create([
+            StringMinHash(string_id=string.id, locale_id=string.locale_id, band_hash=band_hash)
+            for string in strings
+            for band_hash in set(get_band_hashes(string.data))
+        ], ignore_conflicts=True)
+
+
+class StringMinHash(models.Model):
+    """
+    Stores the locality-sensitive hashes of a String that are used to find similar strings
+    for the translation memory. See translation_memory.py.
+    """
+    string = models.ForeignKey(String, on_delete=models.CASCADE, related_name="minhashes")
+
+    # Copied from the String so that the index can be filtered by locale
+    locale = models.ForeignKey("wagtailcore.Locale", on_delete=models.CASCADE, related_name="+")
+    band_hash = models.BigIntegerField()
+
+    objects = StringMinHashQuerySet.as_manager()
+
+    class Meta:
+        unique_together = [("string", "band_hash")]
+        indexes = [
+            models.Index(fields=['locale', 'band_hash']),
+        ]
+
+
+class TranslationContextQuerySet(models.QuerySet):
+    def get_or_create_for_paths(self, object, paths):
+        """
+        Finds or creates a TranslationContext for each of the given paths on the given object.
+
+        Returns a dictionary mapping each path to the ID of its TranslationContext.
+        """
+        paths_by_id = {
+            TranslationContext.get_path_id(path): path
+            for path in paths
+        }
+        context_ids = dict(
+            self.filter(object_id=pk(object), path_id__in=paths_by_id.keys()).values_list('path_id', 'id')
+        )
+
+        missing = [
+            TranslationContext(object_id=pk(object), path_id=path_id, path=path)
+            for path_id, path in paths_by_id.items()
+            if path_id not in context_ids
+        ]
+
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            context_ids.update(
+                self.filter(object_id=pk(object), path_id__in=[context.path_id for context in missing]).values_list('path_id', 'id')
+            )
+
+        return {
+            path: context_ids[path_id]
+            for path_id, path in paths_by_id.items()
+        }
+
+
 class TranslationContext(models.Model):
     object = models.ForeignKey(
         TranslatableObject, on_delete=models.CASCADE, related_name="+"
@@ -868,6 +1498,8 @@ class TranslationContext(models.Model):
     path_id = models.UUIDField()
     path = models.TextField()
 
+    objects = TranslationContextQuerySet.as_manager()
+
     class Meta:
         unique_together = [
             ("object", "path_id"),
@@ -907,9 +1539,11 @@ class TranslationContext(models.Model):
 class StringTranslation(models.Model):
     TRANSLATION_TYPE_MANUAL = 'manual'
     TRANSLATION_TYPE_MACHINE = 'machine'
+    TRANSLATION_TYPE_MEMORY = 'translation_memory'
     TRANSLATION_TYPE_CHOICES = [
         (TRANSLATION_TYPE_MANUAL, _("Manual")),
         (TRANSLATION_TYPE_MACHINE, _("Machine")),
+        (TRANSLATION_TYPE_MEMORY, _("Translation memory")),
     ]
 
     translation_of = models.ForeignKey(
@@ -932,6 +1566,11 @@ class StringTranslation(models.Model):
 
     has_error = models.BooleanField(default=False)
 
+    # If the HTML in data is invalid, the validation error is stored here so the HTML
+    # doesn't need to be parsed again whenever the error is displayed. This is the
+    # error_key of the HTMLValidationError, so the message is translated when it's displayed.
+    html_error = models.TextField(blank=True)
+
     # If there was a database-level validation error while saving the page/snippet, that
     # error will be stored here. Example errors include, max length and invalid chars in
     # a slug field.
@@ -942,6 +1581,10 @@ class StringTranslation(models.Model):
 
     class Meta:
         unique_together = [("locale", "translation_of", "context")]
+        indexes = [
+            # For finding the latest translation of a string in any context (see Translation.prefill_from_translation_memory)
+            models.Index(fields=['translation_of', 'locale', '-updated_at']),
+        ]
 
     @classmethod
     def from_text(cls, translation_of, locale, context, data):
@@ -954,21 +1597,45 @@ class StringTranslation(models.Model):
 
         return segment
 
+    @staticmethod
+    def get_html_error(data):
+        """
+        Returns the error key of the validation error of the given translated HTML, or an empty
+        string if it's valid. Pass this to get_html_error_message() to get the message.
+        """
+        try:
+            validate_translated_html(data)
+        except HTMLValidationError as e:
+            return e.error_key
+
+        return ""
+
+    def validate_html(self):
+        """
+        Validates the HTML in data, storing any error in html_error and setting has_error.
+
+        Since we allow translations to be made by external tools, we need to allow invalid
+        HTML in the database so that it can be fixed in Wagtail. However, we do want to know
+        if any strings are invalid so we don't use them on a page.
+
+        This is called by save(). Bulk writes must call it themselves.
+        """
+        self.html_error = self.get_html_error(self.data)
+
+        if self.html_error:
+            self.has_error = True
+
     def save(self, *args, **kwargs):
         update_fields = kwargs.get('update_fields')
-        super().save(*args, **kwargs)
 
-        # Set has_error if the string is invalid.
-        # Since we allow translations to be made by external tools, we need to allow invalid
-        # HTML in the database so that it can be fixed in Wagtail. However, we do want to know
-        # if any strings are invalid so we don't use them on a page.
-        updating_data = update_fields is None or 'data' in update_fields
-        if updating_data and not self.has_error:
-            try:
-                StringValue.from_translated_html(self.data)
-            except ValueError:
-                self.has_error = True
-                self.save(update_fields=['has_error'])
+        # Validate the data before it's written so the row is only written once
+        if update_fields is None or 'data' in update_fields:
+            self.validate_html()
+
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'has_error', 'html_error'}
+
+        super().save(*args, **kwargs)
 
     def set_field_error(self, error):
         """
@@ -989,13 +1656,11 @@ class StringTranslation(models.Model):
             return
 
         # Check for HTML validation errors
-        try:
-            StringValue.from_translated_html(self.data)
-        except ValueError as e:
-            return e.args[0]
+        if self.html_error:
+            return get_html_error_message(self.html_error)
 
         # Check if a database error was raised when we last attempted to publish
-        if self.context is not None and self.field_error:
+        if self.context_id is not None and self.field_error:
             return self.field_error
 
     def get_comment(self):
@@ -1013,6 +1678,67 @@ class StringTranslation(models.Model):
         elif self.translation_type == self.TRANSLATION_TYPE_MACHINE:
             return _("Machine translated on {date}").format(date=self.updated_at.strftime(DATE_FORMAT))
 
+        elif self.translation_type == self.TRANSLATION_TYPE_MEMORY:
+            return _("Translated from translation memory on {date}").format(date=self.updated_at.strftime(DATE_FORMAT))
+
+
+class MachineTranslation(models.Model):
+    """
+    Stores the result of machine translating a string so it doesn't need to be
+    sent to the machine translator again.
+    """
+    # Identifies the machine translator that made this translation (see BaseMachineTranslator.cache_name)
+    translator = models.CharField(max_length=255)
+    source_language = models.CharField(max_length=100)
+    target_language = models.CharField(max_length=100)
+
+    # Matches String.data_hash of the source string
+    data_hash = models.UUIDField()
+    data = models.TextField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [("translator", "source_language", "target_language", "data_hash")]
+
+
+class TemplateQuerySet(models.QuerySet):
+    def get_or_create_for_values(self, template_values):
+        """
+        Finds or creates a Template for each of the given TemplateSegmentValues.
+
+        Returns a dictionary mapping (format, template) tuples to the ID of each Template.
+        """
+        values_by_uuid = {
+            Template.get_template_uuid(template_value.format, template_value.template): template_value
+            for template_value in template_values
+        }
+        template_ids = dict(
+            self.filter(uuid__in=values_by_uuid.keys()).values_list('uuid', 'id')
+        )
+
+        missing = [
+            Template(
+                uuid=template_uuid,
+                template=template_value.template,
+                template_format=template_value.format,
+                string_count=template_value.string_count,
+            )
+            for template_uuid, template_value in values_by_uuid.items()
+            if template_uuid not in template_ids
+        ]
+
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            template_ids.update(
+                self.filter(uuid__in=[template.uuid for template in missing]).values_list('uuid', 'id')
+            )
+
+        return {
+            (template_value.format, template_value.template): template_ids[template_uuid]
+            for template_uuid, template_value in values_by_uuid.items()
+        }
+
 
 class Template(models.Model):
     BASE_UUID_NAMESPACE = uuid.UUID("4599eabc-3f8e-41a9-be61-95417d26a8cd")
@@ -1022,12 +1748,17 @@ class Template(models.Model):
     template_format = models.CharField(max_length=100)
     string_count = models.PositiveIntegerField()
 
+    objects = TemplateQuerySet.as_manager()
+
     @classmethod
-    def from_value(cls, template_value):
-        uuid_namespace = uuid.uuid5(cls.BASE_UUID_NAMESPACE, template_value.format)
+    def get_template_uuid(cls, format, template):
+        uuid_namespace = uuid.uuid5(cls.BASE_UUID_NAMESPACE, format)
+        return uuid.uuid5(uuid_namespace, template)
 
+    @classmethod
+    def from_value(cls, template_value):
         template, created = cls.objects.get_or_create(
-            uuid=uuid.uuid5(uuid_namespace, template_value.template),
+            uuid=cls.get_template_uuid(template_value.format, template_value.template),
             defaults={
                 "template": template_value.template,
                 "template_format": template_value.format,
@@ -1038,16 +1769,85 @@ class Template(models.Model):
         return template
 
 
+class BaseSegmentQuerySet(models.QuerySet):
+    def sync(self, segments, match_fields):
+        """
+        Makes the segments in this QuerySet match the given list of unsaved segments.
+
+        Existing segments are matched up with the new ones by comparing the given fields. Any
+        existing segments that have moved are updated, new segments are created and any
+        leftover segments are deleted. This only performs a fixed number of queries, no matter
+        how many segments there are.
+        """
+        def get_key(segment):
+            return tuple(getattr(segment, field_name) for field_name in match_fields)
+
+        existing_segments = defaultdict(list)
+        for segment in self.order_by('id'):
+            existing_segments[get_key(segment)].append(segment)
+
+        segments_to_create = []
+        segments_to_update = []
+        seen_segment_ids = []
+
+        for segment in segments:
+            matches = existing_segments.get(get_key(segment))
+
+            if matches:
+                existing_segment = matches.pop(0)
+                seen_segment_ids.append(existing_segment.id)
+
+                if existing_segment.order != segment.order:
+                    existing_segment.order = segment.order
+                    segments_to_update.append(existing_segment)
+
+            else:
+                segments_to_create.append(segment)
+
+        # Delete any segments that weren't mentioned
+        self.exclude(id__in=seen_segment_ids).delete()
+
+        if segments_to_update:
+            self.bulk_update(segments_to_update, ['order'])
+
+        if segments_to_create:
+            self.bulk_create(segments_to_create)
+
+
 class BaseSegment(models.Model):
     source = models.ForeignKey(TranslationSource, on_delete=models.CASCADE)
     context = models.ForeignKey(TranslationContext, on_delete=models.PROTECT,)
     order = models.PositiveIntegerField()
 
+    objects = BaseSegmentQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
 
-class StringSegmentQuerySet(models.QuerySet):
+class StringSegmentQuerySet(BaseSegmentQuerySet):
+    def unique_strings(self):
+        """
+        Filters the segments so there is only one for each string in each source.
+
+        The last segment for each string is kept (so the context of a string that is
+        used more than once is the one where it was last used), but the segments are
+        ordered by where each string was first used.
+        """
+        string_segments = StringSegment.objects.filter(
+            source_id=OuterRef("source_id"),
+            string_id=OuterRef("string_id"),
+        )
+
+        return (
+            self.annotate(
+                first_order=Subquery(string_segments.order_by("order").values("order")[:1]),
+                last_order=Subquery(string_segments.order_by("-order").values("order")[:1]),
+            )
+            .filter(order=F("last_order"))
+            .order_by("source_id", "first_order")
+        )
+
     def annotate_translation(self, locale, include_errors=False):
         """
         Adds a 'translation' field to the segments containing the
@@ -1076,6 +1876,9 @@ class StringSegmentQuerySet(models.QuerySet):
         """
         Returns a queryset of StringTranslations that match any of the
         strings in this queryset.
+
+        Each StringTranslation is annotated with a 'segment_id' field containing
+        the ID of the first segment in this queryset that it translates.
         """
         return StringTranslation.objects.filter(
             id__in=self.annotate(
@@ -1087,6 +1890,13 @@ class StringSegmentQuerySet(models.QuerySet):
                     ).values("id")
                 )
             ).values_list('translation_id', flat=True)
+        ).annotate(
+            segment_id=Subquery(
+                self.filter(
+                    string_id=OuterRef("translation_of_id"),
+                    context_id=OuterRef("context_id"),
+                ).order_by("pk").values("pk")[:1]
+            )
         )
 
 
@@ -1178,6 +1988,270 @@ class RelatedObjectSegment(BaseSegment):
         return segment
 
 
+class TranslationJobQuerySet(models.QuerySet):
+    def create_for_instances(self, instances, target_locales, user=None):
+        """
+        Creates a job that submits each of the given instances for translation into the target locales.
+
+        Instances are processed in the order they are given. Pages aren't processed until their parent page
+        has been, if it's in the same job. The instances must all be in the same locale.
+        """
+        instances = list(instances)
+        pages_by_path = {instance.path: instance for instance in instances if isinstance(instance, Page)}
+
+        def get_parent_object(instance):
+            if isinstance(instance, Page):
+                parent = pages_by_path.get(instance.path[:-Page.steplen])
+
+                if parent is not None:
+                    return objects[parent.translation_key]
+
+        objects = TranslatableObject.objects.get_or_create_for_keys([
+            (ContentType.objects.get_for_model(instance.get_translation_model()), instance.translation_key)
+            for instance in instances
+        ])
+
+        job = self.create(source_locale_id=instances[0].locale_id, created_by=user)
+        job.target_locales.set(target_locales)
+
+        TranslationJobItem.objects.bulk_create([
+            TranslationJobItem(
+                job=job,
+                object=objects[instance.translation_key],
+                parent_object=get_parent_object(instance),
+                sort_order=sort_order,
+            )
+            for sort_order, instance in enumerate(instances)
+        ])
+
+        return job
+
+
+class TranslationJob(models.Model):
+    """
+    A batch of objects that have been submitted for translation to be processed in the
+    background by the process_translation_jobs management command.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_IN_PROGRESS = 'in_progress'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, __("Pending")),
+        (STATUS_IN_PROGRESS, __("In progress")),
+        (STATUS_COMPLETED, __("Completed")),
+        (STATUS_FAILED, __("Completed with errors")),
+    ]
+
+    source_locale = models.ForeignKey(
+        "wagtailcore.Locale",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    target_locales = models.ManyToManyField(
+        "wagtailcore.Locale",
+        related_name="+",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = TranslationJobQuerySet.as_manager()
+
+    def get_progress(self):
+        """
+        Returns three integers:
+        - The total number of items in the job
+        - The number of items that have been processed successfully
+        - The number of items that failed after all of their attempts, or were skipped because
+          the item for their parent page failed
+        """
+        aggregates = self.items.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status=TranslationJobItem.STATUS_COMPLETED)),
+            failed=Count('id', filter=Q(status__in=[TranslationJobItem.STATUS_FAILED, TranslationJobItem.STATUS_SKIPPED])),
+        )
+
+        return aggregates['total'], aggregates['completed'], aggregates['failed']
+
+    def update_status(self):
+        """
+        Updates the status of the job from the status of its items.
+        """
+        total, completed, failed = self.get_progress()
+
+        if completed + failed < total:
+            self.status = self.STATUS_IN_PROGRESS
+        else:
+            self.status = self.STATUS_FAILED if failed else self.STATUS_COMPLETED
+            self.completed_at = timezone.now()
+
+        if self.started_at is None:
+            self.started_at = timezone.now()
+
+        self.save(update_fields=['status', 'started_at', 'completed_at'])
+
+
+class TranslationJobItemQuerySet(models.QuerySet):
+    def ready(self):
+        """
+        Filters to items that can be processed now. This includes pending items that aren't waiting
+        to be retried and items that were claimed by a worker that has stopped.
+
+        Items for child pages aren't ready until the item for their parent page has been completed,
+        so they're never processed before or alongside their parent, even by another worker.
+        """
+        now = timezone.now()
+
+        parent_not_completed = TranslationJobItem.objects.filter(
+            job_id=OuterRef('job_id'),
+            object_id=OuterRef('parent_object_id'),
+        ).exclude(status=TranslationJobItem.STATUS_COMPLETED)
+
+        return self.filter(
+            Q(status=TranslationJobItem.STATUS_PENDING, run_after__lte=now)
+            | Q(status=TranslationJobItem.STATUS_IN_PROGRESS, claimed_at__lte=now - TranslationJobItem.CLAIM_TIMEOUT)
+        ).filter(~Exists(parent_not_completed))
+
+    def claim(self, limit):
+        """
+        Claims up to the given number of items so no other worker processes them.
+
+        Items are claimed in the order they were submitted.
+        """
+        with transaction.atomic():
+            item_ids = list(
+                self.ready()
+                .order_by('job_id', 'sort_order')
+                .select_for_update(skip_locked=True)
+                .values_list('id', flat=True)[:limit]
+            )
+
+            TranslationJobItem.objects.filter(id__in=item_ids).update(
+                status=TranslationJobItem.STATUS_IN_PROGRESS,
+                claimed_at=timezone.now(),
+            )
+
+        return (
+            TranslationJobItem.objects.filter(id__in=item_ids)
+            .select_related('job', 'object__content_type')
+            .order_by('job_id', 'sort_order')
+        )
+
+
+class TranslationJobItem(models.Model):
+    """
+    An object to be submitted for translation as part of a TranslationJob.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_IN_PROGRESS = 'in_progress'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_SKIPPED = 'skipped'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, __("Pending")),
+        (STATUS_IN_PROGRESS, __("In progress")),
+        (STATUS_COMPLETED, __("Completed")),
+        (STATUS_FAILED, __("Failed")),
+        (STATUS_SKIPPED, __("Skipped")),
+    ]
+
+    # The number of times an item is attempted before it is marked as failed
+    MAX_ATTEMPTS = 3
+
+    # How long to wait before retrying an item. This is multiplied by the number of attempts so far
+    RETRY_DELAY = timedelta(minutes=1)
+
+    # How long an item can be claimed by a worker before it is assumed that the worker has stopped
+    CLAIM_TIMEOUT = timedelta(hours=1)
+
+    job = models.ForeignKey(
+        TranslationJob, on_delete=models.CASCADE, related_name="items"
+    )
+    object = models.ForeignKey(
+        TranslatableObject, on_delete=models.CASCADE, related_name="+"
+    )
+
+    # The object of the parent page, if the parent page is in the same job. The item isn't
+    # processed until the item for its parent page has been completed.
+    parent_object = models.ForeignKey(
+        TranslatableObject, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    sort_order = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    objects = TranslationJobItemQuerySet.as_manager()
+
+    class Meta:
+        unique_together = [
+            ('job', 'object'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def get_source_instance(self):
+        return self.object.get_instance(self.job.source_locale_id)
+
+    def mark_completed(self):
+        self.status = self.STATUS_COMPLETED
+        self.attempts += 1
+        self.completed_at = timezone.now()
+        self.last_error = ''
+        self.save(update_fields=['status', 'attempts', 'completed_at', 'last_error'])
+
+    def mark_failed(self, error):
+        """
+        Records a failed attempt at processing the item. The item is retried later unless
+        it has run out of attempts.
+        """
+        self.attempts += 1
+        self.last_error = error
+
+        if self.attempts >= self.MAX_ATTEMPTS:
+            self.status = self.STATUS_FAILED
+            self.completed_at = timezone.now()
+        else:
+            self.status = self.STATUS_PENDING
+            self.run_after = timezone.now() + self.RETRY_DELAY * self.attempts
+
+        self.save(update_fields=['status', 'attempts', 'last_error', 'run_after', 'completed_at'])
+
+        if self.status == self.STATUS_FAILED:
+            self.skip_descendants()
+
+    def skip_descendants(self):
+        """
+        Marks the pending items for the descendants of this item's page as skipped, since they
+        can't be translated without their parent. They don't use up any attempts.
+        """
+        parent_object_ids = [self.object_id]
+
+        while parent_object_ids:
+            items = TranslationJobItem.objects.filter(
+                job_id=self.job_id,
+                parent_object_id__in=parent_object_ids,
+                status=self.STATUS_PENDING,
+            )
+            parent_object_ids = list(items.values_list('object_id', flat=True))
+            items.update(status=self.STATUS_SKIPPED, completed_at=timezone.now())
+
+
 def disable_translation_on_delete(instance, **kwargs):
     """
     When either a source or destination object is deleted, disable the translation record.
@@ -1194,6 +2268,25 @@ def disable_translation_on_delete(instance, **kwargs):
     ).update(enabled=False)
 
 
+def reset_translation_progress_on_change(instance, **kwargs):
+    """
+    When a StringTranslation is saved or deleted, reset the cached progress of any
+    translations that it may be used by.
+    """
+    if instance.context_id is None:
+        return
+
+    Translation.objects.filter(
+        source__object_id__in=TranslationContext.objects.filter(id=instance.context_id).values('object_id'),
+        target_locale_id=instance.locale_id,
+    ).reset_progress()
+
+
+def register_progress_signal_handlers():
+    post_save.connect(reset_translation_progress_on_change, sender=StringTranslation)
+    post_delete.connect(reset_translation_progress_on_change, sender=StringTranslation)
+
+
 def register_post_delete_signal_handlers():
     for model in get_translatable_models():
         post_delete.connect(disable_translation_on_delete, sender=model)
@@ -0,0 +1,151 @@
+import logging
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from wagtail.core.models import Page
+
+from .models import TranslatableObject, Translation, TranslationJobItem, TranslationSource
+
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationCreator:
+    """
+    A class that provides a create_translations method.
+
+    Call create_translations for each object you want to translate and this will submit
+    that object and any dependencies as well.
+
+    This class will track the objects that have already submitted so an object doesn't
+    get submitted twice.
+    """
+    def __init__(self, user, target_locales):
+        self.user = user
+        self.target_locales = target_locales
+        self.seen_objects = set()
+
+    def create_translations(self, instance, include_related_objects=True):
+        if isinstance(instance, Page):
+            instance = instance.specific
+
+        if instance.translation_key in self.seen_objects:
+            return
+        self.seen_objects.add(instance.translation_key)
+
+        source, created = TranslationSource.get_or_create_from_instance(instance)
+
+        # Add related objects
+        # Must be before translation records or those translation records won't be able to create
+        # the objects because the dependencies haven't been created
+        if include_related_objects:
+            related_objects = [
+                related_object_segment.object
+                for related_object_segment in source.relatedobjectsegment_set.select_related('object')
+            ]
+            related_instances = TranslatableObject.objects.get_instances(related_objects, instance.locale)
+
+            for related_object in related_objects:
+                related_instance = related_instances[related_object.translation_key]
+
+                # Limit to one level of related objects, since this could potentially pull in a lot of stuff
+                self.create_translations(related_instance, include_related_objects=False)
+
+        # Set up translation records
+        for target_locale in self.target_locales:
+            # Create translation if it doesn't exist yet, re-enable if translation was disabled
+            # Note that the form won't show this locale as an option if the translation existed
+            # in this langauge, so this shouldn't overwrite any unmanaged translations.
+            translation, created = Translation.objects.update_or_create(
+                source=source,
+                target_locale=target_locale,
+                defaults={
+                    'enabled': True
+                }
+            )
+
+            translation.prefill_from_translation_memory()
+
+            try:
+                translation.save_target(user=self.user)
+            except ValidationError:
+                pass
+
+
+def get_source_instances(items):
+    """
+    Fetches the source instances of the given TranslationJobItems.
+
+    This makes one query per content type/locale. Pages are fetched in their specific form with one
+    additional query per page type.
+
+    Returns a dictionary mapping item IDs to instances. Items whose source instance has been deleted are left out.
+    """
+    items_by_model_and_locale = defaultdict(list)
+    for item in items:
+        items_by_model_and_locale[(item.object.content_type.model_class(), item.job.source_locale_id)].append(item)
+
+    instances = {}
+    for (model, locale_id), model_items in items_by_model_and_locale.items():
+        queryset = model._default_manager.filter(
+            translation_key__in=[item.object_id for item in model_items],
+            locale_id=locale_id,
+        )
+
+        if issubclass(model, Page):
+            queryset = queryset.specific()
+
+        instances_by_translation_key = {
+            instance.translation_key: instance
+            for instance in queryset
+        }
+
+        for item in model_items:
+            if item.object_id in instances_by_translation_key:
+                instances[item.id] = instances_by_translation_key[item.object_id]
+
+    return instances
+
+
+def process_translation_job_items(limit):
+    """
+    Claims and processes up to the given number of TranslationJobItems.
+
+    Each item is processed in its own transaction. Items that raise an error are retried later
+    until they run out of attempts.
+
+    Returns the number of items that were processed.
+    """
+    # Note: Items are claimed in the order they were submitted. Items for child pages can't be claimed until the
+    # item for their parent page has been completed (see TranslationJobItemQuerySet.ready)
+    items = list(TranslationJobItem.objects.claim(limit).select_related('job__created_by'))
+    instances = get_source_instances(items)
+    jobs = {}
+    creators = {}
+
+    for item in items:
+        job = jobs.setdefault(item.job_id, item.job)
+
+        if job.id not in creators:
+            creators[job.id] = TranslationCreator(job.created_by, list(job.target_locales.all()))
+
+        try:
+            if item.id not in instances:
+                model = item.object.content_type.model_class()
+                raise model.DoesNotExist("%s matching query does not exist." % model._meta.object_name)
+
+            with transaction.atomic():
+                creators[job.id].create_translations(instances[item.id])
+
+        except Exception as e:
+            logger.exception("Error processing translation job item %d", item.id)
+            item.mark_failed("{}: {}".format(e.__class__.__name__, e))
+
+        else:
+            item.mark_completed()
+
+    for job in jobs.values():
+        job.update_status()
+
+    return len(items)
@@ -1,8 +1,5 @@
-from django.db import models
-
 from modelcluster.fields import ParentalKey
 from wagtail.core import blocks
-from wagtail.core.fields import RichTextField, StreamField
 from wagtail.core.models import TranslatableMixin
 
 from wagtail_localize.segments import (
@@ -11,7 +8,14 @@ from wagtail_localize.segments import (
     RelatedObjectSegmentValue,
 )
 
-from ..fields import get_translatable_fields
+from ..fields import (
+    FIELD_KIND_CHILD_RELATION,
+    FIELD_KIND_FOREIGN_KEY,
+    FIELD_KIND_RICH_TEXT,
+    FIELD_KIND_STREAM,
+    FIELD_KIND_TEXT,
+    get_resolved_translatable_fields,
+)
 from ..strings import extract_strings
 
 
@@ -89,11 +93,12 @@ class StreamFieldSegmentExtractor:
 def extract_segments(instance):
     segments = []
 
-    for translatable_field in get_translatable_fields(instance.__class__):
-        if not translatable_field.is_translated(instance):
+    for resolved_field in get_resolved_translatable_fields(instance.__class__):
+        if not resolved_field.translatable_field.is_translated(instance):
             continue
 
-        field = translatable_field.get_field(instance.__class__)
+        field = resolved_field.field
+        kind = resolved_field.kind
 
         if hasattr(field, "get_translatable_segments"):
             segments.extend(
@@ -103,7 +108,7 @@ def extract_segments(instance):
                 )
             )
 
-        elif isinstance(field, StreamField):
+        elif kind == FIELD_KIND_STREAM:
             segments.extend(
                 segment.wrap(field.name)
                 for segment in StreamFieldSegmentExtractor(field).handle_stream_block(
@@ -111,7 +116,7 @@ def extract_segments(instance):
                 )
             )
 
-        elif isinstance(field, RichTextField):
+        elif kind == FIELD_KIND_RICH_TEXT:
             template, strings = extract_strings(field.value_from_object(instance))
 
             field_segments = [TemplateSegmentValue("", "html", template, len(strings))] + [
@@ -120,13 +125,13 @@ def extract_segments(instance):
 
             segments.extend(segment.wrap(field.name) for segment in field_segments)
 
-        elif isinstance(field, (models.TextField, models.CharField)):
+        elif kind == FIELD_KIND_TEXT:
             if not field.choices:
                 segments.append(
                     StringSegmentValue(field.name, field.value_from_object(instance))
                 )
 
-        elif isinstance(field, (models.ForeignKey)) and issubclass(
+        elif kind == FIELD_KIND_FOREIGN_KEY and issubclass(
             field.related_model, TranslatableMixin
         ):
             related_instance = getattr(instance, field.name)
@@ -137,7 +142,7 @@ def extract_segments(instance):
                 )
 
         elif (
-            isinstance(field, (models.ManyToOneRel))
+            kind == FIELD_KIND_CHILD_RELATION
             and isinstance(field.remote_field, ParentalKey)
             and issubclass(field.related_model, TranslatableMixin)
         ):
@@ -1,13 +1,19 @@
 from collections import defaultdict
 
-from django.db import models
-
 from wagtail.core import blocks
-from wagtail.core.fields import RichTextField, StreamField
 from wagtail.core.rich_text import RichText
 
 from wagtail_localize.strings import restore_strings
 
+from ..fields import (
+    FIELD_KIND_CHILD_RELATION,
+    FIELD_KIND_FOREIGN_KEY,
+    FIELD_KIND_RICH_TEXT,
+    FIELD_KIND_STREAM,
+    FIELD_KIND_TEXT,
+    get_resolved_field,
+)
+
 
 def organise_template_segments(segments):
     # The first segment is always the template, followed by the texts in order of their position
@@ -17,6 +23,7 @@ def organise_template_segments(segments):
         template.format,
         template.template,
         [(segment.string, segment.attrs) for segment in segments[1:]],
+        template.uuid,
     )
 
 
@@ -26,6 +33,42 @@ def handle_related_object(related_object, src_locale, tgt_locale, segments):
     return related_object_value.get_instance(tgt_locale)
 
 
+def _split_segment_paths(segments):
+    """
+    Splits the path of each segment into its components.
+
+    Returns a list of (path components, segment) tuples that can be grouped level by level
+    without having to clone each segment at every level like .unwrap() does.
+    """
+    return [(segment.path.split("."), segment) for segment in segments]
+
+
+def _group_split_segments(split_segments):
+    """
+    Groups split segments by the first component of their path, removing it.
+    """
+    grouped = defaultdict(list)
+
+    for path_components, segment in split_segments:
+        grouped[path_components[0]].append((path_components[1:], segment))
+
+    return grouped
+
+
+def _join_split_segments(split_segments):
+    """
+    Converts split segments back into segments with the remaining components as their path.
+    """
+    joined = []
+
+    for path_components, segment in split_segments:
+        segment = segment.clone()
+        segment.path = ".".join(path_components)
+        joined.append(segment)
+
+    return joined
+
+
 class StreamFieldSegmentsWriter:
     def __init__(self, field, src_locale, tgt_locale):
         self.field = field
@@ -33,29 +76,36 @@ class StreamFieldSegmentsWriter:
         self.tgt_locale = tgt_locale
 
     def handle_block(self, block_type, block_value, segments):
+        return self._handle_block(block_type, block_value, _split_segment_paths(segments))
+
+    def _handle_block(self, block_type, block_value, split_segments):
         if hasattr(block_type, "restore_translated_segments"):
-            return block_type.restore_translated_segments(block_value, segments)
+            return block_type.restore_translated_segments(block_value, _join_split_segments(split_segments))
+
+        # Blocks that contain other blocks carry on with the split paths
+        elif isinstance(block_type, blocks.StructBlock):
+            return self._handle_struct_block(block_value, split_segments)
 
-        elif isinstance(block_type, (blocks.CharBlock, blocks.TextBlock)):
+        elif isinstance(block_type, blocks.StreamBlock):
+            return self._handle_stream_block(block_value, split_segments)
+
+        # Other blocks are given segments with their path relative to the block
+        segments = _join_split_segments(split_segments)
+
+        if isinstance(block_type, (blocks.CharBlock, blocks.TextBlock)):
             return segments[0].render_text()
 
         elif isinstance(block_type, blocks.RichTextBlock):
-            format, template, strings = organise_template_segments(segments)
+            format, template, strings, template_uuid = organise_template_segments(segments)
             assert format == "html"
-            return RichText(restore_strings(template, strings))
+            return RichText(restore_strings(template, strings, template_uuid=template_uuid))
 
         elif isinstance(block_type, blocks.ChooserBlock):
             return self.handle_related_object_block(block_value, segments)
 
-        elif isinstance(block_type, blocks.StructBlock):
-            return self.handle_struct_block(block_value, segments)
-
         elif isinstance(block_type, blocks.ListBlock):
             return self.handle_list_block(block_value, segments)
 
-        elif isinstance(block_type, blocks.StreamBlock):
-            return self.handle_stream_block(block_value, segments)
-
         else:
             raise Exception(
                 "Unrecognised StreamField block type '{}'. Have you implemented restore_translated_segments() on this class?".format(
@@ -69,19 +119,15 @@ class StreamFieldSegmentsWriter:
         )
 
     def handle_struct_block(self, struct_block, segments):
-        segments_by_field = defaultdict(list)
-
-        for segment in segments:
-            field_name, segment = segment.unwrap()
-            segments_by_field[field_name].append(segment)
-
-        for field_name, segments in segments_by_field.items():
-            if segments:
-                block_type = struct_block.block.child_blocks[field_name]
-                block_value = struct_block[field_name]
-                struct_block[field_name] = self.handle_block(
-                    block_type, block_value, segments
-                )
+        return self._handle_struct_block(struct_block, _split_segment_paths(segments))
+
+    def _handle_struct_block(self, struct_block, split_segments):
+        for field_name, field_segments in _group_split_segments(split_segments).items():
+            block_type = struct_block.block.child_blocks[field_name]
+            block_value = struct_block[field_name]
+            struct_block[field_name] = self._handle_block(
+                block_type, block_value, field_segments
+            )
 
         return struct_block
 
@@ -94,16 +140,34 @@ class StreamFieldSegmentsWriter:
             if stream_child.id == block_uuid:
                 return stream_child
 
+    def get_stream_block_children_by_id(self, stream_block):
+        """
+        Returns a dictionary mapping block IDs to the children of the given stream value.
+
+        If multiple children share an ID, the first one is used.
+        """
+        children = {}
+
+        for stream_child in stream_block:
+            children.setdefault(stream_child.id, stream_child)
+
+        return children
+
     def handle_stream_block(self, stream_block, segments):
-        segments_by_block = defaultdict(list)
+        """
+        Restores the translated segments into the given stream value.
+
+        The path of each segment is split once, and the children of each stream value are
+        indexed by ID once, so ingestion is linear in the number of blocks.
+        """
+        return self._handle_stream_block(stream_block, _split_segment_paths(segments))
 
-        for segment in segments:
-            block_uuid, segment = segment.unwrap()
-            segments_by_block[block_uuid].append(segment)
+    def _handle_stream_block(self, stream_block, split_segments):
+        children_by_id = self.get_stream_block_children_by_id(stream_block)
 
-        for block_uuid, segments in segments_by_block.items():
-            block = self.get_stream_block_child_data(stream_block, block_uuid)
-            block.value = self.handle_block(block.block, block.value, segments)
+        for block_uuid, block_segments in _group_split_segments(split_segments).items():
+            block = children_by_id[block_uuid]
+            block.value = self._handle_block(block.block, block.value, block_segments)
 
         return stream_block
 
@@ -116,37 +180,39 @@ def ingest_segments(original_obj, translated_obj, src_locale, tgt_locale, segmen
         segments_by_field_name[field_name].append(segment)
 
     for field_name, field_segments in segments_by_field_name.items():
-        field = translated_obj.__class__._meta.get_field(field_name)
+        resolved_field = get_resolved_field(translated_obj.__class__, field_name)
+        field = resolved_field.field
+        kind = resolved_field.kind
 
         if hasattr(field, "restore_translated_segments"):
             value = field.value_from_object(original_obj)
             new_value = field.restore_translated_segments(value, field_segments)
             setattr(translated_obj, field_name, new_value)
 
-        elif isinstance(field, StreamField):
+        elif kind == FIELD_KIND_STREAM:
             data = field.value_from_object(original_obj)
             StreamFieldSegmentsWriter(
                 field, src_locale, tgt_locale
             ).handle_stream_block(data, field_segments)
             setattr(translated_obj, field_name, data)
 
-        elif isinstance(field, RichTextField):
-            format, template, strings = organise_template_segments(field_segments)
+        elif kind == FIELD_KIND_RICH_TEXT:
+            format, template, strings, template_uuid = organise_template_segments(field_segments)
             assert format == "html"
-            html = restore_strings(template, strings)
+            html = restore_strings(template, strings, template_uuid=template_uuid)
             setattr(translated_obj, field_name, html)
 
-        elif isinstance(field, (models.TextField, models.CharField)):
+        elif kind == FIELD_KIND_TEXT:
             setattr(translated_obj, field_name, field_segments[0].render_text())
 
-        elif isinstance(field, models.ForeignKey):
+        elif kind == FIELD_KIND_FOREIGN_KEY:
             related_original = getattr(original_obj, field_name)
             related_translated = handle_related_object(
                 related_original, src_locale, tgt_locale, field_segments
             )
             setattr(translated_obj, field_name, related_translated)
 
-        elif isinstance(field, (models.ManyToOneRel)):
+        elif kind == FIELD_KIND_CHILD_RELATION:
             original_manager = getattr(original_obj, field_name)
             translated_manager = getattr(translated_obj, field_name)
 
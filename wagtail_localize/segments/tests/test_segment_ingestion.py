@@ -12,7 +12,7 @@ from wagtail_localize.segments import (
     TemplateSegmentValue,
     RelatedObjectSegmentValue,
 )
-from wagtail_localize.segments.ingest import ingest_segments
+from wagtail_localize.segments.ingest import StreamFieldSegmentsWriter, ingest_segments
 from wagtail_localize.strings import StringValue
 from wagtail_localize.test.models import TestPage, TestSnippet, TestChildObject
 
@@ -600,6 +600,64 @@ class TestSegmentIngestionWithStreamField(TestCase):
             ],
         )
 
+    def test_multiple_blocks(self):
+        block_ids = [uuid.uuid4() for i in range(5)]
+        stream_data = [
+            {"id": str(block_id), "type": "test_charblock", "value": f"Test content {i}"}
+            for i, block_id in enumerate(block_ids)
+        ]
+        page = make_test_page(
+            test_streamfield=StreamValue(
+                TestPage.test_streamfield.field.stream_block, stream_data, is_lazy=True
+            ),
+        )
+
+        translated_page = page.copy_for_translation(self.locale)
+
+        ingest_segments(
+            page,
+            translated_page,
+            self.src_locale,
+            self.locale,
+            [
+                StringSegmentValue(f"test_streamfield.{block_ids[3]}", "Tester le contenu 3"),
+                StringSegmentValue(f"test_streamfield.{block_ids[1]}", "Tester le contenu 1"),
+            ],
+        )
+
+        translated_page.save()
+        translated_page.refresh_from_db()
+
+        self.assertEqual(
+            [block["value"] for block in translated_page.test_streamfield.stream_data],
+            [
+                "Test content 0",
+                "Tester le contenu 1",
+                "Test content 2",
+                "Tester le contenu 3",
+                "Test content 4",
+            ],
+        )
+
+    def test_stream_field_segments_writer(self):
+        block_id = uuid.uuid4()
+        page = make_test_page_with_streamfield_block(
+            str(block_id),
+            "test_structblock",
+            {"field_a": "Test content", "field_b": "Some more test content"},
+        )
+
+        writer = StreamFieldSegmentsWriter(
+            TestPage.test_streamfield.field, self.src_locale, self.locale
+        )
+        stream_value = writer.handle_stream_block(
+            page.test_streamfield,
+            [StringSegmentValue(f"{block_id}.field_a", "Tester le contenu")],
+        )
+
+        self.assertEqual(stream_value[0].value["field_a"], "Tester le contenu")
+        self.assertEqual(stream_value[0].value["field_b"], "Some more test content")
+
     def test_customstructblock(self):
         block_id = uuid.uuid4()
         page = make_test_page_with_streamfield_block(
@@ -101,16 +101,19 @@ class StringSegmentValue(BaseValue):
 
 
 class TemplateSegmentValue(BaseValue):
-    def __init__(self, path, format, template, string_count, **kwargs):
+    def __init__(self, path, format, template, string_count, uuid=None, **kwargs):
         self.format = format
         self.template = template
         self.string_count = string_count
 
+        # The UUID of the Template this value was loaded from (if any). Used for caching
+        self.uuid = uuid
+
         super().__init__(path, **kwargs)
 
     def clone(self):
         return TemplateSegmentValue(
-            self.path, self.format, self.template, self.string_count, order=self.order
+            self.path, self.format, self.template, self.string_count, uuid=self.uuid, order=self.order
         )
 
     def is_empty(self):
@@ -132,10 +135,13 @@ class TemplateSegmentValue(BaseValue):
 
 
 class RelatedObjectSegmentValue(BaseValue):
-    def __init__(self, path, content_type, translation_key, **kwargs):
+    def __init__(self, path, content_type, translation_key, instance=None, **kwargs):
         self.content_type = content_type
         self.translation_key = translation_key
 
+        # The related object in the locale being translated into, if it has already been fetched
+        self.instance = instance
+
         super().__init__(path, **kwargs)
 
     @classmethod
@@ -148,13 +154,16 @@ class RelatedObjectSegmentValue(BaseValue):
     def get_instance(self, locale):
         from ..models import pk
 
+        if self.instance is not None and self.instance.locale_id == pk(locale):
+            return self.instance
+
         return self.content_type.get_object_for_this_type(
             translation_key=self.translation_key, locale_id=pk(locale)
         )
 
     def clone(self):
         return RelatedObjectSegmentValue(
-            self.path, self.content_type, self.translation_key, order=self.order
+            self.path, self.content_type, self.translation_key, order=self.order, instance=self.instance
         )
 
     def is_empty(self):
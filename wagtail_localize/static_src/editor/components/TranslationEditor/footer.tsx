@@ -5,6 +5,7 @@ import Icon from '../../../common/components/Icon';
 import ActionMenu from '../../../common/components/ActionMenu';
 
 import { EditorProps } from '.';
+import { submitAfterSavingEdits } from './segments';
 
 const EditorFooter: FunctionComponent<EditorProps> = ({
     csrfToken,
@@ -15,7 +16,11 @@ const EditorFooter: FunctionComponent<EditorProps> = ({
     locale
 }) => {
     let actions = [
-        <form method="POST" action={links.stopTranslationUrl}>
+        <form
+            method="POST"
+            action={links.stopTranslationUrl}
+            onSubmit={submitAfterSavingEdits}
+        >
             <input type="hidden" name="csrfmiddlewaretoken" value={csrfToken} />
             <input type="hidden" name="next" value={window.location.href} />
 
@@ -41,7 +46,11 @@ const EditorFooter: FunctionComponent<EditorProps> = ({
 
     if (perms.canLock && !isLocked) {
         actions.push(
-            <form method="POST" action={links.lockUrl}>
+            <form
+                method="POST"
+                action={links.lockUrl}
+                onSubmit={submitAfterSavingEdits}
+            >
                 <input
                     type="hidden"
                     name="csrfmiddlewaretoken"
@@ -63,7 +72,11 @@ const EditorFooter: FunctionComponent<EditorProps> = ({
 
     if (perms.canUnlock && isLocked) {
         actions.push(
-            <form method="POST" action={links.unlockUrl}>
+            <form
+                method="POST"
+                action={links.unlockUrl}
+                onSubmit={submitAfterSavingEdits}
+            >
                 <input
                     type="hidden"
                     name="csrfmiddlewaretoken"
@@ -94,18 +107,19 @@ const EditorFooter: FunctionComponent<EditorProps> = ({
 
     if (perms.canPublish) {
         actions.push(
-            <form method="POST">
+            <form method="POST" onSubmit={submitAfterSavingEdits}>
                 <input
                     type="hidden"
                     name="csrfmiddlewaretoken"
                     value={csrfToken}
                 />
                 <input type="hidden" name="next" value={window.location.href} />
+                {/* Not set on the button because the button's value isn't sent
+                    if the form is submitted after waiting for edits to save */}
+                <input type="hidden" name="action" value="publish" />
 
                 <button
                     type="submit"
-                    name="action"
-                    value="publish"
                     className="button button-longrunning "
                     data-clicked-text={gettext('Publishing…')}
                 >
@@ -6,7 +6,7 @@ import { Tabs, TabContent } from '../../../common/components/Tabs';
 import { EditorState, reducer } from './reducer';
 import EditorHeader from './header';
 import EditorFooter from './footer';
-import EditorSegmentList from './segments';
+import EditorSegmentList, { sendPendingEdits } from './segments';
 import EditorToolbox from './toolbox';
 
 export interface User {
@@ -105,6 +105,7 @@ export interface EditorProps {
         unlockUrl: string;
         deleteUrl: string;
         stopTranslationUrl: string;
+        editStringTranslationsUrl: string;
     };
     previewModes: PreviewMode[];
     machineTranslator: {
@@ -136,6 +137,16 @@ const TranslationEditor: FunctionComponent<EditorProps> = props => {
     };
     const [state, dispatch] = React.useReducer(reducer, initialState);
 
+    // Don't lose any edits that haven't been sent yet when the user leaves the page
+    React.useEffect(() => {
+        const onBeforeUnload = () => sendPendingEdits(true);
+        window.addEventListener('beforeunload', onBeforeUnload);
+
+        return () => {
+            window.removeEventListener('beforeunload', onBeforeUnload);
+        };
+    }, []);
+
     const tabData = props.tabs
         .map(tab => {
             const segments = props.segments.filter(
@@ -20,9 +20,138 @@ import {
     TRANSLATION_DELETED
 } from './reducer';
 
+// Edits are sent to the server in batches. An edit is sent once no other edit
+// has been made for this long (in milliseconds)
+const SAVE_DEBOUNCE_DELAY = 500;
+
+interface PendingEdits {
+    url: string;
+    csrfToken: string;
+    dispatch: React.Dispatch<EditorAction>;
+    // Maps segment ID to the latest value. An empty value deletes the translation
+    values: Map<number, string>;
+    timeout: number | null;
+}
+
+let pendingEdits: PendingEdits | null = null;
+
+// Batches that have been sent but haven't had a response yet. Each one
+// resolves to whether it was saved
+const savesInProgress = new Set<Promise<boolean>>();
+
+export function sendPendingEdits(keepalive = false) {
+    if (!pendingEdits) {
+        return;
+    }
+
+    const { url, csrfToken, dispatch, values, timeout } = pendingEdits;
+    pendingEdits = null;
+
+    if (timeout !== null) {
+        window.clearTimeout(timeout);
+    }
+
+    const edits = Array.from(values.entries()).map(([segmentId, value]) => {
+        return { segment_id: segmentId, value };
+    });
+
+    const onError = () => {
+        values.forEach((_value, segmentId) => {
+            dispatch({
+                type: TRANSLATION_SAVE_SERVER_ERROR,
+                segmentId
+            });
+        });
+    };
+
+    const save: Promise<boolean> = fetch(url, {
+        credentials: 'same-origin',
+        method: 'POST',
+        body: JSON.stringify({ edits }),
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfToken
+        },
+        keepalive
+    })
+        .then(response => {
+            if (response.status == 200) {
+                return response.json();
+            } else {
+                throw new Error('Unrecognised HTTP status returned');
+            }
+        })
+        .then(
+            (result: {
+                translations: StringTranslationAPI[];
+                deleted: number[];
+            }) => {
+                result.translations.forEach(translation => {
+                    dispatch({
+                        type: TRANSLATION_SAVED,
+                        segmentId: translation.segment_id,
+                        translation
+                    });
+                });
+
+                result.deleted.forEach(segmentId => {
+                    dispatch({
+                        type: TRANSLATION_DELETED,
+                        segmentId
+                    });
+                });
+
+                return true;
+            }
+        )
+        .catch(() => {
+            onError();
+            return false;
+        })
+        .then(saved => {
+            savesInProgress.delete(save);
+            return saved;
+        });
+
+    savesInProgress.add(save);
+}
+
+// Sends any edits that are waiting to be batched and resolves once every save
+// has finished. Resolves to false if any of them failed
+export function flushPendingEdits(): Promise<boolean> {
+    sendPendingEdits();
+
+    return Promise.all(Array.from(savesInProgress)).then(results =>
+        results.every(saved => saved)
+    );
+}
+
+// Submit handler for forms that act on the saved translations (such as
+// publishing). Holds back the submission until all edits have been saved so
+// none of them are missed. If any of them couldn't be saved, the form isn't
+// submitted and the errors are left on the segments
+export function submitAfterSavingEdits(
+    e: React.FormEvent<HTMLFormElement>
+) {
+    if (!pendingEdits && savesInProgress.size == 0) {
+        return;
+    }
+
+    e.preventDefault();
+
+    // Calling submit() directly doesn't trigger this handler again
+    const form = e.currentTarget;
+    flushPendingEdits().then(saved => {
+        if (saved) {
+            form.submit();
+        }
+    });
+}
+
 function saveTranslation(
     segment: StringSegment,
     value: string,
+    url: string,
     csrfToken: string,
     dispatch: React.Dispatch<EditorAction>
 ) {
@@ -31,61 +160,31 @@ function saveTranslation(
         segmentId: segment.id,
         value: value
     });
-    if (value) {
-        // Create/update the translation
-        const formData = new FormData();
-        formData.append('value', value);
-
-        fetch(segment.editUrl, {
-            credentials: 'same-origin',
-            method: 'PUT',
-            body: formData,
-            headers: {
-                'X-CSRFToken': csrfToken
-            }
-        })
-            .then(response => {
-                if (response.status == 200 || response.status == 201) {
-                    return response.json();
-                } else {
-                    throw new Error('Unrecognised HTTP status returned');
-                }
-            })
-            .then((translation: StringTranslationAPI) => {
-                dispatch({
-                    type: TRANSLATION_SAVED,
-                    segmentId: segment.id,
-                    translation
-                });
-            })
-            .catch(() => {
-                dispatch({
-                    type: TRANSLATION_SAVE_SERVER_ERROR,
-                    segmentId: segment.id
-                });
-            });
-    } else {
-        // Delete the translation
-        fetch(segment.editUrl, {
-            credentials: 'same-origin',
-            method: 'DELETE',
-            headers: {
-                'X-CSRFToken': csrfToken
-            }
-        }).then(response => {
-            if (response.status == 200 || response.status == 404) {
-                dispatch({
-                    type: TRANSLATION_DELETED,
-                    segmentId: segment.id
-                });
-            } else {
-                dispatch({
-                    type: TRANSLATION_SAVE_SERVER_ERROR,
-                    segmentId: segment.id
-                });
-            }
-        });
+
+    if (pendingEdits && pendingEdits.url != url) {
+        sendPendingEdits();
     }
+
+    if (!pendingEdits) {
+        pendingEdits = {
+            url,
+            csrfToken,
+            dispatch,
+            values: new Map(),
+            timeout: null
+        };
+    }
+
+    // Coalesce edits of the same segment and wait for any more edits
+    pendingEdits.values.set(segment.id, value);
+
+    if (pendingEdits.timeout !== null) {
+        window.clearTimeout(pendingEdits.timeout);
+    }
+    pendingEdits.timeout = window.setTimeout(
+        () => sendPendingEdits(),
+        SAVE_DEBOUNCE_DELAY
+    );
 }
 
 interface SingleLineTextAreaProps {
@@ -282,6 +381,7 @@ interface EditorSegmentProps {
     segment: StringSegment;
     translation?: StringTranslation;
     isLocked: boolean;
+    saveUrl: string;
     dispatch: React.Dispatch<EditorAction>;
     csrfToken: string;
 }
@@ -290,6 +390,7 @@ const EditorSegment: FunctionComponent<EditorSegmentProps> = ({
     segment,
     translation,
     isLocked,
+    saveUrl,
     dispatch,
     csrfToken
 }) => {
@@ -305,7 +406,13 @@ const EditorSegment: FunctionComponent<EditorSegmentProps> = ({
     if (isEditing && !isLocked) {
         const onClickSave = () => {
             setIsEditing(false);
-            saveTranslation(segment, editingValue, csrfToken, dispatch);
+            saveTranslation(
+                segment,
+                editingValue,
+                saveUrl,
+                csrfToken,
+                dispatch
+            );
         };
 
         const onClickCancel = () => {
@@ -418,6 +525,7 @@ interface EditorSegmentListProps extends EditorProps, EditorState {
 
 const EditorSegmentList: FunctionComponent<EditorSegmentListProps> = ({
     object: { isLocked },
+    links,
     segments,
     stringTranslations,
     dispatch,
@@ -449,6 +557,7 @@ const EditorSegmentList: FunctionComponent<EditorSegmentListProps> = ({
                         segment={segment}
                         translation={stringTranslations.get(segment.id)}
                         isLocked={isLocked}
+                        saveUrl={links.editStringTranslationsUrl}
                         dispatch={dispatch}
                         csrfToken={csrfToken}
                     />
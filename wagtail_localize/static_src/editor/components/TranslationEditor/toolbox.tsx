@@ -8,6 +8,7 @@ import CloudIcon from './cloud-solid.svg';
 
 import { EditorProps } from '.';
 import { EditorState, EditorAction } from './reducer';
+import { flushPendingEdits, submitAfterSavingEdits } from './segments';
 
 const ToolboxWrapper = styled.div`
     padding-top: 20px;
@@ -75,9 +76,17 @@ const EditorToolbox: FunctionComponent<EditorToolboxProps> = ({
     const uploadPofile = (e: React.ChangeEvent<HTMLInputElement>) => {
         e.preventDefault();
 
-        if (uploadPofileForm.current) {
-            uploadPofileForm.current.submit();
-        }
+        // The PO file is merged with the saved translations, so wait for any
+        // edits to be saved. If any of them failed, clear the input so the
+        // same file can be chosen again
+        const input = e.currentTarget;
+        flushPendingEdits().then(saved => {
+            if (!saved) {
+                input.value = '';
+            } else if (uploadPofileForm.current) {
+                uploadPofileForm.current.submit();
+            }
+        });
     };
 
     return (
@@ -141,6 +150,7 @@ const EditorToolbox: FunctionComponent<EditorToolboxProps> = ({
                     <form
                         action={machineTranslator.url}
                         method="post"
+                        onSubmit={submitAfterSavingEdits}
                         encType="multipart/form-data"
                     >
                         <input
@@ -1,7 +1,13 @@
-from collections import Counter
-
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.html import escape
-from django.utils.translation import gettext as _
+from django.utils.translation import gettext as _, gettext_noop
 
 from bs4 import BeautifulSoup, NavigableString, Tag
 
@@ -33,6 +39,56 @@ def rstrip_keep(text):
     return new_text, suffix
 
 
+HTML_ERROR_MESSAGES = {
+    'tag_not_allowed': gettext_noop("<{}> tag is not allowed. Strings can only contain standard HTML inline tags (such as <b>, <a>)"),
+    'attributes_not_allowed': gettext_noop("Strings cannot have any HTML tags with attributes (except for 'id' in <a> tags)"),
+}
+
+
+def get_html_error_message(error_key):
+    """
+    Returns the message of an HTMLValidationError, in the active language, from its error_key.
+    """
+    code, _sep, tag_name = error_key.partition(':')
+    if code not in HTML_ERROR_MESSAGES:
+        return error_key
+
+    return _(HTML_ERROR_MESSAGES[code]).format(tag_name)
+
+
+class HTMLValidationError(ValueError):
+    """
+    Raised when a string contains HTML that we disallow from strings.
+
+    The message is translated into the active language. Store the error_key instead of the
+    message so that it can be shown in the language of whoever views it later.
+    """
+    def __init__(self, code, tag_name):
+        self.code = code
+        self.tag_name = tag_name
+        super().__init__(get_html_error_message(self.error_key))
+
+    @property
+    def error_key(self):
+        return '{}:{}'.format(self.code, self.tag_name)
+
+
+def validate_tag(name, attr_names):
+    """
+    Checks the name and attributes of a tag for anything that we disallow from strings.
+    """
+    # Block tags are not allowed in strings
+    if name not in INLINE_TAGS:
+        raise HTMLValidationError('tag_not_allowed', name)
+
+    # Elements can't have attributes, except for <a> tags
+    keys = set(attr_names)
+    if name == 'a' and 'id' in keys:
+        keys.remove('id')
+    if keys:
+        raise HTMLValidationError('attributes_not_allowed', name)
+
+
 def validate_element(element):
     """
     Checks the given BeautifulSoup element for anything that we disallow from strings.
@@ -42,22 +98,38 @@ def validate_element(element):
 
     # Validate tag and attributes
     if isinstance(element, Tag) and element.name != '[document]':
-        # Block tags are not allowed in strings
-        if element.name not in INLINE_TAGS:
-            raise ValueError(_("<{}> tag is not allowed. Strings can only contain standard HTML inline tags (such as <b>, <a>)").format(element.name))
-
-        # Elements can't have attributes, except for <a> tags
-        keys = set(element.attrs.keys())
-        if element.name == 'a' and 'id' in keys:
-            keys.remove('id')
-        if keys:
-            raise ValueError(_("Strings cannot have any HTML tags with attributes (except for 'id' in <a> tags)"))
+        validate_tag(element.name, element.attrs.keys())
 
     # Traverse children
     for child_element in element.children:
         validate_element(child_element)
 
 
+class TranslatedHTMLValidator(HTMLParser):
+    """
+    Validates the tags of some HTML as they are parsed. See validate_translated_html.
+    """
+    def handle_starttag(self, name, attrs):
+        validate_tag(name, [key for key, value in attrs])
+
+
+def validate_translated_html(html):
+    """
+    Checks translated HTML for anything that we disallow from strings, raising HTMLValidationError if there is a problem.
+
+    This gives the same result as StringValue.from_translated_html, but it doesn't build a BeautifulSoup tree.
+    BeautifulSoup's "html.parser" tree builder is built on the same parser and creates a tag for each start
+    tag, so validating the start tags in the order they appear finds the same error as walking the tree.
+    """
+    # Plain text can't contain any tags
+    if '<' not in html:
+        return
+
+    validator = TranslatedHTMLValidator()
+    validator.feed(html)
+    validator.close()
+
+
 class StringValue:
     """
     A fragment of HTML that only contains inline tags with all attributes stripped out.
@@ -174,7 +246,13 @@ class StringValue:
         return soup
 
     def render_html(self, attrs):
-        return str(self.render_soup(attrs))
+        from .tokenizer import UnsupportedHTML, restore_attrs
+
+        # Normalised HTML (which is what's usually in self.data) can be rendered without building a tree
+        try:
+            return restore_attrs(self.data, attrs)
+        except UnsupportedHTML:
+            return str(self.render_soup(attrs))
 
     def get_translatable_html(self):
         return self.data
@@ -196,6 +274,10 @@ def extract_strings(html):
     """
     This function extracts translatable strings from an HTML fragment.
 
+    Uses the implementation selected by the WAGTAILLOCALIZE_STRINGS_PARSER setting. This can be
+    either "beautifulsoup" (the default) or "tokenizer", which is faster and produces identical
+    output (see wagtail_localize.tokenizer).
+
     Inline elements and visible text are extracted together.
 
     For example:
@@ -224,6 +306,26 @@ def extract_strings(html):
             "<b>Baz</b>",
         ]
     """
+    parser = getattr(settings, 'WAGTAILLOCALIZE_STRINGS_PARSER', 'beautifulsoup')
+
+    if parser == 'tokenizer':
+        from . import tokenizer
+
+        try:
+            return tokenizer.extract_strings(html)
+        except tokenizer.UnsupportedHTML:
+            pass
+
+    elif parser != 'beautifulsoup':
+        raise ImproperlyConfigured("WAGTAILLOCALIZE_STRINGS_PARSER must be either 'beautifulsoup' or 'tokenizer'")
+
+    return extract_strings_beautifulsoup(html)
+
+
+def extract_strings_beautifulsoup(html):
+    """
+    The reference implementation of extract_strings, built on BeautifulSoup.
+    """
     soup = BeautifulSoup(html, "html.parser")
 
     def wrap(elements):
@@ -381,11 +483,148 @@ def extract_strings(html):
     return str(soup), strings
 
 
-def restore_strings(template, strings):
+def tokenize_template(template):
+    """
+    Splits a template into the HTML between its <text> tags and the positions of the strings
+    that replace them.
+
+    Returns a tuple that alternates between HTML and positions, starting and ending with HTML.
+    For example:
+
+        ('<p>', 0, '</p><p>', 1, '</p>')
+    """
     soup = BeautifulSoup(template, "html.parser")
 
+    # A marker that can't appear in the template is used to find where the <text> tags were
+    marker = uuid.uuid4().hex
+
     for text_element in soup.findAll("text"):
-        string, attrs = strings[int(text_element.get("position"))]
-        text_element.replaceWith(string.render_soup(attrs))
+        position = int(text_element.get("position"))
+        text_element.replaceWith(marker + str(position) + marker)
+
+    parts = str(soup).split(marker)
+    for i in range(1, len(parts), 2):
+        parts[i] = int(parts[i])
+
+    return tuple(parts)
+
+
+def render_tokenized_template(parts, strings):
+    """
+    Renders a template tokenized with tokenize_template, replacing each <text> tag with the
+    HTML of the string at its position.
+    """
+    output = []
+
+    for i, part in enumerate(parts):
+        if i % 2:
+            string, attrs = strings[part]
+            output.append(string.render_html(attrs))
+        else:
+            output.append(part)
+
+    return "".join(output)
+
+
+class TemplateCache:
+    """
+    A cache of tokenized templates, keyed by the UUID of their Template.
+
+    Templates are stored in a bounded, process-local LRU cache. If a Django cache is configured,
+    that is checked before tokenizing any template that isn't in the local cache so that the work
+    can be shared between processes.
+
+    This is configured with the WAGTAILLOCALIZE_TEMPLATE_CACHE setting:
+
+        WAGTAILLOCALIZE_TEMPLATE_CACHE = {
+            # The maximum number of templates to keep in each process
+            'MAX_SIZE': 1000,
+
+            # The alias of a Django cache to also store templates in (optional)
+            'BACKEND': 'default',
+        }
+    """
+    DEFAULT_MAX_SIZE = 1000
+
+    def __init__(self):
+        self.templates = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_config(self):
+        return getattr(settings, 'WAGTAILLOCALIZE_TEMPLATE_CACHE', {})
+
+    def get_backend(self):
+        alias = self.get_config().get('BACKEND')
+
+        if alias is not None:
+            return caches[alias]
+
+    def get_backend_key(self, template_uuid):
+        return 'wagtail_localize:template:{}'.format(template_uuid)
+
+    def get(self, template_uuid, template):
+        """
+        Returns the tokenized version of the given template. See tokenize_template.
+        """
+        with self.lock:
+            parts = self.templates.get(template_uuid)
+
+            if parts is not None:
+                self.templates.move_to_end(template_uuid)
+                self.hits += 1
+                return parts
+
+        backend = self.get_backend()
+        if backend is not None:
+            parts = backend.get(self.get_backend_key(template_uuid))
+
+        if parts is None:
+            parts = tokenize_template(template)
+
+            if backend is not None:
+                backend.set(self.get_backend_key(template_uuid), parts)
+
+            with self.lock:
+                self.misses += 1
+        else:
+            with self.lock:
+                self.hits += 1
+
+        max_size = self.get_config().get('MAX_SIZE', self.DEFAULT_MAX_SIZE)
+
+        with self.lock:
+            self.templates[template_uuid] = parts
+            self.templates.move_to_end(template_uuid)
+
+            while len(self.templates) > max_size:
+                self.templates.popitem(last=False)
+
+        return parts
+
+    def clear(self):
+        """
+        Clears the process-local cache and resets the counters.
+        """
+        with self.lock:
+            self.templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+template_cache = TemplateCache()
+
+
+def restore_strings(template, strings, template_uuid=None):
+    """
+    Replaces the <text> tags in the template with the HTML of the given strings.
+
+    If the UUID of the template is given, its tokenized version is cached.
+    """
+    if template_uuid is not None:
+        parts = template_cache.get(template_uuid, template)
+    else:
+        parts = tokenize_template(template)
 
-    return str(soup)
+    return render_tokenized_template(parts, strings)
@@ -2,6 +2,7 @@ import json
 import uuid
 import tempfile
 import unittest
+from unittest import mock
 
 import polib
 from django import VERSION as DJANGO_VERSION
@@ -9,8 +10,11 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.messages import get_messages
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as __
@@ -20,8 +24,10 @@ from wagtail.core.blocks import StreamValue
 from wagtail.core.models import Page, Locale
 from wagtail.tests.utils import WagtailTestUtils
 
-from wagtail_localize.models import String, StringTranslation, Translation, TranslationContext, TranslationLog, TranslationSource
+from wagtail_localize.models import MachineTranslation, String, StringTranslation, Translation, TranslationContext, TranslationLog, TranslationSource
+from wagtail_localize.strings import StringValue
 from wagtail_localize.test.models import TestPage, TestSnippet
+from wagtail_localize.views.edit_translation import SegmentLocationIndex, TabHelper, get_segment_locations
 from wagtail_localize.wagtail_hooks import SNIPPET_RESTART_TRANSLATION_ENABLED
 
 from .utils import assert_permission_denied
@@ -165,6 +171,42 @@ class TestGetEditTranslationView(EditTranslationTestData, TestCase):
         self.assertEqual(props['segments'][9]['location'], {'tab': 'content', 'field': 'Text block', 'blockId': str(STREAM_BLOCK_ID), 'fieldHelpText': '', 'subField': None})
         # TODO: Examples that use fieldHelpText and subField
 
+    def test_edit_page_translation_with_string_translations(self):
+        def get_props():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('wagtailadmin_pages:edit', args=[self.fr_page.id]))
+            self.assertEqual(response.status_code, 200)
+            return json.loads(response.context['props']), len(queries)
+
+        string_segments = list(self.page_source.stringsegment_set.order_by('order').select_related('string'))
+
+        def translate(string_segment):
+            StringTranslation.objects.create(
+                translation_of=string_segment.string,
+                context_id=string_segment.context_id,
+                locale=self.fr_locale,
+                data=string_segment.string.data,
+                last_translated_by=self.user,
+            )
+
+        # Warm up any caches that are populated on the first request
+        get_props()
+
+        translate(string_segments[0])
+        props, num_queries = get_props()
+        self.assertEqual([translation['segment_id'] for translation in props['initialStringTranslations']], [string_segments[0].id])
+
+        for string_segment in string_segments[1:]:
+            translate(string_segment)
+
+        # Loading the editor shouldn't run extra queries for each string translation
+        props, num_queries_all_translated = get_props()
+        self.assertEqual(num_queries_all_translated, num_queries)
+        self.assertEqual(
+            sorted(translation['segment_id'] for translation in props['initialStringTranslations']),
+            sorted(string_segment.id for string_segment in string_segments)
+        )
+
     def test_edit_page_translation_with_multi_mode_preview(self):
         # Add some extra preview modes to the page
         previous_preview_modes = TestPage.preview_modes
@@ -259,6 +301,60 @@ class TestGetEditTranslationView(EditTranslationTestData, TestCase):
 
 
 @freeze_time('2020-08-21')
+class TestSegmentLocations(EditTranslationTestData, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+        self.source_instance = self.page_source.get_source_instance()
+        self.tab_helper = TabHelper(self.source_instance)
+        self.context_paths = [
+            'test_charfield',
+            'test_richtextfield',
+            f'test_streamfield.{STREAM_BLOCK_ID}',
+        ]
+
+    def get_segment_locations(self):
+        return get_segment_locations(self.page_source, self.source_instance, self.tab_helper, self.context_paths)
+
+    def test_get_segment_locations(self):
+        locations = self.get_segment_locations()
+
+        self.assertEqual(locations, {
+            'test_charfield': {'tab': 'content', 'field': 'Char field', 'blockId': None, 'fieldHelpText': '', 'subField': None},
+            'test_richtextfield': {'tab': 'content', 'field': 'Test richtextfield', 'blockId': None, 'fieldHelpText': '', 'subField': None},
+            f'test_streamfield.{STREAM_BLOCK_ID}': {'tab': 'content', 'field': 'Text block', 'blockId': str(STREAM_BLOCK_ID), 'fieldHelpText': '', 'subField': None},
+        })
+
+    def test_stream_field_walked_once(self):
+        field = TestPage._meta.get_field('test_streamfield')
+        index = SegmentLocationIndex(self.page_source, self.source_instance, self.tab_helper)
+
+        with mock.patch.object(field, 'value_from_object', wraps=field.value_from_object) as value_from_object:
+            index.get_location(f'test_streamfield.{STREAM_BLOCK_ID}')
+            index.get_location(f'test_streamfield.{STREAM_BLOCK_ID}')
+
+        self.assertEqual(value_from_object.call_count, 1)
+
+    def test_locations_are_cached(self):
+        locations = self.get_segment_locations()
+
+        with mock.patch.object(SegmentLocationIndex, 'get_location') as get_location:
+            self.assertEqual(self.get_segment_locations(), locations)
+
+        get_location.assert_not_called()
+
+    def test_locations_recalculated_when_source_changes(self):
+        self.get_segment_locations()
+
+        self.page_source.content_digest = 'changed'
+
+        with mock.patch.object(SegmentLocationIndex, 'get_location', return_value={}) as get_location:
+            self.get_segment_locations()
+
+        self.assertEqual(get_location.call_count, len(self.context_paths))
+
+
 class TestPublishTranslation(EditTranslationTestData, APITestCase):
     def test_publish_page_translation(self):
         StringTranslation.objects.create(
@@ -531,9 +627,13 @@ class TestRestartTranslation(EditTranslationTestData, TestCase):
     def test_restart_page_translation(self):
         self.page_translation.enabled = False
         self.page_translation.save()
-        response = self.client.post(reverse('wagtailadmin_pages:edit', args=[self.fr_page.id]), {
-            'localize-restart-translation': 'yes',
-        })
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('wagtailadmin_pages:edit', args=[self.fr_page.id]), {
+                'localize-restart-translation': 'yes',
+            })
+
+        self.assertEqual(len(get_translation_queries(queries)), 1)
 
         self.assertRedirects(response, reverse('wagtailadmin_pages:edit', args=[self.fr_page.id]))
 
@@ -561,15 +661,26 @@ class TestRestartTranslation(EditTranslationTestData, TestCase):
         self.assertEqual(messages[0].message, "Translation has been restarted.\n\n\n\n\n")
 
 
+def get_translation_queries(queries):
+    return [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT') and 'FROM "wagtail_localize_translation" ' in query['sql']
+    ]
+
+
 class TestRestartTranslationButton(EditTranslationTestData, TestCase):
     def test_page(self):
         self.page_translation.enabled = False
         self.page_translation.save()
 
-        response = self.client.get(reverse('wagtailadmin_pages:edit', args=[self.fr_page.id]))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('wagtailadmin_pages:edit', args=[self.fr_page.id]))
 
         self.assertContains(response, "Restart translation")
 
+        # The translation is looked up once for the edit hook and the action menu
+        self.assertEqual(len(get_translation_queries(queries)), 1)
+
     def test_doesnt_show_when_no_translation_for_page(self):
         self.page_translation.delete()
 
@@ -582,9 +693,11 @@ class TestRestartTranslationButton(EditTranslationTestData, TestCase):
         self.snippet_translation.enabled = False
         self.snippet_translation.save()
 
-        response = self.client.get(reverse('wagtailsnippets:edit', args=[TestSnippet._meta.app_label, TestSnippet._meta.model_name, self.fr_snippet.id]))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('wagtailsnippets:edit', args=[TestSnippet._meta.app_label, TestSnippet._meta.model_name, self.fr_snippet.id]))
 
         self.assertContains(response, "Restart translation")
+        self.assertEqual(len(get_translation_queries(queries)), 1)
 
     @unittest.skipUnless(SNIPPET_RESTART_TRANSLATION_ENABLED, "wagtail.snippets.action_menu module doesn't exist. See: https://github.com/wagtail/wagtail/pull/6384")
     def test_doesnt_show_when_no_translation_for_snippet(self):
@@ -767,27 +880,300 @@ class TestEditStringTranslationAPIView(EditTranslationTestData, APITestCase):
         self.assertEquals(response.status_code, 403)
 
 
+@freeze_time('2020-08-21')
+class TestEditStringTranslationsAPIView(EditTranslationTestData, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.char_field_segment = String.objects.get(data='A char field').segments.get()
+        self.text_field_segment = String.objects.get(data='A text field').segments.get()
+
+    def edit_string_translations(self, edits, translation=None):
+        translation = translation or self.page_translation
+        return self.client.post(reverse('wagtail_localize:edit_string_translations', args=[translation.id]), {'edits': edits}, format='json', follow=True)
+
+    def test_edit_string_translations(self):
+        StringTranslation.objects.create(
+            translation_of=self.text_field_segment.string,
+            context=self.text_field_segment.context,
+            locale=self.fr_locale,
+            data='Not translated!',
+            translation_type=StringTranslation.TRANSLATION_TYPE_MACHINE
+        )
+
+        # The number of queries doesn't depend on the number of edits
+        with self.assertNumQueries(17):
+            response = self.edit_string_translations([
+                {'segment_id': self.char_field_segment.id, 'value': 'Un champ de caractères'},
+                {'segment_id': self.text_field_segment.id, 'value': 'Un champ de texte'},
+            ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json(), {
+            'translations': [
+                {
+                    'string_id': self.char_field_segment.string_id,
+                    'segment_id': self.char_field_segment.id,
+                    'data': 'Un champ de caractères',
+                    'error': None,
+                    'comment': 'Translated manually on 21 August 2020',
+                    'last_translated_by': {
+                        'avatar_url': '//www.gravatar.com/avatar/93942e96f5acd83e2e047ad8fe03114d?s=50&d=mm',
+                        'full_name': ''
+                    }
+                },
+                {
+                    'string_id': self.text_field_segment.string_id,
+                    'segment_id': self.text_field_segment.id,
+                    'data': 'Un champ de texte',
+                    'error': None,
+                    'comment': 'Translated manually on 21 August 2020',
+                    'last_translated_by': {
+                        'avatar_url': '//www.gravatar.com/avatar/93942e96f5acd83e2e047ad8fe03114d?s=50&d=mm',
+                        'full_name': ''
+                    }
+                },
+            ],
+            'deleted': [],
+        })
+
+        for string_segment, data in [(self.char_field_segment, 'Un champ de caractères'), (self.text_field_segment, 'Un champ de texte')]:
+            translation = StringTranslation.objects.get(translation_of_id=string_segment.string_id)
+            self.assertEqual(translation.context, string_segment.context)
+            self.assertEqual(translation.data, data)
+            self.assertEqual(translation.translation_type, StringTranslation.TRANSLATION_TYPE_MANUAL)
+            self.assertEqual(translation.tool_name, "")
+            self.assertEqual(translation.last_translated_by, self.user)
+            self.assertFalse(translation.has_error)
+
+    def test_edit_string_translations_with_bad_html(self):
+        response = self.edit_string_translations([
+            {'segment_id': self.char_field_segment.id, 'value': 'Un champ de caractères <script>Some nasty JS</script>'},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['translations'][0]['error'], '<script> tag is not allowed. Strings can only contain standard HTML inline tags (such as <b>, <a>)')
+        self.assertTrue(StringTranslation.objects.get().has_error)
+
+    def test_delete_string_translations(self):
+        StringTranslation.objects.create(
+            translation_of=self.char_field_segment.string,
+            context=self.char_field_segment.context,
+            locale=self.fr_locale,
+            data='Not translated!',
+            translation_type=StringTranslation.TRANSLATION_TYPE_MACHINE
+        )
+
+        # Deleting a translation that doesn't exist is still a success
+        response = self.edit_string_translations([
+            {'segment_id': self.char_field_segment.id, 'value': ''},
+            {'segment_id': self.text_field_segment.id, 'value': None},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'translations': [],
+            'deleted': [self.char_field_segment.id, self.text_field_segment.id],
+        })
+        self.assertFalse(StringTranslation.objects.exists())
+
+    def test_last_edit_of_segment_is_used(self):
+        response = self.edit_string_translations([
+            {'segment_id': self.char_field_segment.id, 'value': 'Un champ'},
+            {'segment_id': self.char_field_segment.id, 'value': 'Un champ de caractères'},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([translation['data'] for translation in response.json()['translations']], ['Un champ de caractères'])
+        self.assertEqual(StringTranslation.objects.get().data, 'Un champ de caractères')
+
+    def test_edit_string_translations_resets_progress(self):
+        self.assertEqual(self.page_translation.get_progress(), (10, 0))
+
+        self.edit_string_translations([
+            {'segment_id': self.char_field_segment.id, 'value': 'Un champ de caractères'},
+        ])
+
+        self.assertEqual(Translation.objects.get(id=self.page_translation.id).get_progress(), (10, 1))
+
+    def test_edit_string_translations_with_invalid_data(self):
+        self.assertEqual(self.edit_string_translations('foo').status_code, 400)
+        self.assertEqual(self.edit_string_translations([{'value': 'Un champ'}]).status_code, 400)
+        self.assertEqual(self.edit_string_translations([{'segment_id': self.char_field_segment.id, 'value': 1}]).status_code, 400)
+        self.assertEqual(self.edit_string_translations([{'segment_id': self.char_field_segment.id}]).status_code, 400)
+        self.assertEqual(self.edit_string_translations([{'segment_id': True, 'value': 'Un champ'}]).status_code, 400)
+        self.assertFalse(StringTranslation.objects.exists())
+
+    def test_falsy_values_dont_delete_translations(self):
+        self.edit_string_translations([{'segment_id': self.char_field_segment.id, 'value': 'Un champ'}])
+
+        for value in [0, False, [], {}]:
+            response = self.edit_string_translations([{'segment_id': self.char_field_segment.id, 'value': value}])
+            self.assertEqual(response.status_code, 400)
+
+        self.assertTrue(StringTranslation.objects.exists())
+
+    def test_edit_string_translations_of_another_source(self):
+        string_segment = String.objects.get(data='Test snippet').segments.get()
+
+        response = self.edit_string_translations([
+            {'segment_id': self.char_field_segment.id, 'value': 'Un champ de caractères'},
+            {'segment_id': string_segment.id, 'value': 'Un snippet'},
+        ])
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(StringTranslation.objects.exists())
+
+    def test_cant_edit_translations_without_page_perms(self):
+        self.moderators_group.page_permissions.all().delete()
+
+        response = self.edit_string_translations([
+            {'segment_id': self.char_field_segment.id, 'value': 'Un champ de caractères'},
+        ])
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_cant_edit_translations_without_snippet_perms(self):
+        string_segment = String.objects.get(data='Test snippet').segments.get()
+
+        self.moderators_group.permissions.filter(content_type=ContentType.objects.get_for_model(TestSnippet)).delete()
+
+        response = self.edit_string_translations([
+            {'segment_id': string_segment.id, 'value': 'Un snippet'},
+        ], translation=self.snippet_translation)
+
+        self.assertEqual(response.status_code, 403)
+
+
+@freeze_time('2020-08-21')
+class TestTranslationMemorySuggestionsAPIView(EditTranslationTestData, APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        # Translate a string that is similar to "A char field" in another context
+        self.similar_string = String.from_value(self.page_source.locale, StringValue.from_plaintext("A char fields"))
+        StringTranslation.objects.create(
+            translation_of=self.similar_string,
+            context=TranslationContext.objects.get(path='field'),
+            locale=self.fr_locale,
+            data='Des champs de caractères',
+            translation_type=StringTranslation.TRANSLATION_TYPE_MANUAL
+        )
+
+        self.string = String.objects.get(data='A char field')
+        self.string_segment = self.string.segments.get()
+
+    def get_suggestions(self, **params):
+        return self.client.get(reverse('wagtail_localize:translation_memory_suggestions', args=[self.page_translation.id, self.string_segment.id]), params)
+
+    def test_get_suggestions(self):
+        StringTranslation.objects.create(
+            translation_of=self.string,
+            context=TranslationContext.objects.get(path='field'),
+            locale=self.fr_locale,
+            data='Un champ de caractères',
+            translation_type=StringTranslation.TRANSLATION_TYPE_MACHINE
+        )
+
+        response = self.get_suggestions()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json(), [
+            {
+                'stringId': self.string.id,
+                'source': 'A char field',
+                'similarity': 1.0,
+                'translations': [
+                    {'data': 'Un champ de caractères', 'comment': 'Machine translated on 21 August 2020'},
+                ],
+            },
+            {
+                'stringId': self.similar_string.id,
+                'source': 'A char fields',
+                'similarity': mock.ANY,
+                'translations': [
+                    {'data': 'Des champs de caractères', 'comment': 'Translated manually on 21 August 2020'},
+                ],
+            },
+        ])
+        self.assertGreater(response.json()[1]['similarity'], 0.85)
+
+    def test_get_suggestions_excludes_own_translation(self):
+        StringTranslation.objects.create(
+            translation_of=self.string,
+            context=self.string_segment.context,
+            locale=self.fr_locale,
+            data='Un champ de caractères',
+            translation_type=StringTranslation.TRANSLATION_TYPE_MANUAL
+        )
+
+        response = self.get_suggestions()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([suggestion['stringId'] for suggestion in response.json()], [self.similar_string.id])
+
+    def test_get_suggestions_with_limit_and_min_similarity(self):
+        self.assertEqual(self.get_suggestions(limit=0).json(), [])
+        self.assertEqual(self.get_suggestions(min_similarity=1).json(), [])
+
+    def test_get_suggestions_with_invalid_params(self):
+        self.assertEqual(self.get_suggestions(limit='foo').status_code, 400)
+        self.assertEqual(self.get_suggestions(min_similarity='foo').status_code, 400)
+
+    def test_get_suggestions_for_segment_of_another_source(self):
+        string_segment = String.objects.get(data='Test snippet').segments.get()
+
+        response = self.client.get(reverse('wagtail_localize:translation_memory_suggestions', args=[self.page_translation.id, string_segment.id]), follow=True)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_cant_get_suggestions_without_page_perms(self):
+        self.moderators_group.page_permissions.all().delete()
+
+        self.assertEqual(self.get_suggestions().status_code, 403)
+
+
 class TestDownloadPOFileView(EditTranslationTestData, TestCase):
+    def get_pofile(self, translation):
+        response = self.client.get(reverse('wagtail_localize:download_pofile', args=[translation.id]))
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
     def test_download_pofile_page(self):
+        pofile = self.get_pofile(self.page_translation)
+
+        self.assertIn(f'X-WagtailLocalize-TranslationID: {str(self.page_translation.uuid)}', pofile)
+        self.assertIn('msgctxt "test_charfield"\nmsgid "A char field"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_textfield"\nmsgid "A text field"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_emailfield"\nmsgid "email@example.com"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_slugfield"\nmsgid "a-slug-field"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_urlfield"\nmsgid "https://www.example.com"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_richtextfield"\nmsgid "This is a heading"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_richtextfield"\nmsgid "This is a paragraph. &lt;foo&gt; <b>Bold text</b>"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_richtextfield"\nmsgid "<a id=\\"a1\\">This is a link</a>."\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "test_richtextfield"\nmsgid "Special characters: \'\\"!? セキレイ"\nmsgstr ""', pofile)
+        self.assertIn(f'msgctxt "test_streamfield.{STREAM_BLOCK_ID}"\nmsgid "This is a text block"\nmsgstr ""', pofile)
+
+    def test_download_pofile_is_streamed(self):
         response = self.client.get(reverse('wagtail_localize:download_pofile', args=[self.page_translation.id]))
 
-        self.assertContains(response, f'X-WagtailLocalize-TranslationID: {str(self.page_translation.uuid)}')
-        self.assertContains(response, 'msgctxt "test_charfield"\nmsgid "A char field"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_textfield"\nmsgid "A text field"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_emailfield"\nmsgid "email@example.com"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_slugfield"\nmsgid "a-slug-field"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_urlfield"\nmsgid "https://www.example.com"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_richtextfield"\nmsgid "This is a heading"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_richtextfield"\nmsgid "This is a paragraph. &lt;foo&gt; <b>Bold text</b>"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_richtextfield"\nmsgid "<a id=\\"a1\\">This is a link</a>."\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "test_richtextfield"\nmsgid "Special characters: \'\\"!? セキレイ"\nmsgstr ""')
-        self.assertContains(response, f'msgctxt "test_streamfield.{STREAM_BLOCK_ID}"\nmsgid "This is a text block"\nmsgstr ""')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/x-gettext-translation')
+
+        po = polib.pofile(b''.join(response.streaming_content).decode('utf-8'))
+        self.assertEqual(po.metadata['X-WagtailLocalize-TranslationID'], str(self.page_translation.uuid))
+        self.assertEqual(
+            [(entry.msgctxt, entry.msgid) for entry in po],
+            [(entry.msgctxt, entry.msgid) for entry in self.page_translation.export_po()]
+        )
 
     def test_download_pofile_snippet(self):
-        response = self.client.get(reverse('wagtail_localize:download_pofile', args=[self.snippet_translation.id]))
+        pofile = self.get_pofile(self.snippet_translation)
 
-        self.assertContains(response, f'X-WagtailLocalize-TranslationID: {str(self.snippet_translation.uuid)}')
-        self.assertContains(response, 'msgctxt "field"\nmsgid "Test snippet"\nmsgstr ""')
+        self.assertIn(f'X-WagtailLocalize-TranslationID: {str(self.snippet_translation.uuid)}', pofile)
+        self.assertIn('msgctxt "field"\nmsgid "Test snippet"\nmsgstr ""', pofile)
 
     def test_includes_existing_translations(self):
         string = String.objects.get(data="Test snippet")
@@ -799,8 +1185,8 @@ class TestDownloadPOFileView(EditTranslationTestData, TestCase):
             data="Extrait de test"
         )
 
-        response = self.client.get(reverse('wagtail_localize:download_pofile', args=[self.snippet_translation.id]))
-        self.assertContains(response, 'msgctxt "field"\nmsgid "Test snippet"\nmsgstr "Extrait de test"')
+        pofile = self.get_pofile(self.snippet_translation)
+        self.assertIn('msgctxt "field"\nmsgid "Test snippet"\nmsgstr "Extrait de test"', pofile)
 
     def test_includes_obsolete_translations(self):
         string = String.objects.create(locale=Locale.objects.get(language_code="en"), data="A string that is no longer used on the snippet")
@@ -812,10 +1198,10 @@ class TestDownloadPOFileView(EditTranslationTestData, TestCase):
             data="Une chaîne qui n'est plus utilisée sur l'extrait"
         )
 
-        response = self.client.get(reverse('wagtail_localize:download_pofile', args=[self.snippet_translation.id]))
+        pofile = self.get_pofile(self.snippet_translation)
 
-        self.assertContains(response, 'msgctxt "field"\nmsgid "Test snippet"\nmsgstr ""')
-        self.assertContains(response, 'msgctxt "field"\n#~ msgid "A string that is no longer used on the snippet"\n#~ msgstr "Une chaîne qui n\'est plus utilisée sur l\'extrait"')
+        self.assertIn('msgctxt "field"\nmsgid "Test snippet"\nmsgstr ""', pofile)
+        self.assertIn('msgctxt "field"\n#~ msgid "A string that is no longer used on the snippet"\n#~ msgstr "Une chaîne qui n\'est plus utilisée sur l\'extrait"', pofile)
 
     def test_cant_download_pofile_without_page_perms(self):
         self.moderators_group.page_permissions.all().delete()
@@ -1225,6 +1611,35 @@ class TestMachineTranslateView(EditTranslationTestData, TestCase):
         self.assertEqual(translation.tool_name, "Dummy translator")
         self.assertEqual(translation.last_translated_by, self.user)
 
+    def test_machine_translate_uses_cached_machine_translations(self):
+        MachineTranslation.objects.create(
+            translator='wagtail_localize.machine_translators.dummy.DummyTranslator',
+            source_language='en',
+            target_language='fr',
+            data_hash=String.get_data_hash('Test snippet'),
+            data='Extrait de test',
+        )
+
+        response = self.client.post(reverse('wagtail_localize:machine_translate', args=[self.snippet_translation.id]), {
+            'next': reverse('wagtailsnippets:edit', args=[TestSnippet._meta.app_label, TestSnippet._meta.model_name, self.fr_snippet.id]),
+        })
+
+        self.assertRedirects(response, reverse('wagtailsnippets:edit', args=[TestSnippet._meta.app_label, TestSnippet._meta.model_name, self.fr_snippet.id]))
+
+        translation = StringTranslation.objects.get(
+            translation_of__data='Test snippet',
+            context__path='field',
+            locale=self.fr_locale,
+        )
+
+        self.assertEqual(translation.data, 'Extrait de test')
+        self.assertEqual(translation.translation_type, StringTranslation.TRANSLATION_TYPE_MACHINE)
+
+    def test_machine_translate_caches_translations(self):
+        self.client.post(reverse('wagtail_localize:machine_translate', args=[self.page_translation.id]))
+
+        self.assertTrue(MachineTranslation.objects.filter(data_hash=String.get_data_hash('A char field'), data='field char A').exists())
+
     def test_machine_translate_page_without_next_url(self):
         # You should always call this view with a next URL. But if you forget, it should redirect to the dashboard.
 
@@ -1,8 +1,20 @@
+from django.apps import apps
 from django.test import TestCase
 
-from wagtail_localize.fields import get_translatable_fields, SynchronizedField, TranslatableField
+from wagtail_localize.fields import (
+    FIELD_KIND_CHILD_RELATION,
+    FIELD_KIND_FOREIGN_KEY,
+    FIELD_KIND_RICH_TEXT,
+    FIELD_KIND_STREAM,
+    FIELD_KIND_TEXT,
+    get_resolved_field,
+    get_resolved_translatable_fields,
+    get_translatable_fields,
+    SynchronizedField,
+    TranslatableField,
+)
 
-from wagtail_localize.test.models import TestGenerateTranslatableFieldsPage
+from wagtail_localize.test.models import TestGenerateTranslatableFieldsPage, TestPage
 
 
 class TestGetTranslatableFields(TestCase):
@@ -29,3 +41,43 @@ class TestGetTranslatableFields(TestCase):
             TranslatableField('test_translatable_childobjects'),
             SynchronizedField('test_nontranslatable_childobjects'),
         ])
+
+    def test_computed_once(self):
+        self.assertIs(get_translatable_fields(TestGenerateTranslatableFieldsPage), get_translatable_fields(TestGenerateTranslatableFieldsPage))
+
+    def test_recomputed_after_app_registry_reload(self):
+        translatable_fields = get_translatable_fields(TestGenerateTranslatableFieldsPage)
+
+        apps.clear_cache()
+
+        self.assertIsNot(get_translatable_fields(TestGenerateTranslatableFieldsPage), translatable_fields)
+        self.assertEqual(get_translatable_fields(TestGenerateTranslatableFieldsPage), translatable_fields)
+
+    def test_explicit_translatable_fields(self):
+        self.assertIs(get_translatable_fields(TestPage), TestPage.translatable_fields)
+
+
+class TestGetResolvedTranslatableFields(TestCase):
+    def test_resolved_fields(self):
+        resolved_fields = {
+            resolved_field.field.name: resolved_field
+            for resolved_field in get_resolved_translatable_fields(TestGenerateTranslatableFieldsPage)
+        }
+
+        self.assertEqual(resolved_fields['test_charfield'].translatable_field, TranslatableField('test_charfield'))
+        self.assertEqual(resolved_fields['test_charfield'].field, TestGenerateTranslatableFieldsPage._meta.get_field('test_charfield'))
+
+        self.assertEqual(resolved_fields['test_charfield'].kind, FIELD_KIND_TEXT)
+        self.assertEqual(resolved_fields['test_richtextfield'].kind, FIELD_KIND_RICH_TEXT)
+        self.assertEqual(resolved_fields['test_streamfield'].kind, FIELD_KIND_STREAM)
+        self.assertEqual(resolved_fields['test_snippet'].kind, FIELD_KIND_FOREIGN_KEY)
+        self.assertEqual(resolved_fields['test_translatable_childobjects'].kind, FIELD_KIND_CHILD_RELATION)
+        self.assertIsNone(resolved_fields['show_in_menus'].kind)
+
+    def test_get_resolved_field_not_translatable(self):
+        # Fields that aren't translatable are still resolved
+        resolved_field = get_resolved_field(TestPage, 'title')
+
+        self.assertIsNone(resolved_field.translatable_field)
+        self.assertEqual(resolved_field.field, TestPage._meta.get_field('title'))
+        self.assertEqual(resolved_field.kind, FIELD_KIND_TEXT)
@@ -1,6 +1,11 @@
-from django.test import TestCase
+import uuid
 
-from wagtail_localize.strings import StringValue, extract_strings, restore_strings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from wagtail_localize.strings import (
+    StringValue, TemplateCache, extract_strings, render_tokenized_template, restore_strings, tokenize_template,
+    validate_translated_html)
 
 
 class TestStringValueFromSourceHTML(TestCase):
@@ -76,6 +81,52 @@ class TestStringValueFromTranslatedHTML(TestCase):
         self.assertEqual(e.exception.args, ("Strings cannot have any HTML tags with attributes (except for 'id' in <a> tags)",))
 
 
+class TestValidateTranslatedHTML(TestCase):
+    def test_validation(self):
+        # All of these should be allowed
+        validate_translated_html("Foo bar baz")
+        validate_translated_html("This is a paragraph. <b>This is some bold <i>and now italic</i></b> text")
+        validate_translated_html("&lt;script&gt; this should be interpreted as text.")
+        validate_translated_html("Foo<br/>bar<br/>baz")
+        validate_translated_html('<a id="1">staple food</a>')
+        validate_translated_html("1 < 2 <!-- comment -->")
+
+    def test_block_tags_not_allowed(self):
+        with self.assertRaises(ValueError) as e:
+            validate_translated_html("<p>Foo bar baz</p>")
+
+        self.assertEqual(e.exception.args, ('<p> tag is not allowed. Strings can only contain standard HTML inline tags (such as <b>, <a>)',))
+
+        with self.assertRaises(ValueError) as e:
+            validate_translated_html("<img/>")
+
+        self.assertEqual(e.exception.args, ('<img> tag is not allowed. Strings can only contain standard HTML inline tags (such as <b>, <a>)',))
+
+    def test_attributes_not_allowed(self):
+        with self.assertRaises(ValueError) as e:
+            validate_translated_html('<a href="https://en.wikipedia.org/wiki/Staple_food">staple food</a>')
+
+        self.assertEqual(e.exception.args, ("Strings cannot have any HTML tags with attributes (except for 'id' in <a> tags)",))
+
+    def test_same_result_as_from_translated_html(self):
+        def get_error(validate, html):
+            try:
+                validate(html)
+            except ValueError as e:
+                return e.args
+
+        for html in [
+            '<b>Foo <p>bar</p></b><div>baz</div>',
+            '<b id="b1">Foo</b> <p>bar</p>',
+            '<br>Foo</br><script>alert("bar")</script>',
+            '<B><A ID="a1">Foo</A></B>',
+            '<a id="a1" href="/">Foo',
+            '<b><i>Foo</b></i>',
+        ]:
+            with self.subTest(html=html):
+                self.assertEqual(get_error(validate_translated_html, html), get_error(StringValue.from_translated_html, html))
+
+
 class TestStringValueFromPlaintext(TestCase):
     def test_string_from_plaintext(self):
         string = StringValue.from_plaintext(
@@ -126,6 +177,15 @@ class TestRenderHTML(TestCase):
             '<b>Bread</b> is a <a href="https://en.wikipedia.org/wiki/Dough">dough</a> prepared from a <a href="https://en.wikipedia.org/wiki/Staple_food">staple food</a> of <a href="https://en.wikipedia.org/wiki/Flour">flour</a> and <a href="https://en.wikipedia.org/wiki/Water">water</a>',
         )
 
+    def test_render_html_not_normalised(self):
+        # HTML that hasn't been normalised by BeautifulSoup is rendered the same way as the normalised version
+        string = StringValue("<b>Bread</b>  <a id='a1'>dough<br>")
+
+        self.assertEqual(
+            string.render_html({'a1': {'href': 'https://en.wikipedia.org/wiki/Dough', 'class': ['one', 'two']}}),
+            '<b>Bread</b> <a class="one two" href="https://en.wikipedia.org/wiki/Dough">dough<br/></a>',
+        )
+
 
 class TestStringRenderText(TestCase):
     def test_string_render_text(self):
@@ -261,6 +321,14 @@ class TextExtractStrings(TestCase):
         self.assertEqual(strings, [StringValue.from_source_html("Foo")])
 
 
+@override_settings(WAGTAILLOCALIZE_STRINGS_PARSER='tokenizer')
+class TextExtractStringsTokenizer(TextExtractStrings):
+    """
+    Runs the extract_strings tests against the tokenizer implementation.
+    """
+    pass
+
+
 class TestRestoreStrings(TestCase):
     def test_restore_strings(self):
         html = restore_strings(
@@ -316,3 +384,71 @@ class TestRestoreStrings(TestCase):
             """,
             html,
         )
+
+
+class TestTokenizeTemplate(TestCase):
+    def test_tokenize_template(self):
+        parts = tokenize_template('<h1><text position="0"></text></h1><p class="intro"><text position="1"></text> <img src="foo"></p>')
+
+        self.assertEqual(parts, ('<h1>', 0, '</h1><p class="intro">', 1, ' <img src="foo"/></p>'))
+
+    def test_render_tokenized_template(self):
+        parts = tokenize_template('<h1><text position="0"></text></h1><p><text position="1"></text></p>')
+
+        html = render_tokenized_template(parts, [
+            StringValue.from_source_html("Foo &amp; bar"),
+            StringValue.from_source_html('<a href="https://example.com">Baz</a>'),
+        ])
+
+        self.assertEqual(html, '<h1>Foo &amp; bar</h1><p><a href="https://example.com">Baz</a></p>')
+
+
+class TestTemplateCache(TestCase):
+    def setUp(self):
+        self.template_cache = TemplateCache()
+        self.template = '<p><text position="0"></text></p>'
+
+    def test_get(self):
+        template_uuid = uuid.uuid4()
+
+        self.assertEqual(self.template_cache.get(template_uuid, self.template), ('<p>', 0, '</p>'))
+        self.assertEqual(self.template_cache.get(template_uuid, self.template), ('<p>', 0, '</p>'))
+
+        self.assertEqual(self.template_cache.hits, 1)
+        self.assertEqual(self.template_cache.misses, 1)
+
+    @override_settings(WAGTAILLOCALIZE_TEMPLATE_CACHE={'MAX_SIZE': 2})
+    def test_lru_eviction(self):
+        uuids = [uuid.uuid4() for i in range(3)]
+
+        self.template_cache.get(uuids[0], self.template)
+        self.template_cache.get(uuids[1], self.template)
+
+        # Use the first template again so the second one is the least recently used
+        self.template_cache.get(uuids[0], self.template)
+        self.template_cache.get(uuids[2], self.template)
+
+        self.assertEqual(list(self.template_cache.templates.keys()), [uuids[0], uuids[2]])
+        self.assertEqual(self.template_cache.hits, 1)
+        self.assertEqual(self.template_cache.misses, 3)
+
+    @override_settings(WAGTAILLOCALIZE_TEMPLATE_CACHE={'BACKEND': 'default'})
+    def test_backend(self):
+        template_uuid = uuid.uuid4()
+        self.template_cache.get(template_uuid, self.template)
+
+        self.assertEqual(cache.get('wagtail_localize:template:{}'.format(template_uuid)), ('<p>', 0, '</p>'))
+
+        # Another process would find the template in the Django cache
+        other_template_cache = TemplateCache()
+        self.assertEqual(other_template_cache.get(template_uuid, self.template), ('<p>', 0, '</p>'))
+        self.assertEqual(other_template_cache.hits, 1)
+        self.assertEqual(other_template_cache.misses, 0)
+
+    def test_clear(self):
+        self.template_cache.get(uuid.uuid4(), self.template)
+        self.template_cache.clear()
+
+        self.assertEqual(len(self.template_cache.templates), 0)
+        self.assertEqual(self.template_cache.hits, 0)
+        self.assertEqual(self.template_cache.misses, 0)
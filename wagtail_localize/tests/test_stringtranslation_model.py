@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.test import TestCase
+from wagtail.core.models import Locale
+
+from wagtail_localize.models import String, StringTranslation
+from wagtail_localize.strings import StringValue
+
+
+class TestStringTranslationValidation(TestCase):
+    def setUp(self):
+        self.fr_locale = Locale.objects.create(language_code="fr")
+        self.string = String.from_value(Locale.objects.get(language_code="en"), StringValue("Test content"))
+
+    def test_save_valid_html(self):
+        with self.assertNumQueries(1):
+            string_translation = StringTranslation.objects.create(
+                translation_of=self.string,
+                locale=self.fr_locale,
+                data="<b>Contenu</b> de test",
+            )
+
+        string_translation.refresh_from_db()
+        self.assertFalse(string_translation.has_error)
+        self.assertEqual(string_translation.html_error, "")
+        self.assertIsNone(string_translation.get_error())
+
+    def test_save_invalid_html(self):
+        # The error is found before the translation is saved, so it's only written once
+        with self.assertNumQueries(1):
+            string_translation = StringTranslation.objects.create(
+                translation_of=self.string,
+                locale=self.fr_locale,
+                data="<p>Contenu de test</p>",
+            )
+
+        string_translation.refresh_from_db()
+        self.assertTrue(string_translation.has_error)
+        # The error is stored in a form that doesn't depend on the active language
+        self.assertEqual(string_translation.html_error, "tag_not_allowed:p")
+
+        # The stored error is used, so the HTML isn't parsed again
+        with mock.patch('wagtail_localize.models.validate_translated_html') as validate_translated_html:
+            self.assertEqual(string_translation.get_error(), "<p> tag is not allowed. Strings can only contain standard HTML inline tags (such as <b>, <a>)")
+
+        validate_translated_html.assert_not_called()
+
+    def test_error_is_translated_when_displayed(self):
+        string_translation = StringTranslation.objects.create(
+            translation_of=self.string,
+            locale=self.fr_locale,
+            data="<p>Contenu de test</p>",
+        )
+
+        with mock.patch('wagtail_localize.strings._', side_effect=lambda message: message.upper()):
+            self.assertEqual(string_translation.get_error(), "<p> TAG IS NOT ALLOWED. STRINGS CAN ONLY CONTAIN STANDARD HTML INLINE TAGS (SUCH AS <B>, <A>)")
+
+    def test_save_with_update_fields(self):
+        string_translation = StringTranslation.objects.create(
+            translation_of=self.string,
+            locale=self.fr_locale,
+            data="Contenu de test",
+        )
+
+        string_translation.data = "<p>Contenu de test</p>"
+        with self.assertNumQueries(1):
+            string_translation.save(update_fields=['data'])
+
+        string_translation.refresh_from_db()
+        self.assertTrue(string_translation.has_error)
+        self.assertTrue(string_translation.html_error)
+
+    def test_save_without_updating_data_doesnt_validate(self):
+        string_translation = StringTranslation.objects.create(
+            translation_of=self.string,
+            locale=self.fr_locale,
+            data="Contenu de test",
+        )
+
+        with mock.patch('wagtail_localize.models.validate_translated_html') as validate_translated_html:
+            string_translation.save(update_fields=['tool_name'])
+
+        validate_translated_html.assert_not_called()
@@ -1,12 +1,13 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from wagtail.core.models import Page, Locale
 from wagtail.tests.utils import WagtailTestUtils
 
-from wagtail_localize.models import Translation, TranslationSource
+from wagtail_localize.models import String, StringTranslation, Translation, TranslationContext, TranslationJob, TranslationSource
 from wagtail_localize.test.models import TestPage, TestSnippet, NonTranslatableSnippet
 
 from .utils import assert_permission_denied
@@ -231,6 +232,40 @@ class TestSubmitPageTranslation(TestCase, WagtailTestUtils):
         translated_page = self.en_blog_index.get_translation(self.fr_locale)
         self.assertTrue(translated_page.live)
 
+    def test_post_submit_page_translation_uses_translation_memory(self):
+        first_page = make_test_page(self.en_homepage, title="First page", slug="first-page", test_charfield="Read more")
+        second_page = make_test_page(self.en_homepage, title="Second page", slug="second-page", test_charfield="Read more")
+
+        self.client.post(
+            reverse("wagtail_localize:submit_page_translation", args=[first_page.id]),
+            {"locales": [self.fr_locale.id]},
+        )
+
+        first_page_source = TranslationSource.objects.get(object_id=first_page.translation_key)
+        StringTranslation.objects.create(
+            translation_of=String.objects.get(data="Read more"),
+            context=TranslationContext.objects.get(object_id=first_page.translation_key, path="test_charfield"),
+            locale=self.fr_locale,
+            data="Lire la suite",
+        )
+        self.assertEqual(first_page_source.translations.get().get_progress()[1], 1)
+
+        self.client.post(
+            reverse("wagtail_localize:submit_page_translation", args=[second_page.id]),
+            {"locales": [self.fr_locale.id]},
+        )
+
+        # The translation of the string on the first page is reused for the second page
+        string_translation = StringTranslation.objects.get(
+            context__object_id=second_page.translation_key,
+            context__path="test_charfield",
+            locale=self.fr_locale,
+        )
+        self.assertEqual(string_translation.data, "Lire la suite")
+        self.assertEqual(string_translation.translation_type, StringTranslation.TRANSLATION_TYPE_MEMORY)
+
+        self.assertEqual(second_page.get_translation(self.fr_locale).specific.test_charfield, "Lire la suite")
+
     def test_post_submit_page_translation_submits_linked_snippets(self):
         self.en_blog_index.test_snippet = TestSnippet.objects.create(field="My test snippet")
         self.en_blog_index.save()
@@ -304,9 +339,23 @@ class TestSubmitPageTranslation(TestCase, WagtailTestUtils):
             response, reverse("wagtailadmin_explore", args=[self.en_homepage.id])
         )
 
-        # Check multiple translations were created
+        # The page itself is translated straight away and the subtree is submitted as a job
+        self.assertEqual(Translation.objects.count(), 1)
+        job = TranslationJob.objects.get()
+        self.assertEqual(list(job.target_locales.all()), [self.fr_locale])
+        self.assertEqual(
+            [item.object_id for item in job.items.order_by('sort_order')],
+            [self.en_blog_post.translation_key, self.en_blog_post_child.translation_key]
+        )
+
+        # Check multiple translations were created when the job is processed
+        call_command('process_translation_jobs', once=True, verbosity=0)
         self.assertEqual(Translation.objects.count(), 3)
 
+        job.refresh_from_db()
+        self.assertEqual(job.status, TranslationJob.STATUS_COMPLETED)
+        self.assertTrue(self.en_blog_post_child.has_translation(self.fr_locale))
+
     def test_post_submit_page_translation_with_untranslated_parent(self):
         response = self.client.post(
             reverse(
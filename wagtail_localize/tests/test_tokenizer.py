@@ -0,0 +1,100 @@
+from django.test import TestCase
+
+from wagtail_localize.strings import HTMLValidationError, extract_strings_beautifulsoup
+from wagtail_localize.tokenizer import UnsupportedHTML, extract_strings, restore_attrs
+
+
+class TestTokenizerExtractStrings(TestCase):
+    def assertSameAsReference(self, html):
+        template, strings = extract_strings(html)
+        expected_template, expected_strings = extract_strings_beautifulsoup(html)
+
+        self.assertEqual(template, expected_template)
+        self.assertEqual(
+            [(string.data, attrs) for string, attrs in strings],
+            [(string.data, attrs) for string, attrs in expected_strings],
+        )
+
+    def test_same_as_reference(self):
+        corpus = [
+            '',
+            'Plain text',
+            '   \n  ',
+            '<p>Foo <b>bar</b> baz</p>',
+            '<h1>Foo</h1>\n<p>\n    Bar\n    <ul>\n        <li><b>Baz</b></li>\n    </ul>\n</p>',
+            '<p><b>Foo <p>Bar</p> Baz</b> Quux</p>',
+            '<p>Foo <a href="https://example.com/?a=1&amp;b=2" id="x">bar</a> <a href="/baz">baz</a></p>',
+            '<p><i class="one  two">Foo</i></p>',
+            '<p><br/>Foo<br>bar<br></br></p>',
+            '<p>Foo <b></b> <i> </i></p>',
+            '<p>&lt;script&gt; &amp; &nbsp;&#147;&#x41;&foo;</p>',
+            '<p>Foo\xa0<b>bar</b>\xa0</p>',
+            '<pre>  Foo\n   <b> </b>\n</pre>',
+            '<div data-a=\'"quoted"\' data-b="it\'s &quot;both&quot;">Foo</div>',
+            '<p x=1 x=2 y>Foo</p><hr><img src="foo.png" alt="Foo">Bar',
+            '<embed embedtype="image" format="left" id="1"/><p>Foo</p>',
+            '<p>Unclosed <b>bold <i>italic</p> text',
+            '</p>Stray end tag<p>',
+        ]
+
+        for html in corpus:
+            with self.subTest(html=html):
+                self.assertSameAsReference(html)
+
+    def test_validation_errors_same_as_reference(self):
+        for html in ['<p><b class="foo">Foo</b> bar</p>', '<p><b class="foo">Foo</b> <a href="#">bar</a></p>']:
+            with self.subTest(html=html):
+                with self.assertRaises(HTMLValidationError) as reference:
+                    extract_strings_beautifulsoup(html)
+
+                with self.assertRaises(HTMLValidationError) as e:
+                    extract_strings(html)
+
+                self.assertEqual(e.exception.error_key, reference.exception.error_key)
+                self.assertEqual(e.exception.args, reference.exception.args)
+
+    def test_unsupported_html(self):
+        for html in [
+            '<p>Foo<!-- comment --></p>',
+            '<!DOCTYPE html><p>Foo</p>',
+            '<script>alert("Foo")</script>',
+            '<p><text position="0"></text></p>',
+            '<p><br>Foo<br/>bar</p>',
+        ]:
+            with self.subTest(html=html):
+                with self.assertRaises(UnsupportedHTML):
+                    extract_strings(html)
+
+
+class TestRestoreAttrs(TestCase):
+    def test_restore_attrs(self):
+        html = restore_attrs(
+            'Foo <b>bar</b> &amp; <a id="a1">baz</a><br/>\n<a id="a2">quux</a>',
+            {
+                'a1': {'href': 'https://example.com/?foo=1&bar=2'},
+                'a2': {'href': '#', 'title': 'It\'s "quoted"'},
+            }
+        )
+
+        self.assertEqual(html, 'Foo <b>bar</b> &amp; <a href="https://example.com/?foo=1&amp;bar=2">baz</a><br/>\n<a href="#" title="It\'s &quot;quoted&quot;">quux</a>')
+
+    def test_missing_id(self):
+        with self.assertRaises(KeyError):
+            restore_attrs('<a id="a1">Foo</a>', {})
+
+    def test_not_normalised(self):
+        for html in [
+            '<br>',
+            '<b/>',
+            '<b>Foo',
+            '<b>Foo</i>',
+            '<a href="#">Foo</a>',
+            "<a id='a1'>Foo</a>",
+            '<p>Foo</p>',
+            'Foo &nbsp; bar',
+            'Foo > bar',
+            '<b>Foo</b>  <i>bar</i>',
+        ]:
+            with self.subTest(html=html):
+                with self.assertRaises(UnsupportedHTML):
+                    restore_attrs(html, {'a1': {}})
@@ -0,0 +1,208 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from wagtail.core.models import Locale, Page
+from wagtail.tests.utils import WagtailTestUtils
+
+from wagtail_localize.models import Translation, TranslationJob, TranslationJobItem
+from wagtail_localize.operations import get_source_instances, process_translation_job_items
+from wagtail_localize.test.models import TestPage
+
+
+def make_test_page(parent, **kwargs):
+    kwargs.setdefault("title", "Test page")
+    return parent.add_child(instance=TestPage(**kwargs))
+
+
+class TestTranslationJob(TestCase, WagtailTestUtils):
+    def setUp(self):
+        self.user = self.login()
+
+        self.en_locale = Locale.objects.get()
+        self.fr_locale = Locale.objects.create(language_code="fr")
+        self.de_locale = Locale.objects.create(language_code="de")
+
+        self.en_homepage = Page.objects.get(depth=2)
+        self.en_blog_index = make_test_page(self.en_homepage, title="Blog", slug="blog")
+        self.en_blog_posts = [
+            make_test_page(self.en_blog_index, title=f"Blog post {i}", slug=f"blog-post-{i}")
+            for i in range(3)
+        ]
+
+        self.job = TranslationJob.objects.create_for_instances(
+            [self.en_blog_index] + self.en_blog_posts, [self.fr_locale, self.de_locale], user=self.user
+        )
+
+    def test_create_for_instances(self):
+        self.assertEqual(self.job.source_locale, self.en_locale)
+        self.assertEqual(self.job.status, TranslationJob.STATUS_PENDING)
+        self.assertEqual(self.job.created_by, self.user)
+        self.assertEqual(set(self.job.target_locales.all()), {self.fr_locale, self.de_locale})
+        self.assertEqual(
+            [item.object_id for item in self.job.items.order_by('sort_order')],
+            [page.translation_key for page in [self.en_blog_index] + self.en_blog_posts]
+        )
+        self.assertEqual(self.job.get_progress(), (4, 0, 0))
+
+    def test_create_for_instances_sets_parent_object(self):
+        items = list(self.job.items.order_by('sort_order'))
+
+        self.assertIsNone(items[0].parent_object_id)
+        self.assertEqual([item.parent_object_id for item in items[1:]], [self.en_blog_index.translation_key] * 3)
+
+    def test_process_in_chunks(self):
+        # The blog posts can't be claimed until the blog index has been processed
+        self.assertEqual(process_translation_job_items(2), 1)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, TranslationJob.STATUS_IN_PROGRESS)
+        self.assertIsNotNone(self.job.started_at)
+        self.assertEqual(self.job.get_progress(), (4, 1, 0))
+        self.assertTrue(self.en_blog_index.has_translation(self.fr_locale))
+        self.assertFalse(self.en_blog_posts[0].has_translation(self.fr_locale))
+
+        self.assertEqual(process_translation_job_items(2), 2)
+        self.assertTrue(self.en_blog_posts[0].has_translation(self.fr_locale))
+        self.assertFalse(self.en_blog_posts[2].has_translation(self.fr_locale))
+
+        self.assertEqual(process_translation_job_items(2), 1)
+        self.assertEqual(process_translation_job_items(2), 0)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, TranslationJob.STATUS_COMPLETED)
+        self.assertIsNotNone(self.job.completed_at)
+        self.assertEqual(Translation.objects.count(), 8)
+
+    def test_get_source_instances(self):
+        items = list(self.job.items.select_related('job', 'object__content_type').order_by('sort_order'))
+
+        # One query for the pages and one for the specific page type, no matter how many pages there are
+        with self.assertNumQueries(2):
+            instances = get_source_instances(items)
+
+        self.assertEqual([instances[item.id] for item in items], [self.en_blog_index] + self.en_blog_posts)
+        self.assertIsInstance(instances[items[0].id], TestPage)
+
+    def test_source_deleted(self):
+        self.en_blog_posts[2].delete()
+
+        with self.assertLogs('wagtail_localize.operations', level='ERROR'):
+            process_translation_job_items(4)
+            process_translation_job_items(4)
+
+        item = self.job.items.get(sort_order=3)
+        self.assertEqual(item.status, TranslationJobItem.STATUS_PENDING)
+        self.assertEqual(item.last_error, "DoesNotExist: Page matching query does not exist.")
+
+    def test_retries(self):
+        with mock.patch('wagtail_localize.operations.TranslationCreator.create_translations', side_effect=ValueError("Something went wrong")):
+            with self.assertLogs('wagtail_localize.operations', level='ERROR'):
+                process_translation_job_items(1)
+
+        item = self.job.items.get(sort_order=0)
+        self.assertEqual(item.status, TranslationJobItem.STATUS_PENDING)
+        self.assertEqual(item.attempts, 1)
+        self.assertEqual(item.last_error, "ValueError: Something went wrong")
+        self.assertGreater(item.run_after, timezone.now())
+
+        # The item isn't retried until the delay has passed
+        self.assertNotIn(item, TranslationJobItem.objects.ready())
+
+        TranslationJobItem.objects.filter(id=item.id).update(run_after=timezone.now())
+        process_translation_job_items(1)
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, TranslationJobItem.STATUS_COMPLETED)
+        self.assertEqual(item.attempts, 2)
+        self.assertEqual(item.last_error, "")
+
+    def test_children_arent_ready_until_parent_is_completed(self):
+        parent_item = self.job.items.get(sort_order=0)
+
+        self.assertEqual(list(TranslationJobItem.objects.ready()), [parent_item])
+
+        # Another worker can't claim the children while the parent is being processed
+        self.assertEqual(list(TranslationJobItem.objects.claim(10)), [parent_item])
+        self.assertEqual(list(TranslationJobItem.objects.claim(10)), [])
+
+        parent_item.refresh_from_db()
+        parent_item.mark_completed()
+        self.assertEqual(TranslationJobItem.objects.ready().count(), 3)
+
+    def test_children_are_skipped_if_parent_fails(self):
+        parent_item = self.job.items.get(sort_order=0)
+
+        for i in range(TranslationJobItem.MAX_ATTEMPTS):
+            parent_item.mark_failed("Error")
+
+        self.assertEqual(
+            [(item.status, item.attempts) for item in self.job.items.exclude(id=parent_item.id)],
+            [(TranslationJobItem.STATUS_SKIPPED, 0)] * 3
+        )
+        self.assertEqual(process_translation_job_items(10), 0)
+
+        self.job.update_status()
+        self.assertEqual(self.job.status, TranslationJob.STATUS_FAILED)
+        self.assertEqual(self.job.get_progress(), (4, 0, 4))
+
+    def test_fails_after_max_attempts(self):
+        item = self.job.items.get(sort_order=3)
+
+        for i in range(TranslationJobItem.MAX_ATTEMPTS):
+            item.mark_failed("Error")
+
+        self.assertEqual(item.status, TranslationJobItem.STATUS_FAILED)
+        self.assertNotIn(item, TranslationJobItem.objects.ready())
+
+        while process_translation_job_items(10):
+            pass
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, TranslationJob.STATUS_FAILED)
+        self.assertEqual(self.job.get_progress(), (4, 3, 1))
+
+    def test_reclaims_items_from_stopped_workers(self):
+        items = list(TranslationJobItem.objects.claim(1))
+        self.assertEqual(items[0].status, TranslationJobItem.STATUS_IN_PROGRESS)
+        self.assertNotIn(items[0], TranslationJobItem.objects.ready())
+
+        TranslationJobItem.objects.filter(id=items[0].id).update(
+            claimed_at=timezone.now() - TranslationJobItem.CLAIM_TIMEOUT - timedelta(seconds=1)
+        )
+        self.assertIn(items[0], TranslationJobItem.objects.ready())
+
+    def test_status_page(self):
+        item = self.job.items.get(sort_order=1)
+        for i in range(TranslationJobItem.MAX_ATTEMPTS):
+            item.mark_failed("ValueError: Something went wrong")
+
+        response = self.client.get(reverse("wagtail_localize:translation_job", args=[self.job.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total'], 4)
+        self.assertEqual(response.context['failed'], 1)
+        self.assertEqual(response.context['failed_items'][0]['object'], self.en_blog_posts[0].page_ptr)
+        self.assertContains(response, "ValueError: Something went wrong")
+
+    def test_status_page_with_skipped_items(self):
+        item = self.job.items.get(sort_order=0)
+        for i in range(TranslationJobItem.MAX_ATTEMPTS):
+            item.mark_failed("ValueError: Something went wrong")
+
+        response = self.client.get(reverse("wagtail_localize:translation_job", args=[self.job.id]))
+
+        self.assertEqual(response.context['failed'], 4)
+        self.assertContains(response, "Skipped because its parent page couldn't be submitted", count=3)
+
+    def test_status_page_without_permissions(self):
+        user = get_user_model().objects.get()
+        user.is_superuser = False
+        user.save()
+
+        response = self.client.get(reverse("wagtail_localize:translation_job", args=[self.job.id]))
+
+        self.assertEqual(response.status_code, 302)
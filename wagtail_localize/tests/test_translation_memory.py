@@ -0,0 +1,96 @@
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from wagtail.core.models import Locale
+
+from wagtail_localize.models import String, StringMinHash
+from wagtail_localize.strings import StringValue
+from wagtail_localize.translation_memory import NUM_BANDS, get_band_hashes, get_shingles, get_similarity
+
+
+class TestBandHashes(SimpleTestCase):
+    def test_get_shingles(self):
+        self.assertEqual(get_shingles("Read  More"), {"rea", "ead", "ad ", "d m", " mo", "mor", "ore"})
+        self.assertEqual(get_shingles("Go"), {"go"})
+        self.assertEqual(get_shingles(""), {""})
+
+    def test_get_band_hashes(self):
+        band_hashes = get_band_hashes("This is a test")
+
+        self.assertEqual(len(band_hashes), NUM_BANDS)
+        for band_hash in band_hashes:
+            self.assertTrue(-2 ** 63 <= band_hash < 2 ** 63)
+
+        # Normalised text gets the same hashes
+        self.assertEqual(get_band_hashes("  this IS a\ntest "), band_hashes)
+
+    def test_similar_strings_share_band_hashes(self):
+        self.assertTrue(set(get_band_hashes("Read more about our services and products")) & set(get_band_hashes("Read more about our services and prices")))
+
+    def test_different_strings_dont_share_band_hashes(self):
+        self.assertFalse(set(get_band_hashes("Read more about our services")) & set(get_band_hashes("Contact us today")))
+
+    def test_get_similarity(self):
+        self.assertEqual(get_similarity("Read more", "read  MORE"), 1)
+        self.assertGreater(get_similarity("Read more about us", "Read more about it"), 0.85)
+        self.assertLess(get_similarity("Read more", "Contact us"), 0.5)
+
+
+class TestFindSimilar(TestCase):
+    def setUp(self):
+        self.en_locale = Locale.objects.get(language_code="en")
+        self.fr_locale = Locale.objects.create(language_code="fr")
+
+        self.string = String.from_value(self.en_locale, StringValue("Read more about our services and products"))
+        self.similar_string = String.from_value(self.en_locale, StringValue("Read more about our services and prices"))
+        self.different_string = String.from_value(self.en_locale, StringValue("Contact us today"))
+
+    def test_strings_are_indexed(self):
+        self.assertEqual(StringMinHash.objects.filter(string=self.string).count(), len(set(get_band_hashes(self.string.data))))
+        self.assertEqual(StringMinHash.objects.filter(string=self.string).first().locale, self.en_locale)
+
+    def test_strings_created_in_bulk_are_indexed(self):
+        string_ids = String.objects.get_or_create_for_values(self.en_locale, [StringValue("First string"), StringValue("Second string")])
+
+        for string_id in string_ids.values():
+            self.assertTrue(StringMinHash.objects.filter(string_id=string_id).exists())
+
+    def test_find_similar(self):
+        matches = String.objects.find_similar(self.en_locale, "Read more about our services and products")
+
+        self.assertEqual(matches[0], (self.string, 1))
+        self.assertEqual(matches[1][0], self.similar_string)
+        self.assertGreater(matches[1][1], 0.85)
+        self.assertEqual(len(matches), 2)
+
+    def test_find_similar_with_limit(self):
+        matches = String.objects.find_similar(self.en_locale, "Read more about our services and products", limit=1)
+
+        self.assertEqual(matches, [(self.string, 1)])
+
+    def test_find_similar_with_min_similarity(self):
+        matches = String.objects.find_similar(self.en_locale, "Read more about our services and prices", min_similarity=1)
+
+        self.assertEqual(matches, [(self.similar_string, 1)])
+
+    def test_find_similar_filters_by_locale(self):
+        self.assertEqual(String.objects.find_similar(self.fr_locale, "Read more about our services and products"), [])
+
+    def test_find_similar_num_queries(self):
+        for i in range(20):
+            String.from_value(self.en_locale, StringValue("Read more about our services and products {}".format(i)))
+
+        with self.assertNumQueries(1):
+            matches = String.objects.find_similar(self.en_locale, "Read more about our services and products", limit=10)
+
+        self.assertEqual(len(matches), 10)
+
+    def test_index_translation_memory_command(self):
+        StringMinHash.objects.all().delete()
+
+        call_command('index_translation_memory', chunk_size=2, verbosity=0)
+
+        self.assertEqual(String.objects.find_similar(self.en_locale, "Contact us today"), [(self.different_string, 1)])
+        self.assertEqual(
+            StringMinHash.objects.count(),
+            sum(len(set(get_band_hashes(string.data))) for string in String.objects.all())
+        )
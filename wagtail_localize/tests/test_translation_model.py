@@ -1,4 +1,8 @@
+from datetime import timedelta
+from unittest import mock
+
 import polib
+from django.core.exceptions import ValidationError
 from django.test import TestCase
 from django.utils import timezone
 from wagtail.core.models import Page, Locale
@@ -12,6 +16,7 @@ from wagtail_localize.models import (
     UnknownString,
     UnknownContext,
     StringNotUsedInContext,
+    StringSegment,
     CannotSaveDraftError,
 )
 from wagtail_localize.segments import RelatedObjectSegmentValue
@@ -129,6 +134,177 @@ class TestGetProgress(TestCase):
         progress = self.translation.get_progress()
         self.assertEqual(progress, (2, 0))
 
+    def test_get_progress_is_cached(self):
+        self.assertEqual(self.translation.get_progress(), (2, 0))
+
+        translation = Translation.objects.get(id=self.translation.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(translation.get_progress(), (2, 0))
+            self.assertEqual(translation.get_status_display(), "Waiting for translations")
+
+    def test_get_progress_stores_counts(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.translation.get_progress(), (2, 0))
+
+        self.assertEqual(
+            Translation.objects.filter(id=self.translation.id).values_list("cached_total_segments", "cached_translated_segments").get(),
+            (2, 0),
+        )
+
+    def test_cached_progress_reset_when_string_translation_changes(self):
+        self.assertEqual(self.translation.get_progress(), (2, 0))
+
+        string_translation = StringTranslation.objects.create(
+            translation_of=self.test_content_string,
+            context=self.test_charfield_context,
+            locale=self.fr_locale,
+            data="Contenu de test",
+        )
+        self.assertEqual(Translation.objects.get(id=self.translation.id).get_progress(), (2, 1))
+
+        string_translation.set_field_error([ValidationError("Error")])
+        self.assertEqual(Translation.objects.get(id=self.translation.id).get_progress(), (2, 0))
+
+        string_translation.delete()
+        self.assertEqual(Translation.objects.get(id=self.translation.id).get_progress(), (2, 0))
+
+    def test_cached_progress_reset_when_source_changes(self):
+        self.assertEqual(self.translation.get_progress(), (2, 0))
+
+        self.page.test_charfield = "Updated test content"
+        self.page.test_richtextfield = "<p>New paragraph</p>"
+        self.page.save()
+        self.source.update_from_db()
+
+        self.assertEqual(Translation.objects.get(id=self.translation.id).get_progress(), (3, 0))
+
+    def test_annotate_progress(self):
+        de_locale = Locale.objects.create(language_code="de")
+        de_translation = Translation.objects.create(
+            source=self.source,
+            target_locale=de_locale,
+        )
+
+        StringTranslation.objects.create(
+            translation_of=self.test_content_string,
+            context=self.test_charfield_context,
+            locale=self.fr_locale,
+            data="Contenu de test",
+        )
+
+        StringTranslation.objects.create(
+            translation_of=self.test_content_string,
+            context=self.test_charfield_context,
+            locale=de_locale,
+            data="Testinhalt",
+        )
+
+        StringTranslation.objects.create(
+            translation_of=self.more_test_content_string,
+            context=self.test_textfield_context,
+            locale=de_locale,
+            data="Mehr Testinhalte",
+        )
+
+        with self.assertNumQueries(1):
+            translations = {
+                translation.id: translation
+                for translation in Translation.objects.annotate_progress()
+            }
+
+            self.assertEqual(translations[self.translation.id].get_progress(), (2, 1))
+            self.assertEqual(translations[de_translation.id].get_progress(), (2, 2))
+            self.assertEqual(translations[self.translation.id].get_status_display(), "Waiting for translations")
+            self.assertEqual(translations[de_translation.id].get_status_display(), "Up to date")
+
+
+class TestPrefillFromTranslationMemory(TestCase):
+    def setUp(self):
+        self.fr_locale = Locale.objects.create(language_code="fr")
+
+        self.other_page = create_test_page(title="Other page", slug="other-page", test_charfield="Read more", test_textfield="Footer")
+        self.other_source = TranslationSource.objects.get(object_id=self.other_page.translation_key)
+
+        self.page = create_test_page(title="Test page", slug="test-page", test_charfield="Read more", test_textfield="Footer")
+        self.source = TranslationSource.objects.get(object_id=self.page.translation_key)
+        self.translation = Translation.objects.create(source=self.source, target_locale=self.fr_locale)
+
+        self.read_more_string = String.objects.get(data="Read more")
+        self.footer_string = String.objects.get(data="Footer")
+
+    def translate(self, string, page, path, data, **kwargs):
+        return StringTranslation.objects.create(
+            translation_of=string,
+            context=TranslationContext.objects.get(object_id=page.translation_key, path=path),
+            locale=self.fr_locale,
+            data=data,
+            **kwargs
+        )
+
+    def test_prefill_from_translation_memory(self):
+        self.translate(self.read_more_string, self.other_page, "test_charfield", "Lire la suite")
+        self.translate(self.footer_string, self.other_page, "test_textfield", "Pied de page")
+        self.assertEqual(self.translation.get_progress(), (2, 0))
+
+        with self.assertNumQueries(5):
+            self.assertEqual(self.translation.prefill_from_translation_memory(), 2)
+
+        string_translation = StringTranslation.objects.get(context__object_id=self.page.translation_key, context__path="test_charfield")
+        self.assertEqual(string_translation.translation_of, self.read_more_string)
+        self.assertEqual(string_translation.locale, self.fr_locale)
+        self.assertEqual(string_translation.data, "Lire la suite")
+        self.assertEqual(string_translation.translation_type, StringTranslation.TRANSLATION_TYPE_MEMORY)
+        self.assertFalse(string_translation.has_error)
+        self.assertTrue(string_translation.get_comment().startswith("Translated from translation memory on"))
+
+        self.assertEqual(
+            StringTranslation.objects.get(context__object_id=self.page.translation_key, context__path="test_textfield").data,
+            "Pied de page"
+        )
+
+        self.assertEqual(Translation.objects.get(id=self.translation.id).get_progress(), (2, 2))
+
+        # Nothing left to prefill
+        self.assertEqual(self.translation.prefill_from_translation_memory(), 0)
+
+    def test_doesnt_overwrite_existing_translations(self):
+        self.translate(self.read_more_string, self.other_page, "test_charfield", "Lire la suite")
+        self.translate(self.read_more_string, self.page, "test_charfield", "En savoir plus")
+
+        self.assertEqual(self.translation.prefill_from_translation_memory(), 0)
+        self.assertEqual(
+            StringTranslation.objects.get(context__object_id=self.page.translation_key, context__path="test_charfield").data,
+            "En savoir plus"
+        )
+
+    def test_uses_latest_translation(self):
+        older = self.translate(self.read_more_string, self.other_page, "test_charfield", "Lire la suite")
+        self.translate(self.read_more_string, self.other_page, "test_textfield", "En savoir plus")
+        StringTranslation.objects.filter(id=older.id).update(updated_at=timezone.now() - timedelta(days=1))
+
+        self.translation.prefill_from_translation_memory()
+
+        self.assertEqual(
+            StringTranslation.objects.get(context__object_id=self.page.translation_key, context__path="test_charfield").data,
+            "En savoir plus"
+        )
+
+    def test_ignores_translations_with_errors(self):
+        self.translate(self.read_more_string, self.other_page, "test_charfield", "Lire la suite", has_error=True, field_error="Too long")
+
+        self.assertEqual(self.translation.prefill_from_translation_memory(), 0)
+
+    def test_ignores_other_locales(self):
+        de_locale = Locale.objects.create(language_code="de")
+        StringTranslation.objects.create(
+            translation_of=self.read_more_string,
+            context=TranslationContext.objects.get(object_id=self.other_page.translation_key, path="test_charfield"),
+            locale=de_locale,
+            data="Weiterlesen",
+        )
+
+        self.assertEqual(self.translation.prefill_from_translation_memory(), 0)
+
 
 class TestExportPO(TestCase):
     def setUp(self):
@@ -211,6 +387,42 @@ class TestExportPO(TestCase):
 
         # Obsolete strings that never had a translation don't get exported
 
+    def test_export_po_with_repeated_string(self):
+        page = create_test_page(title="Repeated", slug="repeated", test_charfield="Repeated text", test_textfield="Repeated text")
+        source, created = TranslationSource.get_or_create_from_instance(page)
+        translation = Translation.objects.create(source=source, target_locale=self.fr_locale)
+
+        po = translation.export_po()
+
+        # The string is only exported once, with the context of the last segment that uses it
+        entries = [entry for entry in po if entry.msgid == "Repeated text"]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].msgctxt, "test_textfield")
+
+    def test_stream_po(self):
+        obsolete_string = String.from_value(self.en_locale, StringValue("This is an obsolete string"))
+        StringTranslation.objects.create(
+            translation_of=obsolete_string,
+            context=TranslationContext.objects.get(path="test_charfield"),
+            locale=self.fr_locale,
+            data="Ceci est une chaîne \"obsolète\"",
+        )
+        StringTranslation.objects.create(
+            translation_of=String.objects.get(data="This is some test content"),
+            context=TranslationContext.objects.get(path="test_charfield"),
+            locale=self.fr_locale,
+            data="Contenu de test",
+        )
+
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now()):
+            self.assertEqual(''.join(self.translation.stream_po()), str(self.translation.export_po()))
+
+    def test_stream_po_empty(self):
+        StringSegment.objects.filter(source=self.source).delete()
+
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now()):
+            self.assertEqual(''.join(self.translation.stream_po()), str(self.translation.export_po()))
+
 
 class TestImportPO(TestCase):
     def setUp(self):
@@ -273,6 +485,91 @@ class TestImportPO(TestCase):
         self.assertEqual(translation.locale, self.fr_locale)
         self.assertEqual(translation.data, "C'est encore une chaîne obsolète",)
 
+    def make_po(self, entries):
+        po = polib.POFile(wrapwidth=200)
+        po.metadata = {
+            "POT-Creation-Date": str(timezone.now()),
+            "MIME-Version": "1.0",
+            "Content-Type": "text/plain; charset=utf-8",
+            "X-WagtailLocalize-TranslationID": str(self.translation.uuid),
+        }
+
+        for msgid, msgctxt, msgstr in entries:
+            po.append(polib.POEntry(msgid=msgid, msgctxt=msgctxt, msgstr=msgstr))
+
+        return po
+
+    def test_import_po_updates_translations(self):
+        translation = StringTranslation.objects.create(
+            translation_of=String.objects.get(data="This is some test content"),
+            context=TranslationContext.objects.get(path="test_charfield"),
+            locale=self.fr_locale,
+            data="Contenu de test",
+            translation_type=StringTranslation.TRANSLATION_TYPE_MACHINE,
+        )
+
+        warnings = self.translation.import_po(self.make_po([
+            ("This is some test content", "test_charfield", "Ceci est du contenu de test"),
+        ]), tool_name="PO")
+        self.assertEqual(warnings, [])
+
+        translation.refresh_from_db()
+        self.assertEqual(translation.data, "Ceci est du contenu de test")
+        self.assertEqual(translation.translation_type, StringTranslation.TRANSLATION_TYPE_MANUAL)
+        self.assertEqual(translation.tool_name, "PO")
+        self.assertFalse(translation.has_error)
+
+    def test_import_po_invalid_html(self):
+        warnings = self.translation.import_po(self.make_po([
+            ("This is some test content", "test_charfield", "<p>Contenu de test</p>"),
+        ]))
+        self.assertEqual(warnings, [])
+
+        translation = StringTranslation.objects.get()
+        self.assertEqual(translation.data, "<p>Contenu de test</p>")
+        self.assertTrue(translation.has_error)
+        self.assertEqual(translation.get_error(), "<p> tag is not allowed. Strings can only contain standard HTML inline tags (such as <b>, <a>)")
+
+    def test_import_po_repeated_entry(self):
+        # The last entry wins
+        warnings = self.translation.import_po(self.make_po([
+            ("This is some test content", "test_charfield", "Contenu de test"),
+            ("This is some test content", "test_charfield", "Ceci est du contenu de test"),
+        ]))
+        self.assertEqual(warnings, [])
+
+        self.assertEqual(StringTranslation.objects.get().data, "Ceci est du contenu de test")
+
+    def test_import_po_num_queries(self):
+        contexts = [TranslationContext.objects.get(path="test_charfield")]
+        for i in range(20):
+            contexts.append(TranslationContext.objects.create(object_id=self.source.object_id, path=f"obsolete_{i}"))
+
+        strings = []
+        for i in range(20):
+            string = String.from_value(self.en_locale, StringValue(f"Obsolete string {i}"))
+            StringTranslation.objects.create(
+                translation_of=string,
+                context=contexts[i + 1],
+                locale=self.fr_locale,
+                data=f"Chaîne obsolète {i}",
+            )
+            strings.append(string)
+
+        po = self.make_po(
+            [("This is some test content", "test_charfield", "Contenu de test")]
+            + [(string.data, context.path, f"Chaîne obsolète mise à jour {i}") for i, (string, context) in enumerate(zip(strings, contexts[1:]))]
+        )
+
+        # Savepoint, strings, contexts, segments, used translations, existing translations, create, update,
+        # reset progress, release
+        with self.assertNumQueries(10):
+            warnings = self.translation.import_po(po)
+
+        self.assertEqual(warnings, [])
+        self.assertEqual(StringTranslation.objects.get(translation_of__data="This is some test content").data, "Contenu de test")
+        self.assertEqual(StringTranslation.objects.get(translation_of=strings[5]).data, "Chaîne obsolète mise à jour 5")
+
     def test_import_po_deletes_translations(self):
         StringTranslation.objects.create(
             translation_of=String.objects.get(data="This is some test content"),
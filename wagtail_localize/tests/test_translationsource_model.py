@@ -1,12 +1,16 @@
 import json
+from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from wagtail.core.blocks import StreamValue
 from wagtail.core.models import Page, Locale
 
 from wagtail_localize.models import (
+    TranslatableObject,
     TranslationSource,
     String,
     StringTranslation,
@@ -14,9 +18,10 @@ from wagtail_localize.models import (
     MissingTranslationError,
     MissingRelatedObjectError,
     TranslationContext,
+    Translation,
 )
 from wagtail_localize.segments import RelatedObjectSegmentValue
-from wagtail_localize.strings import StringValue
+from wagtail_localize.strings import StringValue, template_cache
 from wagtail_localize.test.models import TestPage, TestSnippet, TestChildObject, TestSynchronizedChildObject, TestNonParentalChildObject
 
 
@@ -142,6 +147,89 @@ class TestUpdateOrCreateFromInstance(TestCase):
         self.assertEqual(
             json.loads(new_source.content_json)["field"], "This is some test content"
         )
+        self.assertTrue(new_source.content_digest)
+
+    def test_unchanged(self):
+        source, created = TranslationSource.update_or_create_from_instance(self.snippet)
+
+        with self.assertNumQueries(2):
+            new_source, created = TranslationSource.update_or_create_from_instance(self.snippet)
+
+        self.assertFalse(created)
+        self.assertEqual(source, new_source)
+        self.assertEqual(source.content_digest, new_source.content_digest)
+
+    def test_untranslatable_change_doesnt_update_segments(self):
+        page = create_test_page(title="Test page", slug="test-page", test_charfield="This is some test content")
+        source = TranslationSource.objects.get_for_instance(page)
+
+        # Title isn't in TestPage.translatable_fields
+        page.title = "Changed title"
+        page.save()
+
+        with mock.patch.object(TranslationSource, 'refresh_segments') as refresh_segments:
+            new_source, created = TranslationSource.update_or_create_from_instance(page)
+
+        refresh_segments.assert_not_called()
+        self.assertFalse(created)
+        self.assertEqual(new_source.content_digest, source.content_digest)
+        self.assertEqual(new_source.last_updated_at, source.last_updated_at)
+
+        # The stored content is still kept up to date
+        new_source.refresh_from_db()
+        self.assertEqual(json.loads(new_source.content_json)["title"], "Changed title")
+        self.assertEqual(new_source.object_repr, "Changed title")
+
+        page.test_charfield = "Some different content"
+        page.save()
+
+        new_source, created = TranslationSource.update_or_create_from_instance(page)
+
+        self.assertFalse(created)
+        self.assertNotEqual(new_source.content_digest, source.content_digest)
+        self.assertEqual(json.loads(new_source.content_json)["test_charfield"], "Some different content")
+        self.assertEqual(new_source.stringsegment_set.get().string.data, "Some different content")
+
+
+class TestUpdateFromDB(TestCase):
+    def setUp(self):
+        self.snippet = TestSnippet.objects.create(field="This is some test content")
+        self.source, created = TranslationSource.get_or_create_from_instance(self.snippet)
+
+    def test_update_from_db(self):
+        self.snippet.field = "Some different content"
+        self.snippet.save()
+
+        self.assertTrue(self.source.update_from_db())
+
+        self.source.refresh_from_db()
+        self.assertEqual(json.loads(self.source.content_json)["field"], "Some different content")
+        self.assertEqual(self.source.stringsegment_set.get().string.data, "Some different content")
+
+    def test_update_from_db_unchanged(self):
+        last_updated_at = self.source.last_updated_at
+
+        # Just the lookup for the source instance (within a savepoint)
+        with self.assertNumQueries(3):
+            self.assertFalse(self.source.update_from_db())
+
+        self.source.refresh_from_db()
+        self.assertEqual(self.source.last_updated_at, last_updated_at)
+
+    def test_update_from_db_updates_stored_content(self):
+        page = create_test_page(title="Test page", slug="test-page", test_charfield="This is some test content")
+        source = TranslationSource.objects.get_for_instance(page)
+
+        # Title isn't in TestPage.translatable_fields
+        Page.objects.filter(id=page.id).update(title="Changed title")
+
+        with mock.patch.object(TranslationSource, 'refresh_segments') as refresh_segments:
+            self.assertFalse(source.update_from_db())
+
+        refresh_segments.assert_not_called()
+        source.refresh_from_db()
+        self.assertEqual(json.loads(source.content_json)["title"], "Changed title")
+        self.assertEqual(source.object_repr, "Changed title")
 
 
 class TestAsInstanceForPage(TestCase):
@@ -192,6 +280,76 @@ class TestAsInstanceForSnippet(TestCase):
         self.assertEqual(new_instance.field, "Some changed content")
 
 
+class TestRefreshSegments(TestCase):
+    def setUp(self):
+        self.page = create_test_page(title="Test page", slug="test-page", test_charfield="This is some test content")
+        self.source, created = TranslationSource.get_or_create_from_instance(self.page)
+
+    def set_streamfield(self, blocks):
+        self.page.test_streamfield = StreamValue(
+            TestPage.test_streamfield.field.stream_block,
+            [
+                {
+                    "id": block_id,
+                    "type": block_type,
+                    "value": value,
+                }
+                for block_id, block_type, value in blocks
+            ],
+            is_lazy=True,
+        )
+        self.page.save()
+        self.source.update_from_db()
+
+    def count_refresh_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.source.refresh_segments()
+
+        return len(queries)
+
+    def test_query_count_doesnt_depend_on_number_of_segments(self):
+        self.set_streamfield([
+            (str(i), "test_richtextblock", f"<p>Paragraph {i}</p><p>Another <b>paragraph</b> {i}</p>")
+            for i in range(2)
+        ])
+        num_queries_small = self.count_refresh_queries()
+
+        self.set_streamfield([
+            (str(i), "test_richtextblock", f"<p>Paragraph {i}</p><p>Another <b>paragraph</b> {i}</p>")
+            for i in range(50)
+        ])
+        num_queries_large = self.count_refresh_queries()
+
+        self.assertEqual(num_queries_small, num_queries_large)
+        self.assertEqual(self.source.stringsegment_set.count(), 101)
+        self.assertEqual(self.source.templatesegment_set.count(), 50)
+
+    def test_reorder_keeps_existing_segments(self):
+        self.set_streamfield([
+            ("a", "test_charblock", "Block A"),
+            ("b", "test_charblock", "Block B"),
+        ])
+        segment_ids = {
+            segment.context.path: segment.id
+            for segment in self.source.stringsegment_set.select_related('context')
+        }
+
+        self.set_streamfield([
+            ("b", "test_charblock", "Block B"),
+            ("c", "test_charblock", "Block C"),
+        ])
+        segments = {
+            segment.context.path: segment
+            for segment in self.source.stringsegment_set.select_related('context', 'string')
+        }
+
+        self.assertEqual(set(segments.keys()), {"test_charfield", "test_streamfield.b", "test_streamfield.c"})
+        self.assertEqual(segments["test_streamfield.b"].id, segment_ids["test_streamfield.b"])
+        self.assertEqual(segments["test_streamfield.b"].order, 2)
+        self.assertEqual(segments["test_streamfield.c"].string.data, "Block C")
+        self.assertEqual(segments["test_streamfield.c"].order, 3)
+
+
 class TestExportPO(TestCase):
     def setUp(self):
         self.page = create_test_page(title="Test page", slug="test-page", test_charfield="This is some test content")
@@ -519,6 +677,18 @@ class TestCreateOrUpdateTranslationForPage(TestCase):
         self.assertEqual(translated_page.test_snippet, self.snippet)
         self.assertEqual(translated_page.test_charfield, "This is some test content")
 
+    def test_template_tokenized_once_per_source(self):
+        self.page.test_richtextfield = "<p>Test rich text</p>"
+        self.page.save_revision().publish()
+        source, created = TranslationSource.update_or_create_from_instance(self.page)
+        template_cache.clear()
+
+        source.create_or_update_translation(self.dest_locale, fallback=True)
+        source.create_or_update_translation(Locale.objects.create(language_code="de"), fallback=True)
+
+        self.assertEqual(template_cache.misses, 1)
+        self.assertEqual(template_cache.hits, 1)
+
     def test_create_with_fallback_true(self):
         # Like the previous test, but this time we have valid data, so it shouldn't fallback
         translated_page, created = self.source.create_or_update_translation(self.dest_locale, fallback=True)
@@ -526,6 +696,52 @@ class TestCreateOrUpdateTranslationForPage(TestCase):
         self.assertEqual(translated_page.test_snippet, self.translated_snippet)
         self.assertEqual(translated_page.test_charfield, "Ceci est du contenu de test")
 
+    def test_get_segments_for_translation_fetches_related_objects(self):
+        segments = self.source.get_segments_for_translation(self.dest_locale)
+        related_object_segment = [segment for segment in segments if isinstance(segment, RelatedObjectSegmentValue)][0]
+
+        # The translated snippet is passed through to ingest_segments, so it doesn't need to be fetched again
+        with self.assertNumQueries(0):
+            self.assertEqual(related_object_segment.get_instance(self.dest_locale), self.translated_snippet)
+
+            field_name, related_object_segment = related_object_segment.unwrap()
+            self.assertEqual(related_object_segment.get_instance(self.dest_locale), self.translated_snippet)
+
+
+class TestGetTranslatableObjectInstances(TestCase):
+    def setUp(self):
+        self.fr_locale = Locale.objects.create(language_code="fr")
+
+        self.snippets = [TestSnippet.objects.create(field="Snippet {}".format(i)) for i in range(3)]
+        self.translated_snippets = [snippet.copy_for_translation(self.fr_locale) for snippet in self.snippets[:2]]
+        for translated_snippet in self.translated_snippets:
+            translated_snippet.save()
+
+        self.page = create_test_page(title="Test page", slug="test-page")
+        self.translated_page = self.page.copy_for_translation(self.fr_locale)
+
+        self.objects = [
+            TranslatableObject.objects.get_or_create_from_instance(instance)[0]
+            for instance in self.snippets + [self.page]
+        ]
+
+    def test_get_instances(self):
+        # One query per content type
+        with self.assertNumQueries(2):
+            instances = TranslatableObject.objects.get_instances(self.objects, self.fr_locale)
+
+        # The last snippet hasn't been translated
+        self.assertEqual(instances, {
+            self.snippets[0].translation_key: self.translated_snippets[0],
+            self.snippets[1].translation_key: self.translated_snippets[1],
+            self.page.translation_key: self.translated_page.page_ptr,
+        })
+
+    def test_get_instances_in_source_locale(self):
+        instances = TranslatableObject.objects.get_instances(self.objects, self.page.locale)
+
+        self.assertEqual(set(instances.values()), set(self.snippets + [self.page.page_ptr]))
+
 
 class TestGetEphemeralTranslatedInstance(TestCase):
     def setUp(self):
@@ -603,3 +819,71 @@ class TestGetEphemeralTranslatedInstance(TestCase):
 
         new_page = self.source.get_ephemeral_translated_instance(self.dest_locale)
         self.assertEqual(new_page.test_textfield, "Champ de texte mis à jour")
+
+
+class TestMachineTranslate(TestCase):
+    def setUp(self):
+        self.page = create_test_page(
+            title="Test page",
+            slug="test-page",
+            test_charfield="This is some test content",
+            test_textfield="This is some more test content",
+        )
+        self.source, created = TranslationSource.get_or_create_from_instance(self.page)
+        self.fr_locale = Locale.objects.create(language_code="fr")
+        self.de_locale = Locale.objects.create(language_code="de")
+        self.es_locale = Locale.objects.create(language_code="es")
+
+        self.fr_translation = Translation.objects.create(source=self.source, target_locale=self.fr_locale)
+        self.de_translation = Translation.objects.create(source=self.source, target_locale=self.de_locale)
+        Translation.objects.create(source=self.source, target_locale=self.es_locale, enabled=False)
+
+    def test_machine_translate(self):
+        StringTranslation.objects.create(
+            translation_of=String.objects.get(data="This is some test content"),
+            locale=self.fr_locale,
+            context=TranslationContext.objects.get(path="test_charfield"),
+            data="Ceci est du contenu de test",
+        )
+
+        self.assertEqual(self.source.machine_translate(), 3)
+
+        # Existing translations are left alone
+        self.assertEqual(
+            StringTranslation.objects.get(translation_of__data="This is some test content", locale=self.fr_locale).data,
+            "Ceci est du contenu de test"
+        )
+
+        for locale in [self.fr_locale, self.de_locale]:
+            string_translation = StringTranslation.objects.get(translation_of__data="This is some more test content", locale=locale)
+            self.assertEqual(string_translation.data, "content test more some is This")
+            self.assertEqual(string_translation.translation_type, StringTranslation.TRANSLATION_TYPE_MACHINE)
+            self.assertEqual(string_translation.tool_name, "Dummy translator")
+
+        self.assertEqual(
+            StringTranslation.objects.get(translation_of__data="This is some test content", locale=self.de_locale).data,
+            "content test some is This"
+        )
+
+        # Translations that are disabled aren't included
+        self.assertFalse(StringTranslation.objects.filter(locale=self.es_locale).exists())
+
+        self.assertEqual(self.fr_translation.get_progress(), (2, 2))
+        self.assertEqual(self.de_translation.get_progress(), (2, 2))
+
+        # There's nothing left to translate
+        self.assertEqual(self.source.machine_translate(), 0)
+
+    def test_machine_translate_into_locales(self):
+        self.assertEqual(self.source.machine_translate([self.es_locale]), 2)
+
+        self.assertEqual(StringTranslation.objects.filter(locale=self.es_locale).count(), 2)
+        self.assertFalse(StringTranslation.objects.filter(locale__in=[self.fr_locale, self.de_locale]).exists())
+
+    def test_machine_translate_skips_unsupported_locales(self):
+        self.assertEqual(self.source.machine_translate([self.source.locale]), 0)
+
+    @override_settings(WAGTAILLOCALIZE_MACHINE_TRANSLATOR=None)
+    def test_machine_translate_without_machine_translator(self):
+        self.assertEqual(self.source.machine_translate(), 0)
+        self.assertFalse(StringTranslation.objects.exists())
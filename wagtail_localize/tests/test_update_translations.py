@@ -1,12 +1,17 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from wagtail.core.models import Page, Locale
 from wagtail.tests.utils import WagtailTestUtils
 
 from wagtail_localize.models import Translation, TranslationSource, StringSegment
+from wagtail_localize.wagtail_hooks import ListingTranslationStatus
 from wagtail_localize.test.models import TestPage, TestSnippet, NonTranslatableSnippet
 
 from .utils import assert_permission_denied
@@ -90,6 +95,23 @@ class TestPageUpdateTranslationsListingButton(TestCase, WagtailTestUtils):
 
         self.assertNotContains(response, "Sync translated pages")
 
+    def test_hides_if_translations_are_disabled(self):
+        self.translation.enabled = False
+        self.translation.save()
+
+        response = self.client.get(
+            reverse("wagtailadmin_explore", args=[self.en_homepage.id])
+        )
+
+        self.assertNotContains(response, "Sync translated pages")
+
+    def test_parent_page(self):
+        response = self.client.get(
+            reverse("wagtailadmin_explore", args=[self.en_blog_index.id])
+        )
+
+        self.assertContains(response, f'<a href="/admin/localize/update/{self.source.id}/?next=%2Fadmin%2Fpages%2F{self.en_blog_index.id}%2F"')
+
     def test_hides_if_user_doesnt_have_permission(self):
         strip_user_perms()
 
@@ -99,6 +121,33 @@ class TestPageUpdateTranslationsListingButton(TestCase, WagtailTestUtils):
 
         self.assertNotContains(response, "Sync translated pages")
 
+    def test_query_count_doesnt_depend_on_number_of_pages(self):
+        def get_translation_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    reverse("wagtailadmin_explore", args=[self.en_homepage.id])
+                )
+
+            self.assertEqual(response.status_code, 200)
+
+            # Wagtail makes some queries for each page itself, so only count the queries on locales and translation sources
+            return [
+                query['sql'] for query in queries.captured_queries
+                if 'wagtail_localize_translationsource' in query['sql'] or 'wagtailcore_locale' in query['sql']
+            ]
+
+        # Warm up caches
+        get_translation_queries()
+        num_queries = len(get_translation_queries())
+
+        for i in range(5):
+            page = make_test_page(self.en_homepage, title=f"Page {i}", slug=f"page-{i}")
+            source, created = TranslationSource.get_or_create_from_instance(page)
+            Translation.objects.create(source=source, target_locale=self.fr_locale)
+            page.copy_for_translation(self.fr_locale)
+
+        self.assertEqual(len(get_translation_queries()), num_queries)
+
 
 @override_settings(
     LANGUAGES=[
@@ -159,6 +208,50 @@ class TestSnippetUpdateTranslationsListingButton(TestCase, WagtailTestUtils):
 
         self.assertNotContains(response, "Sync translated snippets")
 
+    def test_query_count_doesnt_depend_on_number_of_snippets(self):
+        def get_translation_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    reverse("wagtailsnippets:list", args=['wagtail_localize_test', 'testsnippet'])
+                )
+
+            self.assertEqual(response.status_code, 200)
+
+            # Only count the queries on locales and translation sources
+            return [
+                query['sql'] for query in queries.captured_queries
+                if 'wagtail_localize_translationsource' in query['sql'] or 'wagtailcore_locale' in query['sql']
+            ]
+
+        # Warm up caches
+        get_translation_queries()
+        num_queries = len(get_translation_queries())
+
+        for i in range(5):
+            snippet = TestSnippet.objects.create(field=f"Test snippet {i}")
+            source, created = TranslationSource.get_or_create_from_instance(snippet)
+            Translation.objects.create(source=source, target_locale=self.fr_locale)
+            snippet.copy_for_translation(self.fr_locale).save()
+
+        response = self.client.get(
+            reverse("wagtailsnippets:list", args=['wagtail_localize_test', 'testsnippet'])
+        )
+        self.assertContains(response, "Sync translated snippets", count=6)
+
+        self.assertEqual(len(get_translation_queries()), num_queries)
+
+    def test_only_looks_up_snippets_on_the_current_page(self):
+        # The listing shows 20 snippets at a time
+        snippets = [self.en_snippet] + [TestSnippet.objects.create(field=f"Test snippet {i}") for i in range(20)]
+
+        with mock.patch('wagtail_localize.wagtail_hooks.ListingTranslationStatus', wraps=ListingTranslationStatus) as listing_translation_status:
+            response = self.client.get(
+                reverse("wagtailsnippets:list", args=['wagtail_localize_test', 'testsnippet'])
+            )
+
+        self.assertContains(response, "Sync translated snippets", count=1)
+        listing_translation_status.assert_called_once_with(TestSnippet, [snippet.translation_key for snippet in snippets[:20]])
+
 
 @override_settings(
     LANGUAGES=[
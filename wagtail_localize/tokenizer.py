@@ -0,0 +1,557 @@
+"""
+An implementation of extract_strings that is built directly on the event stream of the standard
+library's HTMLParser.
+
+It produces exactly the same output as the BeautifulSoup implementation in `strings.py` (which is
+kept as the reference implementation), but it only parses the HTML once and builds each string
+and its attributes straight from the parsed tree instead of parsing every extracted string again.
+
+The tree is built using the same rules as BeautifulSoup's "html.parser" tree builder. Anything
+that this implementation can't guarantee identical output for (such as comments, <script> tags,
+or void tags that BeautifulSoup ends up giving children to) raises UnsupportedHTML internally and
+the reference implementation is used instead.
+"""
+import re
+from collections import Counter
+from html.parser import HTMLParser
+
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution
+
+from .strings import INLINE_TAGS, HTMLValidationError, StringValue
+
+
+ROOT_TAG_NAME = "[document]"
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+VOID_ELEMENTS = HTMLTreeBuilder.empty_element_tags
+PRESERVE_WHITESPACE_TAGS = HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS
+CDATA_LIST_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+
+# Tags that BeautifulSoup gives special treatment to when parsing/rendering.
+# <text> is used for the placeholders in templates, so can't be in the source.
+UNSUPPORTED_TAGS = {"script", "style", "meta", "text"}
+
+NONWHITESPACE_RE = re.compile(r"\S+")
+
+
+class UnsupportedHTML(Exception):
+    """
+    Raised when the given HTML can't be handled by this module. The BeautifulSoup implementation
+    should be used instead.
+    """
+    pass
+
+
+class Element:
+    __slots__ = ["name", "attrs", "children", "runs", "hidden"]
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.children = []
+
+        # Maps the index of the first child of each extracted string to the indexes of all
+        # the children that make up that string
+        self.runs = None
+
+        # Indexes of children that have been extracted into a string
+        self.hidden = None
+
+    def add_run(self, indexes):
+        if self.runs is None:
+            self.runs = {}
+            self.hidden = set()
+
+        self.runs[indexes[0]] = indexes
+        self.hidden.update(indexes)
+
+
+class TreeBuilder(HTMLParser):
+    """
+    Builds a tree of Elements/strings from HTML, following the same rules as BeautifulSoup's
+    "html.parser" tree builder.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.root = Element(ROOT_TAG_NAME, {})
+        self.stack = [self.root]
+        self.preserve_whitespace_stack = []
+        self.current_data = []
+        self.already_closed_empty_element = []
+
+    def end_data(self):
+        if self.current_data:
+            data = "".join(self.current_data)
+            self.current_data = []
+
+            # If whitespace is not preserved, replace strings that only contain spaces with a single
+            # space or newline
+            if not self.preserve_whitespace_stack and all(char in ASCII_SPACES for char in data):
+                data = "\n" if "\n" in data else " "
+
+            self.stack[-1].children.append(data)
+
+    def pop_tag(self):
+        element = self.stack.pop()
+
+        if self.preserve_whitespace_stack and element is self.preserve_whitespace_stack[-1]:
+            self.preserve_whitespace_stack.pop()
+
+    def pop_to_tag(self, name):
+        if name == ROOT_TAG_NAME:
+            return
+
+        # Note: If there isn't an open tag with this name, this pops everything
+        for element in reversed(self.stack[1:]):
+            self.pop_tag()
+
+            if element.name == name:
+                break
+
+    def handle_starttag(self, name, attrs, handle_empty_element=True):
+        if name in UNSUPPORTED_TAGS:
+            raise UnsupportedHTML
+
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = "" if value is None else value
+
+        cdata_list_attributes = CDATA_LIST_ATTRIBUTES.get("*", []) + CDATA_LIST_ATTRIBUTES.get(name, [])
+        for key in attr_dict.keys():
+            if key in cdata_list_attributes:
+                attr_dict[key] = NONWHITESPACE_RE.findall(attr_dict[key])
+
+        self.end_data()
+
+        element = Element(name, attr_dict)
+        self.stack[-1].children.append(element)
+        self.stack.append(element)
+
+        if name in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_whitespace_stack.append(element)
+
+        if name in VOID_ELEMENTS and handle_empty_element:
+            self.handle_endtag(name, check_already_closed=False)
+            self.already_closed_empty_element.append(name)
+
+    def handle_startendtag(self, name, attrs):
+        self.handle_starttag(name, attrs, handle_empty_element=False)
+        self.handle_endtag(name)
+
+    def handle_endtag(self, name, check_already_closed=True):
+        if check_already_closed and name in self.already_closed_empty_element:
+            self.already_closed_empty_element.remove(name)
+        else:
+            self.end_data()
+            self.pop_to_tag(name)
+
+    def handle_data(self, data):
+        self.current_data.append(data)
+
+    def handle_charref(self, name):
+        if name.startswith(("x", "X")):
+            codepoint = int(name.lstrip("xX"), 16)
+        else:
+            codepoint = int(name)
+
+        data = None
+        if codepoint < 256:
+            try:
+                data = bytearray([codepoint]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+
+        if not data:
+            try:
+                data = chr(codepoint)
+            except (ValueError, OverflowError):
+                pass
+
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else "&" + name)
+
+    def handle_comment(self, data):
+        raise UnsupportedHTML
+
+    def handle_decl(self, data):
+        raise UnsupportedHTML
+
+    def unknown_decl(self, data):
+        raise UnsupportedHTML
+
+    def handle_pi(self, data):
+        raise UnsupportedHTML
+
+    def close(self):
+        super().close()
+        self.end_data()
+
+
+def parse(html):
+    builder = TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_attrs(attrs):
+    rendered = []
+
+    for key, value in sorted(attrs.items()):
+        if value is None:
+            rendered.append(key)
+            continue
+
+        if isinstance(value, (list, tuple)):
+            value = " ".join(value)
+        elif not isinstance(value, str):
+            value = str(value)
+
+        value = escape(value)
+        quote_with = '"'
+        if '"' in value:
+            if "'" in value:
+                value = value.replace('"', "&quot;")
+            else:
+                quote_with = "'"
+
+        rendered.append(key + "=" + quote_with + value + quote_with)
+
+    if rendered:
+        return " " + " ".join(rendered)
+    else:
+        return ""
+
+
+def render_start_tag(element, attrs):
+    if element.name in VOID_ELEMENTS:
+        if element.children:
+            # BeautifulSoup would render this as a normal tag, which doesn't survive being parsed again
+            raise UnsupportedHTML
+
+        return "<" + element.name + render_attrs(attrs) + "/>"
+
+    return "<" + element.name + render_attrs(attrs) + ">"
+
+
+def render_end_tag(element):
+    if element.name in VOID_ELEMENTS:
+        return ""
+
+    return "</" + element.name + ">"
+
+
+def has_text(element):
+    """
+    Returns True if the element has any text nodes (including whitespace) in its descendants.
+    """
+    for child in element.children:
+        if isinstance(child, str) or has_text(child):
+            return True
+
+    return False
+
+
+def wrap(element, indexes):
+    """
+    Marks the given children of the element as a string to be extracted.
+
+    This follows the same rules as the wrap() function in strings.extract_strings.
+    """
+    if not indexes:
+        return
+
+    first_child = element.children[indexes[0]]
+    last_child = element.children[indexes[-1]]
+
+    if len(indexes) == 1 and isinstance(first_child, Element) and first_child.name in INLINE_TAGS:
+        wrap(first_child, list(range(len(first_child.children))))
+        return
+
+    # Ignore tags without any text nodes at either end
+    if isinstance(first_child, Element) and not has_text(first_child):
+        wrap(element, indexes[1:])
+        return
+
+    if isinstance(last_child, Element) and not has_text(last_child):
+        wrap(element, indexes[:-1])
+        return
+
+    # Only extract strings that have some non-whitespace content
+    for index in indexes:
+        child = element.children[index]
+
+        if isinstance(child, Element) or (child and not child.isspace()):
+            element.add_run(indexes)
+            return
+
+
+def walk(element):
+    """
+    Finds the strings to extract from the tree.
+
+    This follows the same rules as the walk() function in strings.extract_strings.
+    Returns a 2-tuple of (has_wrap, is_block).
+    """
+    if isinstance(element, str):
+        return False, False
+
+    has_block = False
+    has_wrap = False
+    buffer = []
+
+    for index, child in enumerate(element.children):
+        child_has_wrap, is_block = walk(child)
+
+        if child_has_wrap:
+            has_wrap = True
+
+        if is_block:
+            has_block = True
+
+            if buffer:
+                wrap(element, buffer)
+                buffer = []
+                has_wrap = True
+
+        elif not child_has_wrap:
+            buffer.append(index)
+
+    if buffer and has_block:
+        wrap(element, buffer)
+        buffer = []
+        has_wrap = True
+
+    if element.name not in INLINE_TAGS:
+        if buffer:
+            wrap(element, buffer)
+            has_wrap = True
+
+        return has_wrap, True
+
+    return has_wrap, False
+
+
+def collapse_whitespace(text):
+    if all(char in ASCII_SPACES for char in text):
+        return "\n" if "\n" in text else " "
+
+    return text
+
+
+class StringBuilder:
+    """
+    Builds the translatable HTML and attributes of an extracted string from the nodes that make
+    up the string.
+
+    The result is the same as rendering the nodes, then passing the result through
+    StringValue.from_source_html.
+    """
+    def __init__(self):
+        self.counter = Counter()
+        self.attrs = {}
+        self.error = None
+        self.output = []
+
+    def add_element(self, element):
+        element_attrs = {}
+
+        if element.attrs:
+            # Attributes come out in alphabetical order when the string is rendered and parsed again
+            self.counter[element.name] += 1
+            element_id = element.name + str(self.counter[element.name])
+            self.attrs[element_id] = dict(sorted(element.attrs.items()))
+            element_attrs = {"id": element_id}
+
+        # Validate tag and attributes. Only the first error is reported.
+        if self.error is None:
+            if element.name not in INLINE_TAGS:
+                self.error = HTMLValidationError('tag_not_allowed', element.name)
+
+            elif element_attrs and element.name != "a":
+                self.error = HTMLValidationError('attributes_not_allowed', element.name)
+
+        self.output.append(render_start_tag(element, element_attrs))
+        self.add_nodes(element.children)
+        self.output.append(render_end_tag(element))
+
+    def add_nodes(self, nodes):
+        for node in merge_text_nodes(nodes):
+            if isinstance(node, str):
+                # Whitespace is never preserved in strings (<pre>/<textarea> tags can't be in them)
+                self.output.append(escape(collapse_whitespace(node)))
+            else:
+                self.add_element(node)
+
+    def build(self, nodes):
+        self.add_nodes(nodes)
+
+        if self.error is not None:
+            raise self.error
+
+        return "".join(self.output), self.attrs
+
+
+def merge_text_nodes(nodes):
+    merged = []
+
+    for node in nodes:
+        if isinstance(node, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += node
+        else:
+            merged.append(node)
+
+    return merged
+
+
+def build_string(nodes):
+    """
+    Returns the prefix, StringValue, attrs and suffix of a string made from the given nodes.
+    """
+    nodes = merge_text_nodes(nodes)
+
+    # Strip leading and trailing whitespace, keeping it to insert into the template
+    prefix = ""
+    while nodes and isinstance(nodes[0], str):
+        text = nodes[0].lstrip()
+        prefix += nodes[0][:len(nodes[0]) - len(text)]
+
+        if text:
+            nodes[0] = text
+            break
+
+        nodes.pop(0)
+
+    suffix = ""
+    while nodes and isinstance(nodes[-1], str):
+        text = nodes[-1].rstrip()
+        suffix = nodes[-1][len(text):] + suffix
+
+        if text:
+            nodes[-1] = text
+            break
+
+        nodes.pop()
+
+    data, attrs = StringBuilder().build(nodes)
+    return prefix, StringValue(data), attrs, suffix
+
+
+class TemplateBuilder:
+    def __init__(self):
+        self.output = []
+        self.strings = []
+
+    def add_children(self, element):
+        for index, child in enumerate(element.children):
+            if element.runs is not None:
+                if index in element.runs:
+                    self.add_string([element.children[i] for i in element.runs[index]])
+                    continue
+
+                elif index in element.hidden:
+                    continue
+
+            if isinstance(child, str):
+                self.output.append(escape(child))
+            else:
+                self.output.append(render_start_tag(child, child.attrs))
+                self.add_children(child)
+                self.output.append(render_end_tag(child))
+
+    def add_string(self, nodes):
+        prefix, string, attrs, suffix = build_string(nodes)
+
+        self.output.append(escape(prefix))
+        self.output.append('<text position="{}"></text>'.format(len(self.strings)))
+        self.output.append(escape(suffix))
+        self.strings.append((string, attrs))
+
+    def build(self, root):
+        self.add_children(root)
+        return "".join(self.output), self.strings
+
+
+def extract_strings(html):
+    """
+    Extracts translatable strings from an HTML fragment. See strings.extract_strings.
+
+    Raises UnsupportedHTML if the HTML contains anything that this implementation can't
+    produce identical output to the reference implementation for.
+    """
+    root = parse(html)
+    walk(root)
+    return TemplateBuilder().build(root)
+
+
+# Matches the tokens of HTML that has been normalised by BeautifulSoup, where the only attribute
+# on any tag is an "id"
+NORMALISED_TOKEN_RE = re.compile(
+    r'<(?P<end>/?)(?P<name>[a-z][a-z0-9]*)(?: id="(?P<id>[^"&<>]*)")?(?P<self_closing>/?)>'
+    r'|(?P<text>(?:[^<>&]|&(?:amp|lt|gt);)+)'
+)
+
+
+def restore_attrs(html, attrs):
+    """
+    Replaces the "id" attributes in a string's HTML with the attributes they were extracted from.
+    See StringValue.render_soup.
+
+    This works on the HTML directly, without building a tree. This is only possible if the HTML is
+    already normalised (as the data of a StringValue usually is) so that the output is identical to
+    rendering it with BeautifulSoup. UnsupportedHTML is raised if it isn't.
+    """
+    output = []
+    stack = []
+    position = 0
+
+    for match in NORMALISED_TOKEN_RE.finditer(html):
+        if match.start() != position:
+            raise UnsupportedHTML
+
+        position = match.end()
+        text = match.group("text")
+
+        if text is not None:
+            # Whitespace-only text would be collapsed when parsed
+            if all(char in ASCII_SPACES for char in text) and text not in (" ", "\n"):
+                raise UnsupportedHTML
+
+            output.append(text)
+            continue
+
+        name = match.group("name")
+        if name not in INLINE_TAGS:
+            raise UnsupportedHTML
+
+        if match.group("end"):
+            if match.group("id") is not None or match.group("self_closing") or not stack or stack.pop() != name:
+                raise UnsupportedHTML
+
+            output.append(match.group(0))
+            continue
+
+        # Void elements must be self-closing and nothing else can be
+        if bool(match.group("self_closing")) != (name in VOID_ELEMENTS):
+            raise UnsupportedHTML
+
+        if name not in VOID_ELEMENTS:
+            stack.append(name)
+
+        element_id = match.group("id")
+        if element_id is None:
+            output.append(match.group(0))
+        else:
+            output.append("<" + name + render_attrs(attrs[element_id]) + match.group("self_closing") + ">")
+
+    if position != len(html) or stack:
+        raise UnsupportedHTML
+
+    return "".join(output)
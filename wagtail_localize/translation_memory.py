@@ -0,0 +1,89 @@
+"""
+Locality-sensitive hashing for finding similar strings in the translation memory.
+
+Each string is broken up into character trigrams and summarised with a MinHash signature.
+The signature is split into bands and each band is hashed into a single integer. Strings that
+are similar are very likely to share at least one band hash, while dissimilar strings rarely do.
+
+The band hashes of every String are stored in the StringMinHash model. Finding candidates for a
+new string is then a lookup of its band hashes on that table's index, which stays fast no matter
+how many strings there are. The candidates are then ranked by their actual similarity.
+"""
+import difflib
+import hashlib
+import random
+import re
+import zlib
+
+
+SHINGLE_SIZE = 3
+
+# With these settings, a sentence with one word in ten changed (around 90% similar) shares at
+# least one band hash with the original about 99% of the time, while about 1% of unrelated
+# sentences share one and need to be ranked out
+NUM_BANDS = 16
+ROWS_PER_BAND = 3
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+# These must never change between processes or releases or the stored hashes would stop matching
+_random = random.Random(20201016)
+PERMUTATIONS = [
+    (_random.randint(1, MERSENNE_PRIME - 1), _random.randint(0, MERSENNE_PRIME - 1))
+    for i in range(NUM_PERMUTATIONS)
+]
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalise(text):
+    """
+    Returns the form of the given text that is used for comparisons.
+    """
+    return WHITESPACE_RE.sub(' ', text).strip().lower()
+
+
+def get_shingles(text):
+    """
+    Returns the set of character trigrams in the normalised version of the given text.
+    """
+    text = normalise(text)
+
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+
+    return {
+        text[i:i + SHINGLE_SIZE]
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+
+
+def get_band_hashes(text):
+    """
+    Returns a list of NUM_BANDS integers that summarise the given text. Similar texts are
+    likely to have at least one of these in common.
+
+    The values fit in a signed 64 bit integer.
+    """
+    shingle_hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in get_shingles(text)]
+
+    signature = [
+        min((a * shingle_hash + b) % MERSENNE_PRIME for shingle_hash in shingle_hashes)
+        for a, b in PERMUTATIONS
+    ]
+
+    band_hashes = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(repr((band, rows)).encode('ascii'), digest_size=8).digest()
+        band_hashes.append(int.from_bytes(digest, 'big', signed=True))
+
+    return band_hashes
+
+
+def get_similarity(a, b):
+    """
+    Returns a number between 0 and 1 that indicates how similar the two texts are.
+    """
+    return difflib.SequenceMatcher(None, normalise(a), normalise(b)).ratio()
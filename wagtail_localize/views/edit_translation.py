@@ -5,15 +5,17 @@ from collections import defaultdict
 import polib
 from django.contrib.admin.utils import quote
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
-from django.http import Http404, HttpResponse
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse
 from django.shortcuts import get_object_or_404, render, redirect
-from django.utils.functional import cached_property
+from django.utils import timezone
+from django.utils.functional import Promise, cached_property
 from django.utils.text import capfirst, slugify
-from django.utils.translation import gettext as _
+from django.utils.translation import get_language, gettext as _
 from django.views.decorators.http import require_POST
 from modelcluster.fields import ParentalKey
 from rest_framework import serializers, status
@@ -32,8 +34,7 @@ from wagtail.snippets.permissions import get_permission_name, user_can_edit_snip
 from wagtail.snippets.views.snippets import get_snippet_edit_handler
 
 from wagtail_localize.machine_translators import get_machine_translator
-from wagtail_localize.models import Translation, StringTranslation, StringSegment
-from wagtail_localize.segments import StringSegmentValue
+from wagtail_localize.models import String, Translation, StringTranslation, StringSegment
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -56,6 +57,10 @@ class StringTranslationSerializer(serializers.ModelSerializer):
     last_translated_by = UserSerializer()
 
     def get_segment_id(self, translation):
+        # Use the value annotated by StringSegmentQuerySet.get_translations() if it's there
+        if hasattr(translation, 'segment_id'):
+            return translation.segment_id
+
         if 'translation_source' in self.context:
             translation_source = self.context['translation_source']
             return translation_source.stringsegment_set.filter(
@@ -121,62 +126,119 @@ class TabHelper:
             return self.tabs[0]
 
 
-def get_segment_location_info(source_instance, tab_helper, segment):
-    context = segment.context
-    context_path_components = context.path.split('.')
-    field = segment.source.specific_content_type.model_class()._meta.get_field(context_path_components[0])
+class SegmentLocationIndex:
+    """
+    Works out where each segment of a source is displayed in the edit interface.
+
+    The blocks of each StreamField are indexed the first time a segment inside that
+    field is looked up, so the field is only walked once no matter how many segments
+    it contains.
+    """
+    def __init__(self, source, source_instance, tab_helper):
+        self.model = source.specific_content_type.model_class()
+        self.source_instance = source_instance
+        self.tab_helper = tab_helper
+        self.stream_blocks_by_field = {}
+
+    def get_stream_blocks(self, field):
+        if field.name not in self.stream_blocks_by_field:
+            stream_value = field.value_from_object(self.source_instance)
+            self.stream_blocks_by_field[field.name] = (
+                stream_value.stream_block,
+                {
+                    block.id: block
+                    for block in stream_value
+                }
+            )
 
-    # Work out which tab the segment is on from edit handler
-    tab = cautious_slugify(tab_helper.get_field_tab(field.name))
+        return self.stream_blocks_by_field[field.name]
 
-    if isinstance(field, StreamField):
-        stream_value = field.value_from_object(source_instance)
-        stream_blocks_by_id = {
-            block.id: block
-            for block in field.value_from_object(source_instance)
-        }
-        block_id = context_path_components[1]
-        block_value = stream_blocks_by_id[block_id]
-        block_type = stream_value.stream_block.child_blocks[block_value.block_type]
+    def get_location(self, context_path):
+        context_path_components = context_path.split('.')
+        field = self.model._meta.get_field(context_path_components[0])
+
+        # Work out which tab the segment is on from edit handler
+        tab = cautious_slugify(self.tab_helper.get_field_tab(field.name))
+
+        if isinstance(field, StreamField):
+            stream_block, stream_blocks_by_id = self.get_stream_blocks(field)
+            block_id = context_path_components[1]
+            block_value = stream_blocks_by_id[block_id]
+            block_type = stream_block.child_blocks[block_value.block_type]
+
+            if isinstance(block_type, StructBlock):
+                block_field_name = context_path_components[2]
+                block_field = block_type.child_blocks[block_field_name].label
+            else:
+                block_field = None
+
+            return {
+                'tab': tab,
+                'field': capfirst(block_type.label),
+                'blockId': block_id,
+                'fieldHelpText': '',
+                'subField': block_field,
+            }
+
+        elif (
+            isinstance(field, (models.ManyToOneRel))
+            and isinstance(field.remote_field, ParentalKey)
+            and issubclass(field.related_model, TranslatableMixin)
+        ):
+            child_field = field.related_model._meta.get_field(context_path_components[2])
+
+            return {
+                'tab': tab,
+                'field': capfirst(field.related_model._meta.verbose_name),
+                'blockId': context_path_components[1],
+                'fieldHelpText': child_field.help_text,
+                'subField': capfirst(child_field.verbose_name),
+            }
 
-        if isinstance(block_type, StructBlock):
-            block_field_name = context_path_components[2]
-            block_field = block_type.child_blocks[block_field_name].label
         else:
-            block_field = None
-
-        return {
-            'tab': tab,
-            'field': capfirst(block_type.label),
-            'blockId': block_id,
-            'fieldHelpText': '',
-            'subField': block_field,
-        }
+            return {
+                'tab': tab,
+                'field': capfirst(field.verbose_name),
+                'blockId': None,
+                'fieldHelpText': field.help_text,
+                'subField': None,
+            }
 
-    elif (
-        isinstance(field, (models.ManyToOneRel))
-        and isinstance(field.remote_field, ParentalKey)
-        and issubclass(field.related_model, TranslatableMixin)
-    ):
-        child_field = field.related_model._meta.get_field(context_path_components[2])
-
-        return {
-            'tab': tab,
-            'field': capfirst(field.related_model._meta.verbose_name),
-            'blockId': context_path_components[1],
-            'fieldHelpText': child_field.help_text,
-            'subField': capfirst(child_field.verbose_name),
-        }
 
-    else:
-        return {
-            'tab': tab,
-            'field': capfirst(field.verbose_name),
-            'blockId': None,
-            'fieldHelpText': field.help_text,
-            'subField': None,
+SEGMENT_LOCATIONS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_segment_locations(source, source_instance, tab_helper, context_paths):
+    """
+    Returns a dictionary mapping each of the given context paths to the location of that
+    segment in the edit interface.
+
+    The result is cached against the content digest of the source so the source instance
+    only needs to be walked again after the source has been updated. Labels are translated,
+    so there is a separate cache entry for each language.
+    """
+    cache_key = None
+    if source.content_digest:
+        cache_key = 'wagtail_localize:segment_locations:{}:{}:{}'.format(source.id, source.content_digest, get_language())
+
+    locations = cache.get(cache_key) if cache_key else None
+
+    if locations is None or not all(context_path in locations for context_path in context_paths):
+        index = SegmentLocationIndex(source, source_instance, tab_helper)
+        locations = {
+            context_path: {
+                # Resolve any lazy labels so they are cached in the current language
+                key: str(value) if isinstance(value, Promise) else value
+                for key, value in index.get_location(context_path).items()
+            }
+            for context_path in context_paths
         }
 
+        if cache_key:
+            cache.set(cache_key, locations, SEGMENT_LOCATIONS_CACHE_TIMEOUT)
+
+    return locations
+
 
 def edit_translation(request, translation, instance):
     if isinstance(instance, Page):
@@ -263,9 +325,16 @@ def edit_translation(request, translation, instance):
         return redirect(request.path)
 
     string_segments = translation.source.stringsegment_set.all().order_by('order')
-    string_translations = string_segments.get_translations(translation.target_locale)
+    string_translations = (
+        string_segments.get_translations(translation.target_locale)
+        .select_related('last_translated_by__wagtail_userprofile')
+    )
+    string_segments = list(string_segments.select_related('context', 'string'))
 
     tab_helper = TabHelper(source_instance)
+    segment_locations = get_segment_locations(
+        translation.source, source_instance, tab_helper, [segment.context.path for segment in string_segments]
+    )
 
     breadcrumb = []
     if isinstance(instance, Page):
@@ -338,6 +407,7 @@ def edit_translation(request, translation, instance):
                 'unlockUrl': reverse('wagtailadmin_pages:unlock', args=[instance.id]) if isinstance(instance, Page) else None,
                 'deleteUrl': reverse('wagtailadmin_pages:delete', args=[instance.id]) if isinstance(instance, Page) else reverse('wagtailsnippets:delete', args=[instance._meta.app_label, instance._meta.model_name, quote(instance.pk)]),
                 'stopTranslationUrl': reverse('wagtail_localize:stop_translation', args=[translation.id]),
+                'editStringTranslationsUrl': reverse('wagtail_localize:edit_string_translations', args=[translation.id]),
             },
             'previewModes': [
                 {
@@ -353,7 +423,7 @@ def edit_translation(request, translation, instance):
                     'id': segment.id,
                     'contentPath': segment.context.path,
                     'source': segment.string.data,
-                    'location': get_segment_location_info(source_instance, tab_helper, segment),
+                    'location': segment_locations[segment.context.path],
                     'editUrl': reverse('wagtail_localize:edit_string_translation', kwargs={'translation_id': translation.id, 'string_segment_id': segment.id}),
                 }
                 for segment in string_segments
@@ -487,6 +557,202 @@ def edit_string_translation(request, translation_id, string_segment_id):
             return Response(status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(['POST'])
+def edit_string_translations(request, translation_id):
+    """
+    Saves or deletes the translations of many segments at once.
+
+    Accepts a JSON object with an 'edits' list. Each edit has a 'segment_id' and a 'value'.
+    The translation of the segment is deleted if the value is empty or null.
+
+    Returns the saved translations and the IDs of the segments that no longer have a translation.
+    """
+    translation = get_object_or_404(Translation.objects.select_related('source'), id=translation_id)
+
+    instance = translation.get_target_instance()
+    if not user_can_edit_instance(request.user, instance):
+        raise PermissionDenied
+
+    edits = request.data.get('edits') if isinstance(request.data, dict) else None
+    if not isinstance(edits, list):
+        return Response(status=status.HTTP_400_BAD_REQUEST)
+
+    # If a segment was edited more than once, only the last edit is used
+    values_by_segment_id = {}
+    for edit in edits:
+        if not isinstance(edit, dict) or 'value' not in edit:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        # bool is a subclass of int, so it must be rejected separately
+        segment_id = edit.get('segment_id')
+        if not isinstance(segment_id, int) or isinstance(segment_id, bool):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        value = edit['value']
+        if value is not None and not isinstance(value, str):
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        values_by_segment_id[segment_id] = value or ''
+
+    string_segments = list(StringSegment.objects.filter(
+        id__in=values_by_segment_id.keys(),
+        context__object_id=translation.source.object_id,
+    ))
+
+    if len(string_segments) != len(values_by_segment_id):
+        raise Http404
+
+    # Segments that have the same string and context share a translation
+    values_by_key = {
+        (string_segment.string_id, string_segment.context_id): values_by_segment_id[string_segment.id]
+        for string_segment in string_segments
+    }
+
+    with transaction.atomic():
+        existing_translations = {
+            (string_translation.translation_of_id, string_translation.context_id): string_translation
+            for string_translation in StringTranslation.objects.select_for_update().filter(
+                translation_of_id__in={string_id for string_id, context_id in values_by_key.keys()},
+                context_id__in={context_id for string_id, context_id in values_by_key.keys()},
+                locale_id=translation.target_locale_id,
+            )
+        }
+
+        translations_by_key = {}
+        translations_to_create = []
+        translations_to_update = []
+        translations_to_delete = []
+        now = timezone.now()
+
+        for key, value in values_by_key.items():
+            string_translation = existing_translations.get(key)
+
+            if not value:
+                if string_translation:
+                    translations_to_delete.append(string_translation.id)
+
+                continue
+
+            if string_translation is None:
+                string_translation = StringTranslation(
+                    translation_of_id=key[0],
+                    context_id=key[1],
+                    locale_id=translation.target_locale_id,
+                )
+                translations_to_create.append(string_translation)
+            else:
+                # Bulk updates don't set auto_now fields
+                string_translation.updated_at = now
+                translations_to_update.append(string_translation)
+
+            string_translation.data = value
+            string_translation.translation_type = StringTranslation.TRANSLATION_TYPE_MANUAL
+            string_translation.tool_name = ""
+            string_translation.last_translated_by = request.user
+            string_translation.has_error = False
+            string_translation.field_error = ""
+
+            # Bulk writes don't call StringTranslation.save() so we need to check the HTML here
+            string_translation.validate_html()
+
+            translations_by_key[key] = string_translation
+
+        if translations_to_create:
+            StringTranslation.objects.bulk_create(translations_to_create)
+
+        if translations_to_update:
+            StringTranslation.objects.bulk_update(translations_to_update, [
+                'data', 'translation_type', 'tool_name', 'last_translated_by', 'has_error', 'html_error', 'field_error', 'updated_at'
+            ])
+
+        if translations_to_delete:
+            StringTranslation.objects.filter(id__in=translations_to_delete).delete()
+
+        # Bulk writes don't send the signals that reset the progress of the translations
+        Translation.objects.filter(
+            source__object_id=translation.source.object_id,
+            target_locale_id=translation.target_locale_id,
+        ).reset_progress()
+
+    saved_translations = []
+    deleted_segment_ids = []
+    for string_segment in string_segments:
+        string_translation = translations_by_key.get((string_segment.string_id, string_segment.context_id))
+
+        if string_translation is None:
+            deleted_segment_ids.append(string_segment.id)
+            continue
+
+        string_translation.segment_id = string_segment.id
+        saved_translations.append(StringTranslationSerializer(string_translation).data)
+
+    return Response({
+        'translations': saved_translations,
+        'deleted': deleted_segment_ids,
+    })
+
+
+@api_view(['GET'])
+def translation_memory_suggestions(request, translation_id, string_segment_id):
+    """
+    Returns translations of strings that are similar to the given segment's string, most similar first.
+
+    Accepts 'limit' (default: 5, maximum: 20) and 'min_similarity' (a number between 0 and 1,
+    default: 0.85) query parameters.
+    """
+    translation = get_object_or_404(Translation, id=translation_id)
+    string_segment = get_object_or_404(StringSegment.objects.select_related('string', 'context'), id=string_segment_id)
+
+    if string_segment.context.object_id != translation.source.object_id:
+        raise Http404
+
+    instance = translation.get_target_instance()
+    if not user_can_edit_instance(request.user, instance):
+        raise PermissionDenied
+
+    try:
+        limit = min(int(request.GET.get('limit', 5)), 20)
+        min_similarity = float(request.GET.get('min_similarity', 0.85))
+    except ValueError:
+        return Response(status=status.HTTP_400_BAD_REQUEST)
+
+    matches = String.objects.find_similar(
+        translation.source.locale_id, string_segment.string.data, limit=limit, min_similarity=min_similarity
+    )
+
+    # Get the translations of all the matching strings into the target locale, latest first.
+    # The translation of the segment itself is excluded
+    translations_by_string = defaultdict(list)
+    for string_translation in (
+        StringTranslation.objects.filter(
+            translation_of_id__in=[string.id for string, similarity in matches],
+            locale_id=translation.target_locale_id,
+            has_error=False,
+        )
+        .exclude(translation_of_id=string_segment.string_id, context_id=string_segment.context_id)
+        .order_by('-updated_at')
+    ):
+        translations = translations_by_string[string_translation.translation_of_id]
+
+        # Only include each distinct translation once
+        if string_translation.data not in [existing['data'] for existing in translations]:
+            translations.append({
+                'data': string_translation.data,
+                'comment': string_translation.get_comment(),
+            })
+
+    return Response([
+        {
+            'stringId': string.id,
+            'source': string.data,
+            'similarity': similarity,
+            'translations': translations_by_string[string.id],
+        }
+        for string, similarity in matches
+        if translations_by_string[string.id]
+    ])
+
+
 def download_pofile(request, translation_id):
     translation = get_object_or_404(Translation, id=translation_id)
 
@@ -494,7 +760,7 @@ def download_pofile(request, translation_id):
     if not user_can_edit_instance(request.user, instance):
         raise PermissionDenied
 
-    response = HttpResponse(str(translation.export_po()), content_type="text/x-gettext-translation")
+    response = StreamingHttpResponse(translation.stream_po(), content_type="text/x-gettext-translation")
     response["Content-Disposition"] = (
         "attachment; filename=%s-%s.po" % (
             slugify(translation.source.object_repr),
@@ -573,45 +839,7 @@ def machine_translate(request, translation_id):
     if not translator.can_translate(translation.source.locale, translation.target_locale):
         raise Http404
 
-    # Get segments
-    segments = defaultdict(list)
-    for string_segment in translation.source.stringsegment_set.all().select_related("context", "string"):
-        segment = StringSegmentValue(
-            string_segment.context.path, string_segment.string.as_value()
-        ).with_order(string_segment.order)
-        if string_segment.attrs:
-            segment.attrs = json.loads(string_segment.attrs)
-
-        # Don't translate if there already is a translation
-        if StringTranslation.objects.filter(
-            translation_of_id=string_segment.string_id,
-            locale=translation.target_locale,
-            context_id=string_segment.context_id,
-        ).exists():
-            continue
-
-        segments[segment.string].append((string_segment.string_id, string_segment.context_id))
-
-    if segments:
-        translations = translator.translate(translation.source.locale, translation.target_locale, segments.keys())
-
-        with transaction.atomic():
-            for string, contexts in segments.items():
-                for string_id, context_id in contexts:
-                    StringTranslation.objects.get_or_create(
-                        translation_of_id=string_id,
-                        locale=translation.target_locale,
-                        context_id=context_id,
-                        defaults={
-                            'data': translations[string].data,
-                            'translation_type': StringTranslation.TRANSLATION_TYPE_MACHINE,
-                            'tool_name': translator.display_name,
-                            'last_translated_by': request.user,
-                            'has_error': False,
-                            'field_error': "",
-                        }
-                    )
-
+    if translation.source.machine_translate([translation.target_locale], user=request.user, translator=translator):
         messages.success(
             request,
             _("Successfully translated with {}.").format(translator.display_name)
@@ -1,8 +1,7 @@
 from django import forms
 
-from django.contrib import messages
 from django.contrib.admin.utils import unquote
-from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.exceptions import PermissionDenied
 from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
@@ -10,11 +9,13 @@ from django.urls import reverse
 from django.utils.translation import gettext as _, gettext_lazy as __, ngettext
 from django.views.generic import TemplateView
 from django.views.generic.detail import SingleObjectMixin
+from wagtail.admin import messages
 from wagtail.admin.views.pages.utils import get_valid_next_url_from_request
 from wagtail.core.models import Page, Locale, TranslatableMixin
 from wagtail.snippets.views.snippets import get_snippet_model_from_url_params
 
-from wagtail_localize.models import Translation, TranslationSource
+from wagtail_localize.models import TranslationJob
+from wagtail_localize.operations import TranslationCreator
 
 
 class SubmitTranslationForm(forms.Form):
@@ -51,60 +52,6 @@ class SubmitTranslationForm(forms.Form):
             self.fields["select_all"].widget = forms.HiddenInput()
 
 
-class TranslationCreator:
-    """
-    A class that provides a create_translations method.
-
-    Call create_translations for each object you want to translate and this will submit
-    that object and any dependencies as well.
-
-    This class will track the objects that have already submitted so an object doesn't
-    get submitted twice.
-    """
-    def __init__(self, user, target_locales):
-        self.user = user
-        self.target_locales = target_locales
-        self.seen_objects = set()
-
-    def create_translations(self, instance, include_related_objects=True):
-        if isinstance(instance, Page):
-            instance = instance.specific
-
-        if instance.translation_key in self.seen_objects:
-            return
-        self.seen_objects.add(instance.translation_key)
-
-        source, created = TranslationSource.get_or_create_from_instance(instance)
-
-        # Add related objects
-        # Must be before translation records or those translation records won't be able to create
-        # the objects because the dependencies haven't been created
-        if include_related_objects:
-            for related_object_segment in source.relatedobjectsegment_set.all():
-                related_instance = related_object_segment.object.get_instance(instance.locale)
-
-                # Limit to one level of related objects, since this could potentially pull in a lot of stuff
-                self.create_translations(related_instance, include_related_objects=False)
-
-        # Set up translation records
-        for target_locale in self.target_locales:
-            # Create translation if it doesn't exist yet, re-enable if translation was disabled
-            # Note that the form won't show this locale as an option if the translation existed
-            # in this langauge, so this shouldn't overwrite any unmanaged translations.
-            translation, created = Translation.objects.update_or_create(
-                source=source,
-                target_locale=target_locale,
-                defaults={
-                    'enabled': True
-                }
-            )
-
-            try:
-                translation.save_target(user=self.user)
-            except ValidationError:
-                pass
-
-
 class SubmitTranslationView(SingleObjectMixin, TemplateView):
     template_name = "wagtail_localize/admin/submit_translation.html"
     title = __("Translate")
@@ -145,16 +92,15 @@ class SubmitTranslationView(SingleObjectMixin, TemplateView):
                 translator.create_translations(self.object)
 
                 # Now add the sub tree (if the obj is a page)
+                # This could be very large so it is submitted as a job to be processed in the background
+                job = None
                 if isinstance(self.object, Page):
                     if form.cleaned_data["include_subtree"]:
-                        def _walk(current_page):
-                            for child_page in current_page.get_children():
-                                translator.create_translations(child_page)
+                        # Fetch all descendants with a single query. Ordering by path puts parents before their children
+                        descendants = list(self.object.get_descendants().order_by('path'))
 
-                                if child_page.numchild:
-                                    _walk(child_page)
-
-                        _walk(self.object)
+                        if descendants:
+                            job = TranslationJob.objects.create_for_instances(descendants, form.cleaned_data["locales"], user=self.request.user)
 
                 if len(form.cleaned_data["locales"]) == 1:
                     locales = form.cleaned_data["locales"][0].get_display_name()
@@ -168,6 +114,15 @@ class SubmitTranslationView(SingleObjectMixin, TemplateView):
                     self.request, self.get_success_message(locales)
                 )
 
+                if job is not None:
+                    messages.success(
+                        self.request,
+                        _("The child pages will be submitted for translation in the background"),
+                        buttons=[
+                            messages.button(reverse("wagtail_localize:translation_job", args=[job.id]), _("View progress"))
+                        ]
+                    )
+
                 return redirect(self.get_success_url() or self.get_default_success_url())
 
         context = self.get_context_data(**kwargs)
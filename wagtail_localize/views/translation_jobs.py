@@ -0,0 +1,43 @@
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+
+from wagtail_localize.models import TranslationJob, TranslationJobItem
+
+
+def translation_job(request, job_id):
+    if not request.user.has_perms(['wagtail_localize.submit_translation']):
+        raise PermissionDenied
+
+    job = get_object_or_404(TranslationJob, id=job_id)
+    total, completed, failed = job.get_progress()
+
+    failed_items = (
+        job.items.filter(status__in=[TranslationJobItem.STATUS_FAILED, TranslationJobItem.STATUS_SKIPPED])
+        .select_related('object__content_type')
+        .order_by('sort_order')
+    )
+
+    def get_object(item):
+        try:
+            return item.get_source_instance()
+        except ObjectDoesNotExist:
+            return None
+
+    return TemplateResponse(request, 'wagtail_localize/admin/translation_job.html', {
+        'job': job,
+        'total': total,
+        'completed': completed,
+        'failed': failed,
+        'percent_complete': int((completed + failed) * 100 / total) if total else 100,
+        'target_locales': job.target_locales.all(),
+        'failed_items': [
+            {
+                'object': get_object(item),
+                'error': item.last_error,
+                'attempts': item.attempts,
+                'skipped': item.status == TranslationJobItem.STATUS_SKIPPED,
+            }
+            for item in failed_items
+        ],
+    })
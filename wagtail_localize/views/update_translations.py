@@ -88,6 +88,9 @@ class UpdateTranslationsView(SingleObjectMixin, TemplateView):
             with transaction.atomic():
                 self.object.update_from_db()
 
+                for translation in self.object.translations.filter(enabled=True):
+                    translation.prefill_from_translation_memory()
+
                 if form.cleaned_data['publish_translations']:
                     for translation in self.object.translations.filter(enabled=True).select_related("target_locale"):
                         try:
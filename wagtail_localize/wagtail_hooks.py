@@ -2,6 +2,8 @@ from urllib.parse import urlencode
 
 from django.contrib.admin.utils import quote
 from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q
 from django.urls import reverse, path, include
 from django.utils.translation import gettext as _
 from django.views.i18n import JavaScriptCatalog
@@ -9,7 +11,7 @@ from django.views.i18n import JavaScriptCatalog
 from wagtail.admin import widgets as wagtailadmin_widgets
 from wagtail.admin.action_menu import ActionMenuItem as PageActionMenuItem
 from wagtail.core import hooks
-from wagtail.core.models import Locale, TranslatableMixin
+from wagtail.core.models import Locale, Page, TranslatableMixin
 
 # The `wagtail.snippets.action_menu` module is introduced in https://github.com/wagtail/wagtail/pull/6384
 # FIXME: Remove this check when this module is merged into master
@@ -22,7 +24,7 @@ except ImportError:
 from wagtail.snippets.widgets import SnippetListingButton
 
 from .models import Translation, TranslationSource
-from .views import edit_translation, submit_translations, update_translations
+from .views import edit_translation, submit_translations, translation_jobs, update_translations
 
 
 @hooks.register("register_admin_urls")
@@ -32,13 +34,16 @@ def register_admin_urls():
         path("submit/page/<int:page_id>/", submit_translations.SubmitPageTranslationView.as_view(), name="submit_page_translation"),
         path("submit/snippet/<slug:app_label>/<slug:model_name>/<str:pk>/", submit_translations.SubmitSnippetTranslationView.as_view(), name="submit_snippet_translation"),
         path("update/<int:translation_source_id>/", update_translations.UpdateTranslationsView.as_view(), name="update_translations"),
+        path("translate/<int:translation_id>/strings/edit/", edit_translation.edit_string_translations, name="edit_string_translations"),
         path("translate/<int:translation_id>/strings/<int:string_segment_id>/edit/", edit_translation.edit_string_translation, name="edit_string_translation"),
+        path("translate/<int:translation_id>/strings/<int:string_segment_id>/suggestions/", edit_translation.translation_memory_suggestions, name="translation_memory_suggestions"),
         path("translate/<int:translation_id>/pofile/download/", edit_translation.download_pofile, name="download_pofile"),
         path("translate/<int:translation_id>/pofile/upload/", edit_translation.upload_pofile, name="upload_pofile"),
         path("translate/<int:translation_id>/machine_translate/", edit_translation.machine_translate, name="machine_translate"),
         path("translate/<int:translation_id>/preview/", edit_translation.preview_translation, name="preview_translation"),
         path("translate/<int:translation_id>/preview/<str:mode>/", edit_translation.preview_translation, name="preview_translation"),
         path("translate/<int:translation_id>/disable/", edit_translation.stop_translation, name="stop_translation"),
+        path("jobs/<int:job_id>/", translation_jobs.translation_job, name="translation_job"),
     ]
 
     return [
@@ -57,15 +62,88 @@ def register_submit_translation_permission():
     return Permission.objects.filter(content_type__app_label='wagtail_localize', codename='submit_translation')
 
 
+class ListingTranslationStatus:
+    """
+    Finds out which objects on a listing have a locale that they haven't been translated into yet
+    and which objects are the source of enabled translations.
+
+    This takes three queries, no matter how many objects there are. The translation_keys argument
+    may be a list or a queryset. If the number of locales is already known, it can be passed in to
+    save a query.
+    """
+    def __init__(self, model, translation_keys, num_locales=None):
+        self.num_locales = Locale.objects.count() if num_locales is None else num_locales
+
+        self.num_translations = dict(
+            model.objects.filter(translation_key__in=translation_keys)
+            .order_by()
+            .values_list('translation_key')
+            .annotate(Count('locale_id', distinct=True))
+        )
+
+        self.source_ids = {
+            (translation_key, locale_id): source_id
+            for source_id, translation_key, locale_id in TranslationSource.objects.filter(
+                object_id__in=translation_keys,
+                object__content_type=ContentType.objects.get_for_model(model),
+                translations__enabled=True,
+            ).values_list('id', 'object_id', 'locale_id').distinct()
+        }
+
+    def has_locale_to_translate_to(self, instance):
+        return self.num_translations.get(instance.translation_key, 0) < self.num_locales
+
+    def get_source_id(self, instance):
+        """
+        Returns the ID of the TranslationSource of the instance if it has any enabled translations.
+        """
+        return self.source_ids.get((instance.translation_key, instance.locale_id))
+
+
+def get_page_listing_translation_status(page, page_perms, is_parent):
+    """
+    Returns a ListingTranslationStatus for the given page on a page listing.
+
+    The explorer renders the parent page before its children, so the status of all the children is
+    fetched along with the parent's, in the same three queries however many children there are.
+    Pages whose parent isn't shown on the listing, such as search results, are looked up
+    individually. All buttons on a listing are rendered with the same UserPagePermissionsProxy, so
+    statuses are cached on that for the rest of the request.
+    """
+    user_perms = page_perms.user_perms
+    listing_statuses = getattr(user_perms, '_wagtail_localize_listing_statuses', None)
+    if listing_statuses is None:
+        listing_statuses = user_perms._wagtail_localize_listing_statuses = {}
+        user_perms._wagtail_localize_num_locales = Locale.objects.count()
+
+    parent_path = page.path if is_parent else page.path[:-Page.steplen]
+    if is_parent and parent_path not in listing_statuses:
+        listing_statuses[parent_path] = ListingTranslationStatus(
+            Page,
+            Page.objects.filter(
+                Q(path=parent_path) | Q(path__startswith=parent_path, depth=page.depth + 1)
+            ).values('translation_key'),
+            num_locales=user_perms._wagtail_localize_num_locales,
+        )
+
+    status = listing_statuses.get(parent_path)
+    if status is None:
+        status = ListingTranslationStatus(
+            Page,
+            [page.translation_key],
+            num_locales=user_perms._wagtail_localize_num_locales,
+        )
+
+    return status
+
+
 @hooks.register("register_page_listing_more_buttons")
 def page_listing_more_buttons(page, page_perms, is_parent=False, next_url=None):
     if page_perms.user.has_perm('wagtail_localize.submit_translation') and not page.is_root():
-        # If there's at least one locale that we haven't translated into yet, show "Translate this page" button
-        has_locale_to_translate_to = Locale.objects.exclude(
-            id__in=page.get_translations(inclusive=True).values_list('locale_id', flat=True)
-        ).exists()
+        translation_status = get_page_listing_translation_status(page, page_perms, is_parent)
 
-        if has_locale_to_translate_to:
+        # If there's at least one locale that we haven't translated into yet, show "Translate this page" button
+        if translation_status.has_locale_to_translate_to(page):
             url = reverse("wagtail_localize:submit_page_translation", args=[page.id])
             if next_url is not None:
                 url += '?' + urlencode({'next': next_url})
@@ -73,29 +151,53 @@ def page_listing_more_buttons(page, page_perms, is_parent=False, next_url=None):
             yield wagtailadmin_widgets.Button(_("Translate this page"), url, priority=60)
 
         # If the page is the source for translations, show "Sync translated pages" button
-        source = TranslationSource.objects.get_for_instance_or_none(page)
-        if source is not None and source.translations.filter(enabled=True).exists():
-            url = reverse("wagtail_localize:update_translations", args=[source.id])
+        source_id = translation_status.get_source_id(page)
+        if source_id is not None:
+            url = reverse("wagtail_localize:update_translations", args=[source_id])
             if next_url is not None:
                 url += '?' + urlencode({'next': next_url})
 
             yield wagtailadmin_widgets.Button(_("Sync translated pages"), url, priority=65)
 
 
-@hooks.register('register_snippet_listing_buttons')
-def register_snippet_listing_buttons(snippet, user, next_url=None):
+def get_snippet_listing_translation_status(snippet, context):
+    """
+    Returns a ListingTranslationStatus for the snippet listing that the given snippet is on.
+
+    The status of all the snippets on the current page of the listing is fetched the first time one
+    of them is rendered. Snippet listing buttons are rendered with the request, so the status is
+    cached on that for the rest of the request. Snippets that aren't on the listing are looked up
+    individually.
+    """
+    model = snippet.get_translation_model()
+    items = context.get('items')
+    if items is None or snippet not in items:
+        return ListingTranslationStatus(model, [snippet.translation_key])
+
+    request = context.request
+    listing_statuses = getattr(request, '_wagtail_localize_listing_statuses', None)
+    if listing_statuses is None:
+        listing_statuses = request._wagtail_localize_listing_statuses = {}
+
+    if model not in listing_statuses:
+        listing_statuses[model] = ListingTranslationStatus(
+            model,
+            [item.translation_key for item in items],
+        )
+
+    return listing_statuses[model]
+
+
+def get_snippet_listing_buttons(snippet, user, context):
     model = type(snippet)
 
     if issubclass(model, TranslatableMixin) and user.has_perm('wagtail_localize.submit_translation'):
-        # If there's at least one locale that we haven't translated into yet, show "Translate" button
-        has_locale_to_translate_to = Locale.objects.exclude(
-            id__in=snippet.get_translations(inclusive=True).values_list('locale_id', flat=True)
-        ).exists()
+        translation_status = get_snippet_listing_translation_status(snippet, context)
 
-        if has_locale_to_translate_to:
+        # If there's at least one locale that we haven't translated into yet, show "Translate" button
+        if translation_status.has_locale_to_translate_to(snippet):
             url = reverse('wagtail_localize:submit_snippet_translation', args=[model._meta.app_label, model._meta.model_name, quote(snippet.pk)])
-            if next_url is not None:
-                url += '?' + urlencode({'next': next_url})
+            url += '?' + urlencode({'next': context.request.path})
 
             yield SnippetListingButton(
                 _('Translate'),
@@ -105,11 +207,10 @@ def register_snippet_listing_buttons(snippet, user, next_url=None):
             )
 
         # If the snippet is the source for translations, show "Sync translated snippets" button
-        source = TranslationSource.objects.get_for_instance_or_none(snippet)
-        if source is not None and source.translations.filter(enabled=True).exists():
-            url = reverse('wagtail_localize:update_translations', args=[source.id])
-            if next_url is not None:
-                url += '?' + urlencode({'next': next_url})
+        source_id = translation_status.get_source_id(snippet)
+        if source_id is not None:
+            url = reverse('wagtail_localize:update_translations', args=[source_id])
+            url += '?' + urlencode({'next': context.request.path})
 
             yield SnippetListingButton(
                 _('Sync translated snippets'),
@@ -119,25 +220,53 @@ def register_snippet_listing_buttons(snippet, user, next_url=None):
             )
 
 
+# The buttons are added by the construct hook because, unlike the register hook, it's given the
+# template context, which has the snippets on the current page of the listing
+@hooks.register('construct_snippet_listing_buttons')
+def construct_snippet_listing_buttons(buttons, snippet, user, context=None):
+    if context is not None:
+        buttons.extend(get_snippet_listing_buttons(snippet, user, context))
+        buttons.sort()
+
+
+def get_translation_for_request(request, instance, enabled):
+    """
+    Returns the enabled or disabled Translation that has the given instance as its target, or None.
+
+    All Translations of the instance are fetched with one query the first time this is called
+    for it and are cached on the request, so the edit hooks and action menus can share them.
+    """
+    translations_by_instance = getattr(request, '_wagtail_localize_translations', None)
+    if translations_by_instance is None:
+        translations_by_instance = request._wagtail_localize_translations = {}
+
+    key = (instance.translation_key, instance.locale_id)
+    if key not in translations_by_instance:
+        translations_by_instance[key] = list(
+            Translation.objects.filter(
+                source__object_id=instance.translation_key,
+                target_locale_id=instance.locale_id,
+            ).select_related('source')
+        )
+
+    for translation in translations_by_instance[key]:
+        if translation.enabled == enabled:
+            return translation
+
+
 @hooks.register("before_edit_page")
 def before_edit_page(request, page):
     # Check if the user has clicked the "Restart Translation" menu item
     if request.method == 'POST' and 'localize-restart-translation' in request.POST:
-        try:
-            translation = Translation.objects.get(source__object_id=page.translation_key, target_locale_id=page.locale_id, enabled=False)
-        except Translation.DoesNotExist:
-            pass
-        else:
+        translation = get_translation_for_request(request, page, enabled=False)
+        if translation is not None:
             return edit_translation.restart_translation(request, translation, page)
 
     # Overrides the edit page view if the page is the target of a translation
-    try:
-        translation = Translation.objects.get(source__object_id=page.translation_key, target_locale_id=page.locale_id, enabled=True)
+    translation = get_translation_for_request(request, page, enabled=True)
+    if translation is not None:
         return edit_translation.edit_translation(request, translation, page)
 
-    except Translation.DoesNotExist:
-        pass
-
 
 class RestartTranslationPageActionMenuItem(PageActionMenuItem):
     label = _("Restart translation")
@@ -150,11 +279,7 @@ class RestartTranslationPageActionMenuItem(PageActionMenuItem):
         if context['view'] != 'edit':
             return False
 
-        return Translation.objects.filter(
-            source__object_id=context['page'].translation_key,
-            target_locale_id=context['page'].locale_id,
-            enabled=False
-        ).exists()
+        return get_translation_for_request(request, context['page'], enabled=False) is not None
 
 
 @hooks.register("register_page_action_menu_item")
@@ -167,21 +292,15 @@ def before_edit_snippet(request, instance):
     if isinstance(instance, TranslatableMixin):
         # Check if the user has clicked the "Restart Translation" menu item
         if request.method == 'POST' and 'localize-restart-translation' in request.POST:
-            try:
-                translation = Translation.objects.get(source__object_id=instance.translation_key, target_locale_id=instance.locale_id, enabled=False)
-            except Translation.DoesNotExist:
-                pass
-            else:
+            translation = get_translation_for_request(request, instance, enabled=False)
+            if translation is not None:
                 return edit_translation.restart_translation(request, translation, instance)
 
         # Overrides the edit snippet view if the snippet is translatable and the target of a translation
-        try:
-            translation = Translation.objects.get(source__object_id=instance.translation_key, target_locale_id=instance.locale_id, enabled=True)
+        translation = get_translation_for_request(request, instance, enabled=True)
+        if translation is not None:
             return edit_translation.edit_translation(request, translation, instance)
 
-        except Translation.DoesNotExist:
-            pass
-
 
 if SNIPPET_RESTART_TRANSLATION_ENABLED:
     class RestartTranslationSnippetActionMenuItem(SnippetActionMenuItem):
@@ -195,11 +314,7 @@ if SNIPPET_RESTART_TRANSLATION_ENABLED:
             if context['view'] != 'edit':
                 return False
 
-            return Translation.objects.filter(
-                source__object_id=context['instance'].translation_key,
-                target_locale_id=context['instance'].locale_id,
-                enabled=False
-            ).exists()
+            return get_translation_for_request(request, context['instance'], enabled=False) is not None
 
     @hooks.register("register_snippet_action_menu_item")
     def register_restart_translation_snippet_action_menu_item(model):